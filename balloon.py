@@ -1,13 +1,10 @@
 import colours
 import pygame
 import path
-import abc
-import logging.config
+import logging
 import bullet
-import bank
-import life_point
+import surface_cache
 
-logging.config.fileConfig('logging.conf')
 logger = logging.getLogger('simpleLogger')
 
 BALLOON_L1 = 'BALLOON_L1'
@@ -16,137 +13,139 @@ BALLOON_L3 = 'BALLOON_L3'
 BALLOON_L4 = 'BALLOON_L4'
 BALLOON_L5 = 'BALLOON_L5'
 
+# the balloon type with each number of layers, eg, what the client asks for with a protocol.SPAWN_BALLOON message
+BALLOON_TYPE_BY_NUMBER_OF_LAYERS = {1: BALLOON_L1,
+                                    2: BALLOON_L2,
+                                    3: BALLOON_L3,
+                                    4: BALLOON_L4,
+                                    5: BALLOON_L5}
 
-class BalloonState(pygame.sprite.Sprite, metaclass=abc.ABCMeta):
-    """Base class for all Ballons, which are the enemies"""
 
-    def __init__(self, colour, dimension, start_position, bounty=20):
+class BalloonLayer:
+    """A layer of balloon (L1, L2, etc.). There is only one BalloonLayer per balloon type and every Balloon at that layer
+    shares it, so it only holds what all of them have in common. The position belongs to the Balloon"""
+
+    def __init__(self, colour, dimension, bounty, next_layer=None, speed=1):
         """
         :param colour: 4-element tuple, colour of the balloon
         :param dimension: 2-element tuple, size of the balloon
-        :param start_position: 2-element tuple, the start position of the balloon
-        :param bounty: int, the amount of money awarded for popping this ballon
+        :param bounty: int, the amount of money awarded for popping this layer
+        :param next_layer: BalloonLayer or None, the layer underneath this one. None represents no more layers
+        :param speed: int or float, the number of path points a balloon at this layer moves every frame. Can be fractional
         """
         assert isinstance(colour, tuple) and len(colour) == 4, 'colour must be a 4-element tuple'
         assert isinstance(dimension, tuple) and len(dimension) == 2, 'dimension must be a 2-element tuple'
-        assert isinstance(start_position, tuple) and len(start_position) == 2, 'path_to_move must a Path object'
         assert isinstance(bounty, int), 'bounty must be an integer'
+        assert next_layer is None or isinstance(next_layer, BalloonLayer), 'next_layer must be a BalloonLayer or None'
+        assert speed > 0, 'speed must be positive'
 
-        super().__init__()
-
-        self.image = pygame.Surface([dimension[0], dimension[1]])
-        self.image.fill(colour)
-        self.rect = self.image.get_rect()
-        self.rect.centerx = start_position[0]
-        self.rect.centery = start_position[1]
+        self.colour = colour
+        self.dimension = dimension
         self.bounty = bounty
-
-    @abc.abstractmethod
-    def peel_layer(self):
-        pass
-
-
-class BalloonStateL1(BalloonState):
-    """First, and lowest, level of BalloonState"""
-
-    def peel_layer(self):
-        """
-        :return: None, represents no more layer beneath this layer
-        In BalloonStateL1, the lowest balloon layer, indicate that there are no other layers to return
-        The layer order is: 5 (highest), 4, 3, 2, 1(lowest)
-        """
-        return None  # there is no layer to return
-
-
-class BalloonStateL2(BalloonState):
-    def peel_layer(self):
-        """
-        :return: BalloonStateL1, the layer underneath this one
-        The layer order is: 5 (highest), 4, 3, 2, 1(lowest)
-        """
-        return create_balloon_state(BALLOON_L1, (self.rect.centerx, self.rect.centery))
-
-
-class BalloonStateL3(BalloonState):
-    def peel_layer(self):
-        """
-        :return: BalloonStateL2, the layer beneath this one
-        The layer order is: 5 (highest), 4, 3, 2, 1(lowest)
-        """
-        return create_balloon_state(BALLOON_L2, (self.rect.centerx, self.rect.centery))
-
-
-class BalloonStateL4(BalloonState):
-    def peel_layer(self):
-        """
-        :return: BalloonStateL3, the layer beneath this one
-        The layer order is: 5 (highest), 4, 3, 2, 1(lowest)
-        """
-        return create_balloon_state(BALLOON_L3, (self.rect.centerx, self.rect.centery))
+        self.next_layer = next_layer
+        self.speed = speed
+        self.number_of_layers = 1 if next_layer is None else next_layer.number_of_layers + 1
+        self.image = surface_cache.get_filled_surface(colour, dimension)
 
 
-class BalloonStateL5(BalloonState):
-    def peel_layer(self):
-        """
-        :return: BalloonStateL2, the layer beneath this one
-        The layer order is: 5 (highest), 4, 3, 2, 1(lowest)
-        """
-        return create_balloon_state(BALLOON_L4, (self.rect.centerx, self.rect.centery))
+# The layer order is: 5 (highest), 4, 3, 2, 1(lowest). Peeling a layer moves a balloon to the next_layer
+_BALLOON_LAYER_L1 = BalloonLayer(colour=colours.RED, dimension=(30, 30), bounty=10)
+_BALLOON_LAYER_L2 = BalloonLayer(colour=colours.ORANGE, dimension=(30, 30), bounty=20, next_layer=_BALLOON_LAYER_L1)
+_BALLOON_LAYER_L3 = BalloonLayer(colour=colours.YELLOW, dimension=(30, 30), bounty=30, next_layer=_BALLOON_LAYER_L2)
+_BALLOON_LAYER_L4 = BalloonLayer(colour=colours.GREEN, dimension=(30, 30), bounty=40, next_layer=_BALLOON_LAYER_L3)
+_BALLOON_LAYER_L5 = BalloonLayer(colour=colours.BLUE, dimension=(30, 30), bounty=50, next_layer=_BALLOON_LAYER_L4)
 
 
-class Balloon(BalloonState):
-    def __init__(self, current_balloon_state, balloon_path, path_index=0):
+class Balloon(pygame.sprite.Sprite):
+    def __init__(self, current_layer, balloon_path, path_index=0):
         """
-        :param current_balloon_state: BalloonState, the current balloon to store in this context object
+        :param current_layer: BalloonLayer, the outermost layer of this balloon
         :param balloon_path: path.Path, the path this balloon travels on
         :param path_index: int, the position of this balloon on its destined path
-        This is the context object for a state machine. The states are the level of balloon, and transitions between states represents peeling layers off a balloon
+        This is the context object for the balloon layers. Peeling a layer only swaps current_layer for its next_layer.
+        The position on the path is path_position, which can be between two points; path_index is its whole part
         """
 
-        assert isinstance(current_balloon_state, BalloonState), 'current_balloon_state must be a BalloonState type'
+        assert isinstance(current_layer, BalloonLayer), 'current_layer must be a BalloonLayer type'
 
         pygame.sprite.Sprite.__init__(self)
         self.balloon_path = balloon_path
-        self.path_index = path_index
-        self.current_balloon_state = current_balloon_state
+        self.path_position = path_index
+        self.current_layer = current_layer
+        self.image = current_layer.image
+        self.rect = self.image.get_rect()
+        self.rect.centerx = balloon_path[path_index][0]
+        self.rect.centery = balloon_path[path_index][1]
+        # the bank and life points of the match this balloon is in, given by the sprite_groups.BalloonGroup it's added to.
+        # None for a balloon that isn't in a match
+        self.match_state = None
 
-    def update(self, bullet_sprites):
+    @property
+    def path_index(self):
+        return int(self.path_position)
+
+    @path_index.setter
+    def path_index(self, path_index):
+        self.path_position = path_index
+
+    def update(self, bullet_sprites, bullet_hash=None):
         """
         :param bullet_sprites: pygame.sprite.Group, contains all the bullets in the game
-        Update(...) is called every frame and checks if the current_balloon is hit by bullet or not
+        :param bullet_hash: collision.BulletSpatialHash or None, built from bullet_sprites this frame
+        Update(...) is called every frame and checks if the balloon is hit by bullet or not. If not, the balloon moves
         """
         # logger.debug('inside Balloons update method')
+        if not self.handle_collided_bullets(bullet_sprites, bullet_hash):
+            # logger.info("inside the collided_bullets else clause")
+            self.move()
+
+    def handle_collided_bullets(self, bullet_sprites, bullet_hash=None):
+        """
+        :param bullet_sprites: pygame.sprite.Group, contains all the bullets in the game
+        :param bullet_hash: collision.BulletSpatialHash or None. If given, only the bullets sharing a cell with the balloon are checked
+        :return: boolean, whether any bullet collided with this balloon
+        Handles every bullet that collides with the balloon. Kept apart from move(...) so a group can move all the
+        balloons that weren't hit at once
+        """
         assert isinstance(bullet_sprites, pygame.sprite.Group), 'bullet_sprites must be a pygame.sprite.Group type'
 
-        collided_bullets = pygame.sprite.spritecollide(self.current_balloon_state, bullet_sprites, False)
+        if bullet_hash is not None:
+            collided_bullets = bullet_hash.find_collided_bullets(self.rect)
+        else:
+            collided_bullets = pygame.sprite.spritecollide(self, bullet_sprites, False)
         if collided_bullets:
             # logger.info("inside collided_bullets loop")
             for collided_bullet in collided_bullets:
                 #if the current balloon still exists (after handling a number of simultaneous collided_bullets
-                if self.current_balloon_state is None:
-                    return
+                if self.current_layer is None:
+                    return True
                 if isinstance(collided_bullet, bullet.StandardBullet):
                     collided_bullet.handle_collision_with_balloon()
                     self.peel_layer(collided_bullet.pop_power, collided_bullet.tower_increment_pop_method)  # represents should handle pop
                 elif isinstance(collided_bullet, bullet.ExplosionBullet):
-                    collided_bullet.handle_collision_with_balloon(
+                    new_bullets = collided_bullet.handle_collision_with_balloon(
                         bullet_sprites)  # side note: explosion bullet will create more standard bullets
+                    if bullet_hash is not None:
+                        bullet_hash.add(new_bullets)  # so the balloons after this one can collide with them this frame
                     self.peel_layer(collided_bullet.pop_power, collided_bullet.tower_increment_pop_method)  # represents should handle pop
                 elif isinstance(collided_bullet, bullet.TeleportationBullet):
                     collided_bullet.handle_collision_with_balloon()
                     self.move(-20)
                 else:
                     raise NotImplementedError('the collided_bullet type is not allowed!')
-        else:
-            # logger.info("inside the collided_bullets else clause")
-            self.move()
+            return True
+        return False
 
-    def move(self, amount=1):
+    def move(self, amount=None):
         """
-        :param amount: int, the number of points to move forwards or backwards on the path. Positive is forwards; negative is backwards
+        :param amount: int or float, the number of points to move forwards or backwards on the path. Positive is forwards; negative is backwards.
+        If None, moves by the speed of the current layer
         :return boolean, represents if the balloon has reached the end and thus, kills itself. Thus, the context can appropriately handle the case
-        Increments the path_index so that the balloon progresses to the appropriate point on the path
+        Increments the path_position so that the balloon progresses to the appropriate point on the path
         """
+        if amount is None:
+            amount = self.current_layer.speed
+
         assert 0 <= self.path_index < len(
             self.balloon_path), 'the path_index must be less than the length of the path points list'
 
@@ -156,73 +155,79 @@ class Balloon(BalloonState):
         # if it is less than the start index, place balloon at start
         # otherwise, the amount is within range of the path and place it there
         # logger.debug('value of path_index before if statement')
-        if self.path_index + amount >= len(self.balloon_path):
+        if self.path_position + amount >= len(self.balloon_path):
             self.kill()
-            life_point.decrease()
-        elif self.path_index + amount < 0:
+            if self.match_state is not None:
+                self.match_state.life_point.decrease()
+        elif self.path_position + amount < 0:
             # logger.debug('inside first elif')
-            self.path_index = 0
+            self.path_position = 0
         else:
-            self.path_index += amount
+            self.path_position += amount
 
         # logger.debug('the value of the path_index after if statement is: ' + str(self.path_index))
         # logger.debug('the x coordinate of the path is: ' + str(self.balloon_path[self.path_index][0]))
         # logger.debug('the y coordinate of the path is: ' + str(self.balloon_path[self.path_index][1]))
 
-        self.current_balloon_state.rect.centerx = self.balloon_path[self.path_index][0]
-        self.current_balloon_state.rect.centery = self.balloon_path[self.path_index][1]
+        # between two points, the position is interpolated and the rect rounds it
+        self.rect.center = self.balloon_path.get_position(self.path_position)
 
     def peel_layer(self, number_of_layers=1, tower_increment_pop_method=None):
         """
-        :param number_of_layers: the number of layers to peel from the balloon state
+        :param number_of_layers: the number of layers to peel from the balloon
         :param tower_increment_pop_method: a method to call ever time a balloon's layer is peeled. Used to increase the pop count of a tower
         :return:
         """
         for _ in range(number_of_layers):
             # it's import to deposit here so that every deposit is made before the current ballon changes
-            bank.deposit(self.current_balloon_state.bounty)
-            self.current_balloon_state = self.current_balloon_state.peel_layer()
+            if self.match_state is not None:
+                self.match_state.bank.deposit(self.current_layer.bounty)
+            self.current_layer = self.current_layer.next_layer
             tower_increment_pop_method()
-            if self.current_balloon_state is None:
+            if self.current_layer is None:
                 self.kill()
                 break
+        if self.current_layer is not None and self.image is not self.current_layer.image:
+            # keep the centre in place in case the layers aren't the same size
+            center = self.rect.center
+            self.image = self.current_layer.image
+            self.rect.size = self.image.get_size()
+            self.rect.center = center
 
     def get_centerX(self):
         """
-        :return: the centerx of the current_balloon
+        :return: the centerx of the balloon
         This is the equivalent of a getter
         """
-        return self.current_balloon_state.rect.centerx
+        return self.rect.centerx
 
     def get_centerY(self):
         """
-        :return: the centery of the current_balloon
+        :return: the centery of the balloon
          This si the equivalent for a getter
         """
-        return self.current_balloon_state.rect.centery
+        return self.rect.centery
 
 
-def create_balloon_state(balloon_type, start_position):
+def get_balloon_layer(balloon_type):
     """
-    :param balloon_type: str constant, which balloon to make (L1, L2, etc.)
-    :param start_position: 2-element tuple, the start position of this balloon state
-    :return: various BalloonLX
-    Simple factory for returning new balloons and is particularly used by individual balloons to indicate the next balloon layer, for state changing
+    :param balloon_type: str constant, which balloon layer to return (L1, L2, etc.)
+    :return: BalloonLayer, the layer shared by every balloon of this type
+    Simple factory for the balloon layers. No new layer is made, the same one is returned every time
     """
 
     assert isinstance(balloon_type, str), 'balloon_type must be a string'
-    assert isinstance(start_position, tuple) and len(start_position) == 2, 'path_to_move must a Path object'
 
     if balloon_type == BALLOON_L1:
-        return BalloonStateL1(colour=colours.RED, dimension=(30, 30), start_position=start_position, bounty=10)
+        return _BALLOON_LAYER_L1
     elif balloon_type == BALLOON_L2:
-        return BalloonStateL2(colour=colours.ORANGE, dimension=(30, 30), start_position=start_position, bounty=20)
+        return _BALLOON_LAYER_L2
     elif balloon_type == BALLOON_L3:
-        return BalloonStateL3(colour=colours.YELLOW, dimension=(30, 30), start_position=start_position, bounty=30)
+        return _BALLOON_LAYER_L3
     elif balloon_type == BALLOON_L4:
-        return BalloonStateL4(colour=colours.GREEN, dimension=(30, 30), start_position=start_position, bounty=40)
+        return _BALLOON_LAYER_L4
     elif balloon_type == BALLOON_L5:
-        return BalloonStateL5(colour=colours.BLUE, dimension=(30, 30), start_position=start_position, bounty=50)
+        return _BALLOON_LAYER_L5
 
     raise NotImplementedError('Not implemented yet!')
 
@@ -230,16 +235,17 @@ def create_balloon_state(balloon_type, start_position):
 def create_balloon(balloon_type, balloon_path, path_index=0):
     """
     :param balloon_type: str constant, which balloon will be the current starting balloon for this context
-    :param balloon_path: the path the balloon moves on
+    :param balloon_path: path.Path or str, the path the balloon moves on, or the path_id of a registered path
     :param path_index: the starting index on the path to move on
     :return: Balloon, composing with a balloon
-    Simple factory for creating the encapsulated balloon. Internally, composed of LX balloons
+    Simple factory for creating the encapsulated balloon. Internally, its current_layer is one of the shared LX layers
     """
 
+    if isinstance(balloon_path, str):
+        balloon_path = path.get_path(balloon_path)  # the shared instance, not a copy
+
     assert isinstance(balloon_type, str), 'balloon_type must be a string'
     assert isinstance(balloon_path, path.Path), 'balloon_path must be a balloon_path type'
     assert isinstance(path_index, int), 'path_index must be an integer'
 
-    balloon_state = create_balloon_state(balloon_type=balloon_type,
-                                         start_position=(balloon_path[path_index][0], balloon_path[path_index][1]))
-    return Balloon(balloon_state, balloon_path, path_index)
+    return Balloon(get_balloon_layer(balloon_type), balloon_path, path_index)
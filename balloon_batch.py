@@ -0,0 +1,189 @@
+"""Contains an array-backed store for balloons. The path_position, speed, layer and position of every live balloon on a path
+are kept in NumPy arrays, so all the balloons that weren't hit by a bullet move along their path in one vectorized step"""
+
+import numpy as np
+import logging
+
+import balloon
+import path
+import sprite_groups
+
+logger = logging.getLogger('simpleLogger')
+
+
+class BalloonBatch:
+    """Struct-of-arrays store for the balloons travelling on one path. Each balloon owns a slot, an index into every array"""
+
+    def __init__(self, balloon_path, capacity=64):
+        """
+        :param balloon_path: path.Path, the path every balloon in this batch travels on
+        :param capacity: int, the number of slots to allocate up front. The arrays double in size when they run out
+        """
+        assert isinstance(capacity, int) and capacity > 0, 'capacity must be a positive integer'
+
+        self.balloon_path = balloon_path
+
+        self.path_position = np.zeros(capacity, dtype=np.float64)
+        self.speed = np.zeros(capacity, dtype=np.float64)
+        self.layer = np.zeros(capacity, dtype=np.int8)
+        self.x = np.zeros(capacity, dtype=np.int32)
+        self.y = np.zeros(capacity, dtype=np.int32)
+
+        self.views = [None] * capacity  # the BalloonView using each slot, None if the slot is free
+        self._free_slots = list(range(capacity - 1, -1, -1))  # popping from the end hands out the lowest slot first
+
+    def __len__(self):
+        """returns the number of live balloons in this batch"""
+        return len(self.views) - len(self._free_slots)
+
+    def _grow(self):
+        """Doubles the number of slots, keeping the values of the existing ones"""
+        old_capacity = len(self.views)
+        self.path_position = np.concatenate((self.path_position, np.zeros(old_capacity, dtype=np.float64)))
+        self.speed = np.concatenate((self.speed, np.zeros(old_capacity, dtype=np.float64)))
+        self.layer = np.concatenate((self.layer, np.zeros(old_capacity, dtype=np.int8)))
+        self.x = np.concatenate((self.x, np.zeros(old_capacity, dtype=np.int32)))
+        self.y = np.concatenate((self.y, np.zeros(old_capacity, dtype=np.int32)))
+        self.views.extend([None] * old_capacity)
+        self._free_slots = list(range(2 * old_capacity - 1, old_capacity - 1, -1)) + self._free_slots
+
+    def add(self, balloon_to_store):
+        """
+        :param balloon_to_store: balloon.Balloon, the balloon to move into this batch
+        :return: BalloonView, a balloon with the same layer and path_position, whose values live in this batch
+        """
+        assert isinstance(balloon_to_store, balloon.Balloon), 'balloon_to_store must be a Balloon'
+        assert balloon_to_store.balloon_path is self.balloon_path, 'the balloon must travel on the path of this batch'
+
+        if not self._free_slots:
+            self._grow()
+        slot = self._free_slots.pop()
+
+        view = BalloonView(self, slot, balloon_to_store.current_layer, self.balloon_path)
+        view.path_position = balloon_to_store.path_position
+        self.views[slot] = view
+        return view
+
+    def remove(self, slot):
+        """
+        :param slot: int, the slot of the balloon that no longer exists
+        Frees the slot so a new balloon can use it
+        """
+        if self.views[slot] is not None:
+            self.views[slot] = None
+            self._free_slots.append(slot)
+
+    def set_path_position(self, slot, path_position):
+        """Moves a single balloon to path_position, updating its position"""
+        self.path_position[slot] = path_position
+        x, y = self.balloon_path.get_position(path_position)
+        self.x[slot] = path.round_like_rect(x)
+        self.y[slot] = path.round_like_rect(y)
+
+    def advance(self, slots, amount=None):
+        """
+        :param slots: sequence of int, the slots of the balloons to move
+        :param amount: int or float, the number of points to move forwards on the path. If None, each balloon moves by its speed
+        :return: list of BalloonView, the balloons that reached the end of the path. They are not moved or killed here
+        Moves every balloon in slots along the path at once and updates their rects
+        """
+        slots = np.asarray(slots, dtype=np.intp)
+        if len(slots) == 0:
+            return []
+
+        new_path_position = self.path_position[slots] + (self.speed[slots] if amount is None else amount)
+        is_reaching_end = new_path_position >= len(self.balloon_path)
+
+        moving_slots = slots[~is_reaching_end]
+        moving_path_position = np.maximum(new_path_position[~is_reaching_end], 0)
+        self.path_position[moving_slots] = moving_path_position
+        # the path's lookup table is shared by every balloon on it, positions between two points are interpolated
+        x, y = self.balloon_path.get_positions(moving_path_position)
+        self.x[moving_slots] = path.round_like_rect(x)
+        self.y[moving_slots] = path.round_like_rect(y)
+
+        # the rects are what the drawing and collision code reads, so copy the new positions over
+        views = self.views
+        for slot, x, y in zip(moving_slots.tolist(), self.x[moving_slots].tolist(), self.y[moving_slots].tolist()):
+            views[slot].rect.center = (x, y)
+
+        return [views[slot] for slot in slots[is_reaching_end].tolist()]
+
+
+class BalloonView(balloon.Balloon):
+    """A Balloon whose path_position, speed and layer are stored in a BalloonBatch. It is drawn, collided with and popped like any
+    other Balloon"""
+
+    def __init__(self, batch, slot, current_layer, balloon_path, path_index=0):
+        """
+        :param batch: BalloonBatch, stores the values of this balloon
+        :param slot: int, the index of this balloon in the arrays of batch
+        """
+        self.batch = batch
+        self.slot = slot
+        super().__init__(current_layer, balloon_path, path_index)
+        self.batch.layer[slot] = current_layer.number_of_layers
+        self.batch.speed[slot] = current_layer.speed
+
+    @property
+    def path_position(self):
+        return float(self.batch.path_position[self.slot])
+
+    @path_position.setter
+    def path_position(self, path_position):
+        self.batch.set_path_position(self.slot, path_position)
+
+    def peel_layer(self, number_of_layers=1, tower_increment_pop_method=None):
+        """Peels the layers like a Balloon does, then records the remaining layers in the batch"""
+        super().peel_layer(number_of_layers, tower_increment_pop_method)
+        if self.current_layer is not None:
+            self.batch.layer[self.slot] = self.current_layer.number_of_layers
+            self.batch.speed[self.slot] = self.current_layer.speed
+
+
+class BalloonBatchGroup(sprite_groups.BalloonGroup):
+    """Sprite group that stores its Balloons in one BalloonBatch per path and moves them together"""
+
+    def __init__(self, match_state=None):
+        """:param match_state: match_state.MatchState or None, see sprite_groups.BalloonGroup"""
+        super().__init__(match_state)
+        self.batches = {}  # path.Path : BalloonBatch
+
+    def add(self, *balloons):
+        """Balloons that aren't BalloonViews yet are moved into the batch of their path"""
+        views = []
+        for balloon_to_add in balloons:
+            if not isinstance(balloon_to_add, BalloonView):
+                if balloon_to_add.balloon_path not in self.batches:
+                    self.batches[balloon_to_add.balloon_path] = BalloonBatch(balloon_to_add.balloon_path)
+                balloon_to_add = self.batches[balloon_to_add.balloon_path].add(balloon_to_add)
+            views.append(balloon_to_add)
+        super().add(*views)
+
+    def remove_internal(self, sprite):
+        """Frees the slot of a balloon that is killed or removed"""
+        super().remove_internal(sprite)
+        sprite.batch.remove(sprite.slot)
+
+    def update(self, bullet_sprites, bullet_hash=None):
+        """
+        :param bullet_sprites: pygame.sprite.Group, contains all the bullets in the game
+        :param bullet_hash: collision.BulletSpatialHash or None, built from bullet_sprites this frame
+        Same as calling update(...) on every Balloon, except the balloons that weren't hit move in one step per batch
+        """
+        slots_to_move = {batch: [] for batch in self.batches.values()}
+        for view in self.sprites():
+            if not view.handle_collided_bullets(bullet_sprites, bullet_hash):
+                slots_to_move[view.batch].append(view.slot)
+
+        for batch, slots in slots_to_move.items():
+            reached_end_views = batch.advance(slots)
+            for view in reached_end_views:
+                view.kill()
+            if reached_end_views and self.match_state is not None:
+                self.match_state.life_point.decrease(len(reached_end_views))
+
+        # forget about the paths that no balloon travels on anymore
+        for balloon_path, batch in list(self.batches.items()):
+            if not len(batch):
+                del self.batches[balloon_path]
@@ -1,36 +1,44 @@
-import message_buffer
+import logging
 
-import logging.config
-
-logging.config.fileConfig('logging.conf')
 logger = logging.getLogger('simpleLogger')
 
-balance = 100  # amount of money user currently has
+STARTING_BALANCE = 100
+
+
+class Bank:
+    """The money of one match. Every match has its own, see match_state.MatchState"""
 
+    def __init__(self, messages, balance=STARTING_BALANCE):
+        """
+        :param messages: message_buffer.MessageBuffer or None, where the new balance is pushed every time it changes. None
+        pushes nothing
+        :param balance: int, amount of money user starts with
+        """
+        self.messages = messages
+        self.balance = balance  # amount of money user currently has
 
-def deposit(amount):
-    """
-    :param amount: int, adds the specified amount of money to the balance
-    """
-    assert isinstance(amount, int), 'amount must be an integer'
+    def deposit(self, amount):
+        """
+        :param amount: int, adds the specified amount of money to the balance
+        """
+        assert isinstance(amount, int), 'amount must be an integer'
 
-    global balance
-    balance += amount
-    
-    #if client & server, they will use this value balance from message_buffer. If solo, adding this to message_buffer doesn't affect game play
-    #thus, add new balance to message_buffer
-    message_buffer.push_bank_balance_message(balance)
+        self.balance += amount
 
+        #if client & server, they will use this value balance from message_buffer. If solo, adding this to message_buffer doesn't affect game play
+        #thus, add new balance to message_buffer
+        if self.messages is not None:
+            self.messages.push_bank_balance_message(self.balance)
 
-def withdraw(amount):
-    """
-    :param amount: int, decreases the specified amount of money to the balance
-    """
-    assert isinstance(amount, int), 'amount must be an integer'
+    def withdraw(self, amount):
+        """
+        :param amount: int, decreases the specified amount of money to the balance
+        """
+        assert isinstance(amount, int), 'amount must be an integer'
 
-    global balance
-    balance -= amount
+        self.balance -= amount
 
-    #if client & server, they will use this value balance from message_buffer. If solo, adding this to message_buffer doesn't affect game play
-    #thus, add new balance to message_buffer
-    message_buffer.push_bank_balance_message(balance)
+        #if client & server, they will use this value balance from message_buffer. If solo, adding this to message_buffer doesn't affect game play
+        #thus, add new balance to message_buffer
+        if self.messages is not None:
+            self.messages.push_bank_balance_message(self.balance)
@@ -0,0 +1,251 @@
+"""Measures how fast the headless simulation runs scripted scenarios with the real towers, balloons, bullets and levels, and
+compares the results against a stored baseline so a change that slows the game down is caught.
+
+Run from the repository root:
+    python benchmarks/benchmark_simulation.py                    # run every scenario and compare to benchmarks/baseline.json
+    python benchmarks/benchmark_simulation.py --save-baseline    # run every scenario and store the results as the baseline
+    python benchmarks/benchmark_simulation.py --scenario explosion_storm --frames 20
+
+A faster or slower machine speeds up every scenario alike, so the gate doesn't compare frames per second, it compares each
+scenario's speed relative to REFERENCE_SCENARIO, which is always run in the same process. Exits with 1 if a scenario's
+relative speed fell more than --tolerance below its baseline. The baseline isn't committed, store one with --save-baseline
+on the machine the gate runs on"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # the game's modules are in the parent
+
+import balloon
+import level
+import path
+import simulation
+import tower
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+DEFAULT_FRAMES = 30
+DEFAULT_REPEATS = 3  # the timed run is repeated and the fastest is kept, the others were slowed down by something else
+DEFAULT_TOLERANCE = 0.2  # a scenario may be this fraction slower than its baseline before it counts as a regression
+REFERENCE_SCENARIO = 'linear_towers_vs_l5'  # the other scenarios' speeds are compared relative to this one's
+
+
+class Scenario:
+    """A tower layout against balloons already spread along the path, so every tower has something to shoot from frame 1"""
+
+    def __init__(self, name, tower_type, tower_count, balloon_type, balloon_count, use_balloon_batch=False,
+                 use_bullet_pool=False):
+        """
+        :param name: str, what the scenario is reported as
+        :param tower_type: str constant, eg, tower.LINEAR_TOWER
+        :param tower_count: int, the number of towers, placed in columns on both sides of the path
+        :param balloon_type: str constant, eg, balloon.BALLOON_L5
+        :param balloon_count: int, the number of balloons, spread evenly along the path
+        :param use_balloon_batch: boolean, see simulation.Simulation
+        :param use_bullet_pool: boolean, see simulation.Simulation
+        """
+        self.name = name
+        self.tower_type = tower_type
+        self.tower_count = tower_count
+        self.balloon_type = balloon_type
+        self.balloon_count = balloon_count
+        self.use_balloon_batch = use_balloon_batch
+        self.use_bullet_pool = use_bullet_pool
+
+    def create_simulation(self):
+        """returns simulation.Simulation, ready to be stepped"""
+        balloon_path = path.get_path(path.DEFAULT_PATH)
+        match = simulation.Simulation([level.Level([], balloon_path)], use_balloon_batch=self.use_balloon_batch,
+                                      use_bullet_pool=self.use_bullet_pool, use_own_sprite_groups=True)
+
+        match.bank.balance = 10 ** 9  # the layout is what's measured, not whether it can be paid for
+        columns = (60, 75, 125, 140)  # the path is the line x = 100
+        rows = -(-self.tower_count // len(columns))
+        for i in range(self.tower_count):
+            match.place_tower(self.tower_type, (columns[i % len(columns)], 20 + (i // len(columns)) * 260 // rows))
+
+        last_path_index = len(balloon_path) - 2  # not the last point, a balloon there has already escaped
+        match.balloon_sprites.add(*[balloon.create_balloon(self.balloon_type, balloon_path,
+                                                           i * last_path_index // self.balloon_count)
+                                    for i in range(self.balloon_count)])
+        return match
+
+
+SCENARIOS = [
+    Scenario('linear_towers_vs_l5', tower.LINEAR_TOWER, 100, balloon.BALLOON_L5, 5000),
+    Scenario('linear_towers_vs_l5_batched', tower.LINEAR_TOWER, 100, balloon.BALLOON_L5, 5000, use_balloon_batch=True,
+             use_bullet_pool=True),
+    Scenario('three_sixty_storm', tower.THREE_SIXTY_TOWER, 40, balloon.BALLOON_L3, 2000),
+    Scenario('three_sixty_storm_pooled', tower.THREE_SIXTY_TOWER, 40, balloon.BALLOON_L3, 2000, use_bullet_pool=True),
+    Scenario('explosion_storm', tower.EXPLOSION_TOWER, 40, balloon.BALLOON_L3, 2000),
+    Scenario('teleportation_towers_vs_l2', tower.TELEPORTATION_TOWER, 40, balloon.BALLOON_L2, 2000),
+]
+
+
+def count_entities(match):
+    return len(match.tower_sprites) + len(match.balloon_sprites) + len(match.bullet_sprites)
+
+
+def time_scenario(scenario, frames):
+    """returns (seconds, entity updates), the time it took to step frames frames and the entities updated in them"""
+    match = scenario.create_simulation()
+    entity_updates = 0
+    start = time.perf_counter()
+    for _ in range(frames):
+        entity_updates += count_entities(match)
+        match.step()
+    return time.perf_counter() - start, entity_updates
+
+
+def run_scenario(scenario, frames=DEFAULT_FRAMES, repeats=DEFAULT_REPEATS):
+    """
+    :param scenario: Scenario
+    :param frames: int, the number of frames to step
+    :param repeats: int, the number of timed runs. The fastest one is reported
+    :return: dict, the results:
+        frames_per_second: frames stepped per second
+        entities_per_second: towers, balloons and bullets updated per second
+        peak_memory_bytes: the most memory allocated while stepping, above what the scenario started with
+        allocations: memory blocks allocated while stepping, see count_allocations(...)
+        gc_collections: the number of garbage collections while stepping
+    The memory is measured by two more runs, with tracemalloc on, which slows everything down
+    """
+    seconds, entity_updates = min(time_scenario(scenario, frames) for _ in range(repeats))
+
+    match = scenario.create_simulation()
+    gc.collect()
+    gc_collections_before = sum(stats['collections'] for stats in gc.get_stats())
+    tracemalloc.start()
+    match.step(frames)
+    peak_memory_bytes = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    gc_collections = sum(stats['collections'] for stats in gc.get_stats()) - gc_collections_before
+
+    allocations = count_allocations(scenario.create_simulation(), frames)
+
+    return {'frames': frames,
+            'frames_per_second': round(frames / seconds, 2),
+            'entities_per_second': round(entity_updates / seconds),
+            'peak_memory_bytes': peak_memory_bytes,
+            'allocations': allocations,
+            'gc_collections': gc_collections}
+
+
+def count_allocations(match, frames):
+    """
+    :param match: simulation.Simulation, the match to step
+    :param frames: int, the number of frames to step
+    :return: int, the memory blocks allocated while stepping. Blocks freed again don't cancel them out, so bullets made and
+    destroyed every frame still count. Only what is allocated and freed within the same frame per line of code is missed
+    The blocks are counted from a tracemalloc snapshot after every frame, the growth in count of each line is added up
+    """
+    ignored_files = [tracemalloc.Filter(False, tracemalloc.__file__)]  # the snapshots themselves
+    tracemalloc.start()
+    snapshot = tracemalloc.take_snapshot().filter_traces(ignored_files)
+    allocations = 0
+    for _ in range(frames):
+        match.step()
+        next_snapshot = tracemalloc.take_snapshot().filter_traces(ignored_files)
+        allocations += sum(stat.count_diff for stat in next_snapshot.compare_to(snapshot, 'lineno') if stat.count_diff > 0)
+        snapshot = next_snapshot
+    tracemalloc.stop()
+    return allocations
+
+
+def add_relative_speeds(results):
+    """
+    :param results: dict, scenario name : run_scenario(...) result, including REFERENCE_SCENARIO
+    Adds relative_speed to every result: its frames per second divided by REFERENCE_SCENARIO's
+    """
+    reference_frames_per_second = results[REFERENCE_SCENARIO]['frames_per_second']
+    for result in results.values():
+        result['relative_speed'] = round(result['frames_per_second'] / reference_frames_per_second, 4)
+
+
+def get_comparable_names(results, baseline):
+    """
+    :param results: dict, scenario name : run_scenario(...) result
+    :param baseline: dict, the same, as stored by --save-baseline
+    :return: list of str, the names of the scenarios that have a baseline stepping as many frames. The speed of a longer run
+    isn't comparable, the match is busier later on. Baselines stored before relative speeds were added are skipped too
+    """
+    return [name for name, result in results.items()
+            if name in baseline and result['frames'] == baseline[name]['frames'] and 'relative_speed' in baseline[name]]
+
+
+def compare_to_baseline(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    :param results: dict, scenario name : run_scenario(...) result, with the relative speeds added by add_relative_speeds(...)
+    :param baseline: dict, the same, as stored by --save-baseline
+    :param tolerance: float, the fraction of the baseline's relative speed a scenario may lose
+    :return: list of str, the names of the scenarios slower than their baseline allows, relative to REFERENCE_SCENARIO.
+    Scenarios without a baseline, or whose baseline stepped another number of frames, are skipped
+    """
+    return [name for name in get_comparable_names(results, baseline)
+            if results[name]['relative_speed'] < baseline[name]['relative_speed'] * (1 - tolerance)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmarks the headless simulation')
+    parser.add_argument('--scenario', action='append', choices=[scenario.name for scenario in SCENARIOS],
+                        help='the scenario to run, can be given more than once. Every scenario if not given')
+    parser.add_argument('--frames', type=int, default=DEFAULT_FRAMES, help='the number of frames each scenario steps')
+    parser.add_argument('--repeats', type=int, default=DEFAULT_REPEATS,
+                        help='the number of timed runs of each scenario, the fastest is reported')
+    parser.add_argument('--baseline', default=BASELINE_FILE, help='the baseline JSON file')
+    parser.add_argument('--save-baseline', action='store_true', help='store the results as the baseline')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='the fraction of the baseline relative speed a scenario may lose')
+    args = parser.parse_args(argv)
+
+    # the reference is always run, the others' speeds are relative to it
+    scenarios = [scenario for scenario in SCENARIOS
+                 if not args.scenario or scenario.name in args.scenario or scenario.name == REFERENCE_SCENARIO]
+    results = {}
+    print('{:<30} {:>10} {:>9} {:>14} {:>12} {:>12} {:>6}'.format('scenario', 'frames/s', 'relative', 'entities/s',
+                                                                  'peak KiB', 'allocations', 'gcs'))
+    for scenario in scenarios:
+        results[scenario.name] = run_scenario(scenario, args.frames, args.repeats)
+    add_relative_speeds(results)
+    for name, result in results.items():
+        print('{:<30} {:>10.2f} {:>9.2f} {:>14} {:>12} {:>12} {:>6}'.format(
+            name, result['frames_per_second'], result['relative_speed'], result['entities_per_second'],
+            result['peak_memory_bytes'] // 1024, result['allocations'], result['gc_collections']))
+
+    if args.save_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as baseline_file:
+                baseline = json.load(baseline_file)
+        baseline.update(results)
+        with open(args.baseline, 'w') as baseline_file:
+            json.dump(baseline, baseline_file, indent=2, sort_keys=True)
+        print('saved the baseline to {}'.format(args.baseline))
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print('no baseline at {}, run with --save-baseline first'.format(args.baseline))
+        return 0
+    with open(args.baseline) as baseline_file:
+        baseline = json.load(baseline_file)
+    comparable_names = get_comparable_names(results, baseline)
+    for name in results:
+        if name in comparable_names:
+            print('{:<30} {:+.1%} relative speed against the baseline'.format(
+                name, results[name]['relative_speed'] / baseline[name]['relative_speed'] - 1))
+        elif name in baseline:
+            print('{:<30} not compared, the baseline stepped {} frames, not {}'.format(
+                name, baseline[name]['frames'], results[name]['frames']))
+    regressions = compare_to_baseline(results, baseline, args.tolerance)
+    if regressions:
+        print('slower than the baseline allows: {}'.format(', '.join(regressions)))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,139 @@
+"""Contains the one place the game is set up: logging, pygame and the display. The other modules only ask for their logger at
+import and never configure anything, so importing one in a test, or in a worker process of evaluator.py, doesn't read
+logging.conf or open a window.
+
+Run the game with `python bootstrap.py` (or `python game.py`, which takes the same arguments). `python bootstrap.py --profile-startup` prints how long each
+module takes to import instead. `python bootstrap.py --frame-profile frames.json` writes the frame profiler's percentiles to
+frames.json every few seconds while playing. `python bootstrap.py --record match.tdrp` records the match so replay.py can
+play it back"""
+
+import argparse
+import logging.config
+import os
+import re
+import subprocess
+import sys
+import time
+
+import pygame
+
+logger = logging.getLogger('simpleLogger')
+
+LOGGING_CONFIG_FILE = 'logging.conf'
+DISPLAY_SIZE = (400, 400)
+CAPTION = 'ML Tower Defence'
+
+display_surface = None  # the display Surface, once init_display() made it
+fps_clock = None  # pygame.time.Clock, once init_display() made it
+frame_profile_path = None  # str or None, the JSON file the game loop's frame profiler writes to, see frame_profiler.py
+record_path = None  # str or None, the file the match's inputs are recorded to, see replay.py
+
+_is_logging_configured = False
+
+# a line of `python -X importtime`, eg, 'import time:       321 |       1234 |   pygame.sprite'
+_IMPORT_TIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \| *(\S+)$')
+
+
+def configure_logging(config_file=LOGGING_CONFIG_FILE):
+    """Reads the logging config. Only the first call does anything"""
+    global _is_logging_configured
+    if not _is_logging_configured:
+        logging.config.fileConfig(config_file)
+        _is_logging_configured = True
+
+
+def init_display():
+    """
+    :return: pygame.Surface, the display Surface
+    Initializes pygame and opens the game's window. Only the first call does anything, later ones return the same Surface
+    """
+    global display_surface
+    global fps_clock
+    if display_surface is None:
+        pygame.init()
+        display_surface = pygame.display.set_mode(DISPLAY_SIZE)
+        pygame.display.set_caption(CAPTION)
+        fps_clock = pygame.time.Clock()
+    return display_surface
+
+
+def bootstrap():
+    """
+    :return: pygame.Surface, the display Surface
+    Sets up everything the game needs before its first screen is shown
+    """
+    configure_logging()
+    return init_display()
+
+
+def profile_imports(module_name='game'):
+    """
+    :param module_name: str, the module to import, eg, 'game'
+    :return: list of (module, self time, cumulative time), every module imported by importing module_name, in seconds,
+    slowest self time first
+    Imports module_name in a new interpreter, so nothing is already imported, and no window is opened
+    """
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import {}'.format(module_name)],
+                               capture_output=True, text=True, env=dict(os.environ, SDL_VIDEODRIVER='dummy'))
+    if completed.returncode != 0:
+        raise RuntimeError('importing {} failed:\n{}'.format(module_name, completed.stderr))
+
+    import_times = []
+    for line in completed.stderr.splitlines():
+        match = _IMPORT_TIME_LINE.match(line)
+        if match:
+            import_times.append((match.group(3), int(match.group(1)) / 1e6, int(match.group(2)) / 1e6))
+    return sorted(import_times, key=lambda import_time: import_time[1], reverse=True)
+
+
+def profile_startup(module_name='game', top=20):
+    """Prints the slowest imports of module_name, then how long bootstrap() takes"""
+    import_times = profile_imports(module_name)
+    total = max((cumulative for module, self_time, cumulative in import_times), default=0)
+
+    print('importing {} took {:.3f}s'.format(module_name, total))
+    print('{:>10} {:>10}  module'.format('self (s)', 'total (s)'))
+    for module, self_time, cumulative in import_times[:top]:
+        print('{:>10.4f} {:>10.4f}  {}'.format(self_time, cumulative, module))
+
+    start = time.perf_counter()
+    configure_logging()
+    print('configure_logging() took {:.3f}s'.format(time.perf_counter() - start))
+    start = time.perf_counter()
+    init_display()
+    print('init_display() took {:.3f}s'.format(time.perf_counter() - start))
+    pygame.quit()
+
+
+def main(argv=None):
+    """
+    :param argv: list of str or None, the command line arguments. None reads them from sys.argv
+    :return: boolean, whether the game is to be played, ie, bootstrap() was called and the settings are set
+    """
+    parser = argparse.ArgumentParser(description=CAPTION)
+    parser.add_argument('--profile-startup', action='store_true',
+                        help='print how long each module takes to import, instead of playing')
+    parser.add_argument('--module', default='game', help='the module --profile-startup imports, eg, match_server')
+    parser.add_argument('--top', type=int, default=20, help='the number of modules --profile-startup prints')
+    parser.add_argument('--frame-profile', metavar='PATH',
+                        help="write the frame times' percentiles to this JSON file every few seconds while playing")
+    parser.add_argument('--record', metavar='PATH', help='record the match to this file, see replay.py')
+    args = parser.parse_args(argv)
+
+    if args.profile_startup:
+        profile_startup(args.module, args.top)
+        return False
+
+    # run as `python bootstrap.py`, this file is the module __main__, and the game imports it again as bootstrap. The game
+    # only reads the settings and the display from that one, so they're set there
+    import bootstrap as game_bootstrap
+    game_bootstrap.frame_profile_path = args.frame_profile
+    game_bootstrap.record_path = args.record
+    game_bootstrap.bootstrap()
+    return True
+
+
+if __name__ == '__main__':
+    if main():
+        import game
+        game.run()
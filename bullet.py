@@ -2,9 +2,9 @@ import abc
 import pygame
 import colours
 import math
-import logging.config
+import surface_cache
+import logging
 
-logging.config.fileConfig('logging.conf')
 logger = logging.getLogger('simpleLogger')
 
 STANDARD_BULLET = 'STANDARD_BULLET'
@@ -34,9 +34,17 @@ class Bullet(pygame.sprite.Sprite, metaclass=abc.ABCMeta):
 
         super().__init__()
 
-        self.image = pygame.Surface([dimension[0], dimension[1]])
-        self.image.fill(colour)
+        self.image = surface_cache.get_filled_surface(colour, dimension)
         self.rect = self.image.get_rect()
+        self.reset(start_position, end_position, pop_power, tower_increment_pop_count_method)
+
+    def reset(self, start_position, end_position, pop_power, tower_increment_pop_count_method):
+        """
+        :param start_position: 2-element tuple, the starting position of this bullet
+        :param end_position: 2-element tuple, the intended final position of this bullet
+        :param pop_power: int, the number of layers to peel from the balloon if this bullet collides with it
+        Sets where this bullet starts and where it's headed. Also used to reuse a killed bullet without making a new Surface
+        """
         self.rect.centerx = start_position[0]
         self.rect.centery = start_position[1]
 
@@ -57,7 +65,8 @@ class Bullet(pygame.sprite.Sprite, metaclass=abc.ABCMeta):
         """
         Called every frame. If the bullet is to continue moving, continue moving. If it has reached the end of its time (frames_remaining_until_self_destroy), kill self
         """
-        if self.frames_remaining_until_self_destroy:
+        # frames_remaining_until_self_destroy is usually a fraction, so it must be compared instead of checked for 0
+        if self.frames_remaining_until_self_destroy > 0:
             # moves towards the destination by step size
             self.rect.centerx += self.step_x
             self.rect.centery += self.step_y
@@ -73,6 +82,8 @@ class Bullet(pygame.sprite.Sprite, metaclass=abc.ABCMeta):
 
 
 class StandardBullet(Bullet):
+    bullet_type = STANDARD_BULLET
+
     def __init__(self, start_position, end_position, pop_power, tower_increment_pop_count_method):
         """
         :param start_position: 2-element tuple, the starting position of this bullet
@@ -91,6 +102,8 @@ class StandardBullet(Bullet):
 
 
 class ExplosionBullet(Bullet):
+    bullet_type = EXPLOSION_BULLET
+
     def __init__(self, start_position, end_position, pop_power, tower_increment_pop_count_method):
         """
         :param start_position: 2-element tuple, the starting position of this bullet
@@ -106,35 +119,45 @@ class ExplosionBullet(Bullet):
     def handle_collision_with_balloon(self, bullet_sprites):
         """
         :param bullet_sprites: pygame.sprite.Group, contains all the bulleti sprites in the game
+        :return: list of StandardBullet, the bullets that were created
         Upon hitting a balloon, 4 Standard bullets are created from the position of this one. Then this one is destroyed
         """
-        bullet_sprites.add(
+        recycled_bullets = getattr(bullet_sprites, 'recycled_bullets', None)  # only a bullet_pool.BulletPool keeps them
+        new_bullets = [
             create_bullet(bullet_type=STANDARD_BULLET,
                           start=(self.rect.centerx, self.rect.centery),
                           destination=(self.rect.centerx, self.rect.centery - 20),
                           pop_power=self.pop_power,
-                          tower_increment_pop_method=self.tower_increment_pop_method),
+                          tower_increment_pop_method=self.tower_increment_pop_method,
+                          recycled_bullets=recycled_bullets),
 
             create_bullet(bullet_type=STANDARD_BULLET,
                           start=(self.rect.centerx, self.rect.centery),
                           destination=(self.rect.centerx + 20, self.rect.centery),
                           pop_power=self.pop_power,
-                          tower_increment_pop_method=self.tower_increment_pop_method),
+                          tower_increment_pop_method=self.tower_increment_pop_method,
+                          recycled_bullets=recycled_bullets),
             create_bullet(bullet_type=STANDARD_BULLET,
                           start=(self.rect.centerx, self.rect.centery),
                           destination=(self.rect.centerx, self.rect.centery + 20),
                           pop_power=self.pop_power,
-                          tower_increment_pop_method=self.tower_increment_pop_method),
+                          tower_increment_pop_method=self.tower_increment_pop_method,
+                          recycled_bullets=recycled_bullets),
             create_bullet(bullet_type=STANDARD_BULLET,
                           start=(self.rect.centerx, self.rect.centery),
                           destination=(self.rect.centerx - 20, self.rect.centery),
                           pop_power=self.pop_power,
-                          tower_increment_pop_method=self.tower_increment_pop_method))
+                          tower_increment_pop_method=self.tower_increment_pop_method,
+                          recycled_bullets=recycled_bullets)]
+        bullet_sprites.add(new_bullets)
 
         self.kill()
+        return new_bullets
 
 
 class TeleportationBullet(Bullet):
+    bullet_type = TELEPORTATION_BULLET
+
     def __init__(self, start_position, end_position, pop_power, tower_increment_pop_count_method):
         """
         :param start_position: 2-element tuple, the starting position of this bullet
@@ -153,12 +176,14 @@ class TeleportationBullet(Bullet):
         self.kill()
 
 
-def create_bullet(bullet_type, start, destination, pop_power, tower_increment_pop_method):
+def create_bullet(bullet_type, start, destination, pop_power, tower_increment_pop_method, recycled_bullets=None):
     """
     :param bullet_type: str constant, which balloon will be the current starting balloon for this context
     :param start: 2-element tuple, the start position of the bullet
     :param destination: 2-element tuple, the position the bullet is headed
     :param pop_power: int, the number of layer of balloon this bullet can pop if it hits a balloon
+    :param recycled_bullets: dict or None, bullet_type : list of killed bullets to reuse instead of making a new one, see
+    bullet_pool.BulletPool.recycled_bullets
     :return: the bullet type, eg StandardBullet
     This simple factory creates a StandardBullet, ExplosionBullet, or TeleportationBullet
     """
@@ -167,6 +192,11 @@ def create_bullet(bullet_type, start, destination, pop_power, tower_increment_po
     assert isinstance(destination, tuple) and len(destination) == 2, 'destination must be a 2-element tuple'
     assert isinstance(pop_power, int), 'pop_power must be an integer'
 
+    if recycled_bullets is not None and recycled_bullets.get(bullet_type):
+        reused_bullet = recycled_bullets[bullet_type].pop()
+        reused_bullet.reset(start, destination, pop_power, tower_increment_pop_method)
+        return reused_bullet
+
     if bullet_type == STANDARD_BULLET:
         return StandardBullet(start, destination, pop_power, tower_increment_pop_method)
     elif bullet_type == EXPLOSION_BULLET:
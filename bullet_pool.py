@@ -0,0 +1,119 @@
+"""Contains a bullet sprite group backed by preallocated arrays. The position, step and remaining frames of every live
+bullet are kept in NumPy arrays, so all the bullets move in one vectorized update, and killed bullets are kept in the
+pool's own free list for bullet.create_bullet(...) to reuse instead of being thrown away"""
+
+import numpy as np
+import pygame
+import logging
+
+import bullet
+import path
+
+logger = logging.getLogger('simpleLogger')
+
+
+class BulletPool(pygame.sprite.Group):
+    """Bullet sprite group that stores the values of its bullets in arrays. Each bullet owns a slot, an index into every array"""
+
+    def __init__(self, capacity=256):
+        """
+        :param capacity: int, the number of slots to allocate up front. The arrays double in size when they run out
+        """
+        assert isinstance(capacity, int) and capacity > 0, 'capacity must be a positive integer'
+
+        super().__init__()
+
+        self.x = np.zeros(capacity, dtype=np.float64)
+        self.y = np.zeros(capacity, dtype=np.float64)
+        self.step_x = np.zeros(capacity, dtype=np.float64)
+        self.step_y = np.zeros(capacity, dtype=np.float64)
+        self.frames_remaining = np.zeros(capacity, dtype=np.float64)
+        self.is_live = np.zeros(capacity, dtype=bool)
+
+        self.bullets = [None] * capacity  # the bullet using each slot, None if the slot is free
+        self._free_slots = list(range(capacity - 1, -1, -1))  # popping from the end hands out the lowest slot first
+        self._killed_bullets = []  # recycled at the end of update(), once no balloon can still be handling them
+        # killed bullets that bullet.create_bullet(...) reuses instead of making new ones. At most capacity are kept
+        self.recycled_bullets = {bullet.STANDARD_BULLET: [],
+                                 bullet.EXPLOSION_BULLET: [],
+                                 bullet.TELEPORTATION_BULLET: []}
+
+    @property
+    def capacity(self):
+        return len(self.bullets)
+
+    def _grow(self):
+        """Doubles the number of slots, keeping the values of the existing ones"""
+        old_capacity = self.capacity
+        for name in ('x', 'y', 'step_x', 'step_y', 'frames_remaining', 'is_live'):
+            old_array = getattr(self, name)
+            new_array = np.zeros(2 * old_capacity, dtype=old_array.dtype)
+            new_array[:old_capacity] = old_array
+            setattr(self, name, new_array)
+        self.bullets.extend([None] * old_capacity)
+        self._free_slots = list(range(2 * old_capacity - 1, old_capacity - 1, -1)) + self._free_slots
+        logger.debug('the bullet pool grew to {} slots'.format(2 * old_capacity))
+
+    def add_internal(self, sprite, layer=None):
+        """Gives the new bullet a slot and copies its values into the arrays"""
+        super().add_internal(sprite, layer)
+
+        if not self._free_slots:
+            self._grow()
+        slot = self._free_slots.pop()
+
+        sprite.pool_slot = slot
+        self.bullets[slot] = sprite
+        self.x[slot] = sprite.rect.centerx
+        self.y[slot] = sprite.rect.centery
+        self.step_x[slot] = sprite.step_x
+        self.step_y[slot] = sprite.step_y
+        self.frames_remaining[slot] = sprite.frames_remaining_until_self_destroy
+        self.is_live[slot] = True
+
+    def remove_internal(self, sprite):
+        """Frees the slot of a bullet that is killed or removed"""
+        super().remove_internal(sprite)
+
+        slot = sprite.pool_slot
+        self.bullets[slot] = None
+        self.is_live[slot] = False
+        self._free_slots.append(slot)
+        self._killed_bullets.append(sprite)
+
+    def _recycle(self, killed_bullet):
+        """
+        :param killed_bullet: Bullet, a bullet that was killed and is no longer referenced by the game
+        Lets bullet.create_bullet(...) reuse killed_bullet, unless capacity bullets are already kept
+        """
+        assert not killed_bullet.alive(), 'only killed bullets can be recycled'
+        if sum(len(recycled) for recycled in self.recycled_bullets.values()) < self.capacity:
+            self.recycled_bullets[killed_bullet.bullet_type].append(killed_bullet)
+
+    def update(self):
+        """
+        Same as calling update() on every bullet: bullets with frames remaining move by their step, the others are killed
+        """
+        live_slots = np.flatnonzero(self.is_live)
+        is_moving = self.frames_remaining[live_slots] > 0
+        moving_slots = live_slots[is_moving]
+        expired_slots = live_slots[~is_moving]
+
+        self.x[moving_slots] = path.round_like_rect(self.x[moving_slots] + self.step_x[moving_slots])
+        self.y[moving_slots] = path.round_like_rect(self.y[moving_slots] + self.step_y[moving_slots])
+        self.frames_remaining[moving_slots] -= 1
+
+        # the rects are what the drawing and collision code reads, so copy the new positions over
+        bullets = self.bullets
+        for slot, x, y in zip(moving_slots.tolist(), self.x[moving_slots].astype(int).tolist(),
+                              self.y[moving_slots].astype(int).tolist()):
+            bullets[slot].rect.center = (x, y)
+
+        for slot in expired_slots.tolist():
+            bullets[slot].kill()
+
+        # bullets killed this frame, whether by colliding or expiring, can now be reused
+        for killed_bullet in self._killed_bullets:
+            if not killed_bullet.alive():
+                self._recycle(killed_bullet)
+        self._killed_bullets = []
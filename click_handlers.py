@@ -0,0 +1,135 @@
+"""Contains the chain of responsibility that handles the defender's left mouse clicks, shared by game.py and server.py. The
+clicks that change the match (placing, upgrading and selling towers) are queued as inputs of the match, so they're applied
+at its next tick and can be recorded, see simulation.Simulation.queue_input(...)"""
+
+import abc
+import logging
+
+import sprite_groups
+import icon
+import simulation
+
+logger = logging.getLogger('simpleLogger')
+
+
+class LeftMouseClickHandler(metaclass=abc.ABCMeta):
+    def __init__(self, next_handler):
+        """If this handler is unable to handle the mouse click, call the next handler to do it"""
+        assert isinstance(next_handler,
+                          LeftMouseClickHandler) or next_handler is None, 'next_handler must be a LeftMouseClickHandler type or None'
+
+        self.next_handler = next_handler
+
+    def handle_click(self, mouse_position):
+        """Wrapper for handling click, contains conditional for letting next handler try"""
+        is_click_handled = self.try_handle_click(mouse_position)
+
+        assert is_click_handled is True or is_click_handled is False, 'is_handled must be either true or false'
+
+        if is_click_handled is False:
+            self.next_handler.handle_click(mouse_position)
+
+    @abc.abstractmethod
+    def try_handle_click(self, mouse_position):
+        """Each class tries to handle the click"""
+
+
+class TowerIconClickHandler(LeftMouseClickHandler):
+    def try_handle_click(self, mouse_position):
+        # logger.debug('towerIconCLickHandler')
+        for tower_icon in sprite_groups.tower_icon_sprites:
+            if tower_icon.rect.collidepoint(mouse_position):
+                # logger.debug('towerIconClickHandler collided')
+                duplicate_tower_icon = tower_icon.on_click()
+                sprite_groups.selected_tower_icon_sprite.empty()
+                sprite_groups.selected_tower_icon_sprite.add(duplicate_tower_icon)
+                return True
+        return False
+
+
+class TowerClickHandler(LeftMouseClickHandler):
+    def try_handle_click(self, mouse_position):
+        # logger.debug('towerCLickHandler')
+        for tow in sprite_groups.tower_sprites:  # must not be named with tower, will result in name clashes
+            if tow.rect.collidepoint(mouse_position):
+                tow.on_click(sprite_groups.upgrade_icon_sprites,
+                             sprite_groups.sell_tower_icon_sprite)  # will clear the sprite groups before adding icons
+                return True
+        return False
+
+
+class UpgradeIconClickHandler(LeftMouseClickHandler):
+    def __init__(self, next_handler, match):
+        """:param match: simulation.Simulation, the upgrade is queued as one of its inputs, and bought at its next tick"""
+        super().__init__(next_handler)
+        self.match = match
+
+    def try_handle_click(self, mouse_position):
+        # logger.debug('UpgradeIconClickHandler')
+        for upgrade_icon in sprite_groups.upgrade_icon_sprites:
+            if upgrade_icon.rect.collidepoint(mouse_position):
+                if isinstance(upgrade_icon, icon.UpgradeIconPlaceholder):
+                    upgrade_icon.on_click(sprite_groups.upgrade_icon_sprites)  # the upgrade is already at max
+                    return True
+                self.match.queue_input(simulation.UPGRADE_TOWER, upgrade_icon.tower.rect.center, upgrade_icon.upgrade)
+                return True
+        return False
+
+
+class SellTowerIconClickHandler(LeftMouseClickHandler):
+    def __init__(self, next_handler, match):
+        """:param match: simulation.Simulation, the sale is queued as one of its inputs, and made at its next tick"""
+        super().__init__(next_handler)
+        self.match = match
+
+    def try_handle_click(self, mouse_position):
+        # logger.debug('SellTowerIconClickHndler')
+        if sprite_groups.sell_tower_icon_sprite:
+            if sprite_groups.sell_tower_icon_sprite.sprite.rect.collidepoint(mouse_position):
+                tower_to_sell = sprite_groups.sell_tower_icon_sprite.sprite.tower
+                self.match.queue_input(simulation.SELL_TOWER, tower_to_sell.rect.center)
+                sprite_groups.sell_tower_icon_sprite.empty()
+                sprite_groups.upgrade_icon_sprites.empty()
+                return True
+        return False
+
+
+class CreateNewTowerClickHandler(LeftMouseClickHandler):
+    def __init__(self, next_handler, match):
+        """:param match: simulation.Simulation, the new tower is queued as one of its inputs, and placed at its next tick"""
+        super().__init__(next_handler)
+        self.match = match
+
+    def try_handle_click(self, mouse_position):
+        # logger.debug('CreateNewTowerClickHandler')
+        if sprite_groups.selected_tower_icon_sprite:
+            # the simulation only places the tower if the player has enough money to make it
+            self.match.queue_input(simulation.PLACE_TOWER, sprite_groups.selected_tower_icon_sprite.sprite.tower_type,
+                                   tuple(mouse_position))
+            sprite_groups.selected_tower_icon_sprite.empty()
+            return True
+        return False
+
+
+class NullClickHandler(LeftMouseClickHandler):
+    def try_handle_click(self, mouse_position):
+        # logger.debug('NullClickHandler')
+        # do nothing
+        return True
+
+
+def create_click_handlers(match):
+    """
+    :param match: simulation.Simulation, the match the clicks are queued as inputs of
+    :return: TowerIconClickHandler, the start of the chain of responsibility
+    """
+    null_click_handler = NullClickHandler(None)
+    create_new_tower_click_handler = CreateNewTowerClickHandler(null_click_handler, match)
+    sell_tower_icon_click_handler = SellTowerIconClickHandler(create_new_tower_click_handler, match)
+    upgrade_icon_click_handler = UpgradeIconClickHandler(sell_tower_icon_click_handler, match)
+    tower_click_handler = TowerClickHandler(upgrade_icon_click_handler)
+    return TowerIconClickHandler(tower_click_handler)
+
+
+def handle_left_mouse_click(tower_icon_click_handler, mouse_position):
+    tower_icon_click_handler.handle_click(mouse_position)
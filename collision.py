@@ -0,0 +1,77 @@
+"""Contains the broad phase of the collision checks between balloons and bullets. Bullets are hashed into grid cells once per
+frame, so each balloon only checks the bullets that share a cell with it instead of every bullet in the game"""
+
+import logging
+
+logger = logging.getLogger('simpleLogger')
+
+
+class BulletSpatialHash:
+    """Buckets bullets by every cell their rect overlaps"""
+
+    def __init__(self, cell_size=32):
+        """
+        :param cell_size: int, the width and height of a cell, in pixels
+        """
+        assert isinstance(cell_size, int) and cell_size > 0, 'cell_size must be a positive integer'
+
+        self.cell_size = cell_size
+        self._cells = {}  # (column, row) : list of (order, bullet)
+        self._next_order = 0  # bullets are returned in the order they were added, same as the sprite group
+
+    def _get_cell_keys(self, rect):
+        """returns the keys of every cell the rect overlaps"""
+        cell_size = self.cell_size
+        return [(column, row)
+                for column in range(rect.left // cell_size, (rect.right - 1) // cell_size + 1)
+                for row in range(rect.top // cell_size, (rect.bottom - 1) // cell_size + 1)]
+
+    def build(self, bullet_sprites):
+        """
+        :param bullet_sprites: pygame.sprite.Group, contains all the bullets in the game
+        Replaces the contents of the hash with the current positions of the bullets. Must be called again after bullets move
+        """
+        self._cells = {}
+        self._next_order = 0
+        self.add(bullet_sprites)
+
+    def add(self, bullets):
+        """
+        :param bullets: iterable of Bullet, bullets created after build(...), eg, by an ExplosionBullet
+        """
+        cells = self._cells
+        cell_size = self.cell_size
+        order = self._next_order
+        for bullet in bullets:
+            entry = (order, bullet)
+            order += 1
+            rect = bullet.rect
+            for column in range(rect.left // cell_size, (rect.right - 1) // cell_size + 1):
+                for row in range(rect.top // cell_size, (rect.bottom - 1) // cell_size + 1):
+                    cell = cells.get((column, row))
+                    if cell is None:
+                        cells[(column, row)] = [entry]
+                    else:
+                        cell.append(entry)
+        self._next_order = order
+
+    def find_collided_bullets(self, rect):
+        """
+        :param rect: pygame.Rect, eg, the rect of a balloon
+        :return: list of Bullet, the live bullets colliding with rect, in the order they were added. This is the same list
+        pygame.sprite.spritecollide(...) returns for the bullet sprite group
+        """
+        cells = self._cells
+        candidates = {}
+        for key in self._get_cell_keys(rect):
+            cell = cells.get(key)
+            if cell is not None:
+                for order, bullet in cell:
+                    candidates[order] = bullet
+        if not candidates:
+            return []
+
+        # a bullet that already hit another balloon this frame is no longer in the sprite group
+        colliderect = rect.colliderect
+        return [candidates[order] for order in sorted(candidates)
+                if colliderect(candidates[order].rect) and candidates[order].alive()]
@@ -0,0 +1,105 @@
+"""Contains a batch evaluator for tower layouts. Each candidate layout is played against the same wave by a headless
+Simulation, and the layouts are spread over a pool of processes so every core is used. The results (pop counts, lives lost
+and the bank balance over time) can be used as training data for plotting_and_ML"""
+
+import concurrent.futures
+import copy
+import functools
+import os
+import logging
+
+import life_point
+import simulation
+
+logger = logging.getLogger('simpleLogger')
+
+
+class LayoutResult:
+    """What happened when a layout was played against a wave"""
+
+    def __init__(self, layout, pop_counts, lives_lost, bank_curve, life_curve, frame_count, is_won):
+        """
+        :param layout: list, the layout that was played, as passed to evaluate_layout(...)
+        :param pop_counts: list of int or None, the pop count of each tower in layout. None if the tower couldn't be paid for
+        :param lives_lost: int, the life points lost by the end of the wave
+        :param bank_curve: list of int, the bank balance after the towers were placed, then after every frame
+        :param life_curve: list of int, the life points after the towers were placed, then after every frame
+        :param frame_count: int, the number of frames simulated
+        :param is_won: boolean, whether the wave was completed without running out of life points
+        """
+        self.layout = layout
+        self.pop_counts = pop_counts
+        self.lives_lost = lives_lost
+        self.bank_curve = bank_curve
+        self.life_curve = life_curve
+        self.frame_count = frame_count
+        self.is_won = is_won
+
+
+def evaluate_layout(layout, wave, max_frames=100000, use_balloon_batch=False, use_bullet_pool=False):
+    """
+    :param layout: list of (tower_type, position) or (tower_type, position, upgrades), the towers to place, in order.
+    upgrades is a 3-element tuple, the number of speed, radius and pop power upgrades to buy for that tower, eg, (1, 0, 2)
+    :param wave: level.Level, the balloons to play against. It isn't changed, a copy is played
+    :param max_frames: int, the most frames to simulate, in case the wave can never finish
+    :param use_balloon_batch: boolean, see simulation.Simulation
+    :param use_bullet_pool: boolean, see simulation.Simulation
+    :return: LayoutResult
+    Places and upgrades the towers with the starting bank balance, the same way a player would, then plays the wave until
+    it's won or lost
+    """
+    match = simulation.Simulation([copy.deepcopy(wave)], use_balloon_batch=use_balloon_batch,
+                                  use_bullet_pool=use_bullet_pool, use_own_sprite_groups=True)
+
+    placed_towers = []
+    for placement in layout:
+        tower_type, position = placement[0], placement[1]
+        speed_upgrades, radius_upgrades, pop_power_upgrades = placement[2] if len(placement) > 2 else (0, 0, 0)
+
+        new_tower = match.place_tower(tower_type, position)
+        placed_towers.append(new_tower)
+        if new_tower is None:
+            continue
+        for _ in range(speed_upgrades):
+            new_tower.upgrade_speed()
+        for _ in range(radius_upgrades):
+            new_tower.upgrade_radius()
+        for _ in range(pop_power_upgrades):
+            new_tower.upgrade_pop_power()
+
+    bank_curve = [match.bank.balance]
+    life_curve = [match.life_point.life_balance]
+    while not match.is_finished() and match.frame_count < max_frames:
+        match.step()
+        bank_curve.append(match.bank.balance)
+        life_curve.append(match.life_point.life_balance)
+
+    return LayoutResult(layout=layout,
+                        pop_counts=[new_tower.get_attack_stats()[3] if new_tower is not None else None for new_tower in placed_towers],
+                        lives_lost=life_point.STARTING_LIFE_BALANCE - match.life_point.life_balance,
+                        bank_curve=bank_curve,
+                        life_curve=life_curve,
+                        frame_count=match.frame_count,
+                        is_won=match.is_won())
+
+
+def evaluate_layouts(layouts, wave, max_workers=None, max_frames=100000, use_balloon_batch=False, use_bullet_pool=False):
+    """
+    :param layouts: list of layouts, see evaluate_layout(...)
+    :param wave: level.Level, the balloons every layout plays against
+    :param max_workers: int or None, the number of processes to use. None uses one per core. 1 evaluates in this process
+    :return: list of LayoutResult, in the same order as layouts
+    Evaluates every layout. Each layout is played in its own match, with its own bank and life points, so layouts never
+    affect each other
+    """
+    evaluate = functools.partial(evaluate_layout, wave=wave, max_frames=max_frames,
+                                 use_balloon_batch=use_balloon_batch, use_bullet_pool=use_bullet_pool)
+    if max_workers == 1:
+        return [evaluate(layout) for layout in layouts]
+
+    # hand the layouts out in chunks so the workers don't wait on the queue between short games
+    chunksize = max(1, len(layouts) // (4 * (max_workers or os.cpu_count() or 1)))
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(evaluate, layouts, chunksize=chunksize))
+    logger.info('evaluated {} layouts'.format(len(results)))
+    return results
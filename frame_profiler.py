@@ -0,0 +1,130 @@
+"""Contains the frame profiler, which measures where the time of each frame of the game loop goes: handling input, each part of
+the simulation, drawing the sprites, rendering text, waiting for the frame clock and updating the display. Each phase keeps the
+times of the last few hundred frames, so its percentiles show whether a stutter came from, eg, the towers or the display.
+They can be shown on screen (see get_overlay_lines()) and written to a JSON file every few seconds (see dump(...))"""
+
+import collections
+import json
+import math
+import time
+import logging
+
+logger = logging.getLogger('simpleLogger')
+
+# the phases of a frame, in the order the game loop goes through them
+INPUT = 'input'
+SPAWN = 'spawn'
+TOWER_UPDATE = 'tower_update'
+BALLOON_UPDATE = 'balloon_update'
+BULLET_UPDATE = 'bullet_update'
+SPRITE_DRAWING = 'sprite_drawing'
+TEXT_RENDERING = 'text_rendering'
+IDLE = 'idle'  # waiting for the frame clock, ie, time to spare
+DISPLAY_UPDATE = 'display_update'
+FRAME = 'frame'  # the whole frame, from begin_frame() to end_frame()
+
+PHASES = (INPUT, SPAWN, TOWER_UPDATE, BALLOON_UPDATE, BULLET_UPDATE, SPRITE_DRAWING, TEXT_RENDERING, IDLE, DISPLAY_UPDATE,
+          FRAME)
+
+WINDOW_SIZE = 300  # the number of frames the percentiles are over, 20 seconds at 15 frames per second
+PERCENTILES = (50, 95, 99)
+DUMP_INTERVAL = 10  # seconds between two writes of the JSON file
+
+
+class NullFrameProfiler:
+    """Measures nothing. Used when no profiler is given, so the code being measured doesn't need to check for one"""
+
+    def begin_frame(self):
+        pass
+
+    def lap(self, phase):
+        pass
+
+    def end_frame(self):
+        pass
+
+
+NULL_PROFILER = NullFrameProfiler()
+
+
+class FrameProfiler:
+    """Times the phases of every frame and keeps the last window_size times of each phase"""
+
+    def __init__(self, window_size=WINDOW_SIZE, dump_path=None, dump_interval=DUMP_INTERVAL, clock=time.perf_counter):
+        """
+        :param window_size: int, the number of frames the percentiles are over
+        :param dump_path: str or None, the JSON file to write get_summary() to every dump_interval seconds. None never writes
+        :param dump_interval: int or float, seconds
+        :param clock: function returning the time in seconds, eg, time.perf_counter
+        """
+        assert isinstance(window_size, int) and window_size > 0, 'window_size must be a positive integer'
+
+        self.window_size = window_size
+        self.dump_path = dump_path
+        self.dump_interval = dump_interval
+        self.clock = clock
+
+        self.frame_count = 0
+        self._times = collections.defaultdict(lambda: collections.deque(maxlen=self.window_size))  # phase : seconds
+        self._frame_times = {}  # phase : seconds spent in it so far this frame
+        self._frame_start = self._last_lap = clock()
+        self._next_dump_time = clock() + dump_interval
+
+    def begin_frame(self):
+        self._frame_times = {}
+        self._frame_start = self._last_lap = self.clock()
+
+    def lap(self, phase):
+        """
+        :param phase: str, one of the phase constants, eg, TOWER_UPDATE
+        Counts the time since the last lap (or begin_frame()) as spent in phase. A phase can be lapped more than once per
+        frame, eg, when the simulation steps several frames, and its times are added up
+        """
+        now = self.clock()
+        self._frame_times[phase] = self._frame_times.get(phase, 0.0) + now - self._last_lap
+        self._last_lap = now
+
+    def end_frame(self):
+        """Keeps the times of this frame, and writes the JSON file if it's time to"""
+        now = self.clock()
+        self._frame_times[FRAME] = now - self._frame_start
+        for phase, seconds in self._frame_times.items():
+            self._times[phase].append(seconds)
+        self.frame_count += 1
+
+        if self.dump_path is not None and now >= self._next_dump_time:
+            self.dump()
+            self._next_dump_time = now + self.dump_interval
+
+    def get_percentiles(self, phase, percentiles=PERCENTILES):
+        """
+        :param phase: str, one of the phase constants
+        :param percentiles: iterable of int or float, from 0 to 100
+        :return: list of float, the nearest-rank percentile of the times of phase, in seconds, over the last window_size
+        frames. 0 for a phase that wasn't measured
+        """
+        times = sorted(self._times.get(phase, ()))
+        if not times:
+            return [0.0 for _ in percentiles]
+        return [times[max(0, math.ceil(percentile / 100 * len(times)) - 1)] for percentile in percentiles]
+
+    def get_summary(self):
+        """returns dict, the frame count and, for every measured phase, its percentiles and maximum in milliseconds"""
+        phases = {}
+        for phase in sorted(self._times, key=lambda phase: PHASES.index(phase) if phase in PHASES else len(PHASES)):
+            summary = {'p{}'.format(percentile): round(seconds * 1000, 3)
+                       for percentile, seconds in zip(PERCENTILES, self.get_percentiles(phase))}
+            summary['max'] = round(max(self._times[phase]) * 1000, 3)
+            phases[phase] = summary
+        return {'frame_count': self.frame_count, 'phases': phases}
+
+    def get_overlay_lines(self):
+        """returns list of str, one line per measured phase, eg, 'tower_update 1.2 / 3.4 / 5.6 ms' for the percentiles"""
+        return ['{} {} ms'.format(phase, ' / '.join('{:.1f}'.format(summary['p{}'.format(percentile)])
+                                                    for percentile in PERCENTILES))
+                for phase, summary in self.get_summary()['phases'].items()]
+
+    def dump(self, path=None):
+        """Writes get_summary() as JSON to path, or to dump_path if path is None"""
+        with open(path if path is not None else self.dump_path, 'w') as dump_file:
+            json.dump(self.get_summary(), dump_file, indent=2)
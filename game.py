@@ -2,27 +2,26 @@ import pygame
 import pygame.locals
 import sys
 import pygame.sprite
-import logging.config
-import abc
+import logging
 
-import tower
 import sprite_groups
+import bootstrap
 import colours
 import icon
-import bank
-import life_point
 import level
 import game_utility
+import simulation
+import replay
+import text_cache
+import renderer
+import range_overlay
+import frame_profiler
+import click_handlers
 import server #represents the player who's defending (building towers)
 import client  #represents the player who's attacking (creating levels, and trying to make balloons pass the end)
 
-logging.config.fileConfig('logging.conf')
 logger = logging.getLogger('simpleLogger')
 
-pygame.init()
-DISPLAYSURF = pygame.display.set_mode((400, 400))
-pygame.display.set_caption('ML Tower Defence')
-fpsClock = pygame.time.Clock()
 
 
 def show_start_screen():
@@ -38,11 +37,10 @@ def show_start_screen():
                 else:
                     return
 
-        DISPLAYSURF.fill(colours.BLACK)
-        start_message = pygame.font.SysFont("freesansbold", 50)
-        start_label = start_message.render("Start game", True, (255, 255, 0))
+        bootstrap.display_surface.fill(colours.BLACK)
+        start_label = text_cache.render(text_cache.get_font(50), "Start game", (255, 255, 0))
 
-        DISPLAYSURF.blit(start_label, (200, 200))
+        bootstrap.display_surface.blit(start_label, (200, 200))
         pygame.display.update()
 
 
@@ -51,133 +49,27 @@ def show_lose_screen():
     while True:
         if pygame.event.get(pygame.locals.KEYUP):
             return
-        DISPLAYSURF.fill(colours.BLACK)
-        start_message = pygame.font.SysFont("freesansbold", 50)
-        start_label = start_message.render("Good try", True, (255, 255, 0))
+        bootstrap.display_surface.fill(colours.BLACK)
+        start_label = text_cache.render(text_cache.get_font(50), "Good try", (255, 255, 0))
 
-        DISPLAYSURF.blit(start_label, (200, 200))
+        bootstrap.display_surface.blit(start_label, (200, 200))
         pygame.display.update()
 
 def show_win_screen():
-    win_message_setup = pygame.font.SysFont("freesansbold", 15)
-    win_message_label = win_message_setup.render("Congratulations! You won!", True, colours.GREEN)
+    win_message_label = text_cache.render(text_cache.get_font(15), "Congratulations! You won!", colours.GREEN)
 
     while True:
-        DISPLAYSURF.fill(colours.WHITE)
+        bootstrap.display_surface.fill(colours.WHITE)
 
         for event in pygame.event.get():
             if event.type == pygame.locals.QUIT:
                 pygame.quit()
                 sys.exit()
 
-        DISPLAYSURF.blit(win_message_label, (200, 200))
+        bootstrap.display_surface.blit(win_message_label, (200, 200))
         pygame.display.update()
 
 
-def player_has_completed_level(current_level):
-    """returns whether the player has successfully completed the level"""
-    # logger.info('the value of check if more ballons is: ' + str(current_level.next_balloon_exists()))
-    # logger.info('the sprite group is: ' + str(sprite_groups.balloon_sprites))
-    if (current_level.next_balloon_exists() == False) and len(sprite_groups.balloon_sprites) == 0:
-        return True
-    return False
-
-
-class LeftMouseClickHandler(metaclass=abc.ABCMeta):
-    def __init__(self, next_handler):
-        """If this handler is unable to handle the mouse click, call the next handler to do it"""
-        assert isinstance(next_handler,
-                          LeftMouseClickHandler) or next_handler is None, 'next_handler must be a LeftMouseClickHandler type or None'
-
-        self.next_handler = next_handler
-
-    def handle_click(self, mouse_position):
-        """Wrapper for handling click, contains conditional for letting next handler try"""
-        is_click_handled = self.try_handle_click(mouse_position)
-
-        assert is_click_handled is True or is_click_handled is False, 'is_handled must be either true or false'
-
-        if is_click_handled is False:
-            self.next_handler.handle_click(mouse_position)
-
-    @abc.abstractmethod
-    def try_handle_click(self, mouse_position):
-        """Each class tries to handle the click"""
-
-
-class TowerIconClickHandler(LeftMouseClickHandler):
-    def try_handle_click(self, mouse_position):
-        # logger.debug('towerIconCLickHandler')
-        for tower_icon in sprite_groups.tower_icon_sprites:
-            if tower_icon.rect.collidepoint(mouse_position):
-                # logger.debug('towerIconClickHandler collided')
-                duplicate_tower_icon = tower_icon.on_click()
-                sprite_groups.selected_tower_icon_sprite.empty()
-                sprite_groups.selected_tower_icon_sprite.add(duplicate_tower_icon)
-                return True
-        return False
-
-
-class TowerClickHandler(LeftMouseClickHandler):
-    def try_handle_click(self, mouse_position):
-        # logger.debug('towerCLickHandler')
-        for tow in sprite_groups.tower_sprites:  # must not be named with tower, will result in name clashes
-            if tow.rect.collidepoint(mouse_position):
-                tow.on_click(sprite_groups.upgrade_icon_sprites,
-                             sprite_groups.sell_tower_icon_sprite)  # will clear the sprite groups before adding icons
-                return True
-        return False
-
-
-class UpgradeIconClickHandler(LeftMouseClickHandler):
-    def try_handle_click(self, mouse_position):
-        # logger.debug('UpgradeIconClickHandler')
-        for upgrade_icon in sprite_groups.upgrade_icon_sprites:
-            if upgrade_icon.rect.collidepoint(mouse_position):
-                upgrade_icon.on_click(sprite_groups.upgrade_icon_sprites)
-                return True
-        return False
-
-
-class SellTowerIconClickHandler(LeftMouseClickHandler):
-    def try_handle_click(self, mouse_position):
-        # logger.debug('SellTowerIconClickHndler')
-        if sprite_groups.sell_tower_icon_sprite:
-            if sprite_groups.sell_tower_icon_sprite.sprite.rect.collidepoint(mouse_position):
-                sprite_groups.sell_tower_icon_sprite.sprite.on_click()
-                sprite_groups.sell_tower_icon_sprite.empty()
-                sprite_groups.upgrade_icon_sprites.empty()
-                return True
-        return False
-
-
-class CreateNewTowerClickHandler(LeftMouseClickHandler):
-    def try_handle_click(self, mouse_position):
-        # logger.debug('CreateNewTowerClickHandler')
-        if sprite_groups.selected_tower_icon_sprite:
-            new_tower = tower.create_tower(sprite_groups.selected_tower_icon_sprite.sprite._tower_type, mouse_position,
-                                           DISPLAYSURF)
-            #make sure player has enough money to make this tower
-            if bank.balance >= new_tower.buy_price:
-                bank.withdraw(new_tower.buy_price)
-                sprite_groups.tower_sprites.add(new_tower)
-            sprite_groups.selected_tower_icon_sprite.empty()
-            return True
-        return False
-
-
-class NullClickHandler(LeftMouseClickHandler):
-    def try_handle_click(self, mouse_position):
-        # logger.debug('NullClickHandler')
-        # do nothing
-        return True
-
-
-def handle_left_mouse_click(tower_icon_click_handler, mouse_position):
-    tower_icon_click_handler.handle_click(mouse_position)
-
-
-
 def begin_game():
     # setup
     sprite_groups.tower_icon_sprites.add(icon.create_tower_icon(icon.LINEAR_TOWER_ICON, (300, 100)),
@@ -185,49 +77,48 @@ def begin_game():
                                          icon.create_tower_icon(icon.EXPLOSION_TOWER_ICON, (300, 200)),
                                          icon.create_tower_icon(icon.TELEPORTATION_TOWER_ICON, (300, 250)))
 
-    basic_dashboard = pygame.draw.rect(DISPLAYSURF, colours.GRAY, (0, 300, 400, 100))
+    # the board, dashboard, tower icons and towers' radiuses are drawn onto the renderer's background, only when they change.
+    # Pressing 'r' hides or shows the radiuses
+    tower_range_overlay = range_overlay.RangeOverlay(sprite_groups.tower_sprites, bootstrap.display_surface.get_size())
+
+    # times each phase of every frame. Pressing F3 shows the percentiles on screen
+    profiler = frame_profiler.FrameProfiler(dump_path=bootstrap.frame_profile_path)
+    is_profiler_overlay_shown = False
+    profiler_font = text_cache.get_font(15)
+
+    game_renderer = renderer.DirtyRectRenderer(bootstrap.display_surface, sprite_groups.static_sprites,
+                                               tower_range_overlay, profiler)
 
     # select font type
     bank_balance_font = game_utility.set_bank_balance_font()
     life_point_font = game_utility.set_life_point_font()
 
-    levels = [level.Level1(),
-              level.Level2(),
-              level.Level3()]  # game_utility.create_game_levels()
-    current_level = levels.pop(0)
-
-    make_new_balloon_countdown = 10  # called every frame and dictates when to make new balloon
+    match = simulation.Simulation(game_utility.create_game_levels(), profiler=profiler)
+    recorder = None
+    if bootstrap.record_path is not None:
+        recorder = replay.InputRecorder(match, bootstrap.record_path)
 
     # create left button click event handlers
-    null_click_handler = NullClickHandler(None)
-    create_new_tower_click_handler = CreateNewTowerClickHandler(null_click_handler)
-    sell_tower_icon_click_handler = SellTowerIconClickHandler(create_new_tower_click_handler)
-    upgrade_icon_click_handler = UpgradeIconClickHandler(sell_tower_icon_click_handler)
-    tower_click_handler = TowerClickHandler(upgrade_icon_click_handler)
-    tower_icon_click_handler = TowerIconClickHandler(tower_click_handler)
+    tower_icon_click_handler = click_handlers.create_click_handlers(match)
+
+    # the simulation is stepped once per tick of real time, however long drawing a frame takes
+    tick_clock = simulation.TickClock()
 
     while True:
+        profiler.begin_frame()
 
-        # if player finished this level and there are other levels remaining, start them, otherwise, proceed to "Win screen"
-        if player_has_completed_level(current_level):
-            if levels:
-                current_level = levels.pop(0)
-            else:
-                return show_win_screen
+        # if player finished every level, proceed to "Win screen". The simulation starts the next level by itself
+        if match.is_won():
+            if recorder is not None:
+                recorder.close()
+            return show_win_screen
 
         #check if the player still has life points. If not, player lost
-        if life_point.life_balance <= 0:
+        if match.is_lost():
+            if recorder is not None:
+                recorder.close()
             return show_lose_screen
 
-        # if it's time to make a new balloon and the next balloon exists, then add that balloon to the balloon_sprites and restart countdown. If it doesn't exist, don't add it
-        # if it isn't time to make a new balloon, decrement countdown
-        if make_new_balloon_countdown == 0:
-            if current_level.next_balloon_exists():
-                sprite_groups.balloon_sprites.add(current_level.get_next_balloon())
-            make_new_balloon_countdown = 10
-        else:
-            make_new_balloon_countdown -= 1
-
         # handle events
         for event in pygame.event.get():
 
@@ -244,7 +135,7 @@ def begin_game():
 
             if event.type == pygame.locals.MOUSEBUTTONUP and event.button == 1:
                 mouse_position = pygame.mouse.get_pos()
-                handle_left_mouse_click(tower_icon_click_handler, mouse_position)  # start of chain of responsibility.
+                click_handlers.handle_left_mouse_click(tower_icon_click_handler, mouse_position)  # start of chain of responsibility.
 
             # right mouse button is clicked. Remove the tower icon currently on the cursor (if it exists)
             elif event.type == pygame.locals.MOUSEBUTTONUP and event.button == 3:
@@ -252,36 +143,44 @@ def begin_game():
                 sprite_groups.sell_tower_icon_sprite.empty()
                 sprite_groups.upgrade_icon_sprites.empty()
 
+            elif event.type == pygame.locals.KEYUP and event.key == pygame.K_r:
+                tower_range_overlay.toggle()
+
+            elif event.type == pygame.locals.KEYUP and event.key == pygame.K_F3:
+                is_profiler_overlay_shown = not is_profiler_overlay_shown
+
             elif event.type == pygame.locals.QUIT:
+                if recorder is not None:
+                    recorder.close()
                 pygame.quit()
                 sys.exit()
 
-        DISPLAYSURF.fill(colours.BLACK)
-
-        # draw dashboard and upgrade sprites
-        pygame.draw.rect(DISPLAYSURF, colours.GRAY, (0, 300, 400, 100))  # draw dashboard
-        sprite_groups.tower_sprites.update(sprite_groups.balloon_sprites, sprite_groups.bullet_sprites)
-        sprite_groups.balloon_sprites.update(sprite_groups.bullet_sprites)
-        sprite_groups.bullet_sprites.update()
+        profiler.lap(frame_profiler.INPUT)
+        match.step(tick_clock.get_ticks_due())
         sprite_groups.selected_tower_icon_sprite.update(pygame.mouse.get_pos())
 
-        for sprite_group in sprite_groups.all_sprites:
-            sprite_group.draw(DISPLAYSURF)
+        # only the parts of the screen that changed are drawn again and sent to the display
+        labels = [(bank_balance_font, "Bank balance: {}".format(match.bank.balance), (255, 255, 0), (300, 50)),
+                  (life_point_font, "Life points: {}".format(match.life_point.life_balance), (255, 255, 0), (300, 30))]
+        if is_profiler_overlay_shown:
+            labels.extend((profiler_font, line, colours.GREEN, (5, 5 + 12 * i))
+                          for i, line in enumerate(profiler.get_overlay_lines()))
+        dirty_rects = game_renderer.draw_frame(sprite_groups.moving_sprites, labels)
 
+        bootstrap.fps_clock.tick(15)
+        profiler.lap(frame_profiler.IDLE)
+        pygame.display.update(dirty_rects)
+        profiler.lap(frame_profiler.DISPLAY_UPDATE)
+        profiler.end_frame()
 
 
-        # render text
-        bank_balance_label = bank_balance_font.render("Bank balance: {}".format(bank.balance), True, (255, 255, 0))
-        DISPLAYSURF.blit(bank_balance_label, (300, 50))
-
-        life_balance_label = life_point_font.render("Life points: {}".format(life_point.life_balance), True, (255, 255, 0))
-        DISPLAYSURF.blit(life_balance_label, (300, 30))
-
-        fpsClock.tick(15)
-        pygame.display.update()
-
-
-if __name__ == '__main__':
+def run():
+    """Plays the game, from the start screen to the win or lose screen. bootstrap.bootstrap() must be called first"""
     show_start_screen()
     show_win_or_lose_screen = begin_game()
     show_win_or_lose_screen()
+
+
+if __name__ == '__main__':
+    if bootstrap.main():
+        run()
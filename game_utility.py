@@ -1,5 +1,5 @@
 import level
-import pygame
+import text_cache
 
 
 def create_game_levels():
@@ -14,8 +14,8 @@ def create_game_levels():
 
 
 def set_bank_balance_font():
-    return pygame.font.SysFont("freesansbold", 15)
+    return text_cache.get_font(15)
 
 
 def set_life_point_font():
-    return pygame.font.SysFont("freesansbold", 15)
+    return text_cache.get_font(15)
@@ -1,11 +1,11 @@
 import pygame
-import logging.config
+import logging
 import abc
 
 import tower
 import colours
+import surface_cache
 
-logging.config.fileConfig('logging.conf')
 logger = logging.getLogger('simpleLogger')
 
 LINEAR_TOWER_ICON = 'LINEAR_TOWER_ICON'
@@ -33,8 +33,7 @@ class Icon(pygame.sprite.Sprite):
         assert isinstance(dimension, tuple) and len(dimension) == 2, 'start must be a 2-element tuple'
 
         super().__init__()
-        self.image = pygame.Surface([dimension[0], dimension[1]])
-        self.image.fill(colour)
+        self.image = surface_cache.get_filled_surface(colour, dimension)
         self.rect = self.image.get_rect()
         self.rect.centerx = position[0]
         self.rect.centery = position[1]
@@ -55,7 +54,7 @@ class Icon(pygame.sprite.Sprite):
 class TowerIcon(Icon, metaclass=abc.ABCMeta):
     """Base class for all Tower-related icons"""
 
-    _tower_type = None
+    tower_type = None  # the tower this icon creates, eg, tower.LINEAR_TOWER. Same constants as Tower.tower_type
 
     def __init__(self, colour, position, dimension):
         """
@@ -75,7 +74,7 @@ class TowerIcon(Icon, metaclass=abc.ABCMeta):
         :return: a duplicate of this icon (not same reference)
          Change colour of icon and return a duplicate of this icon
         """
-        self.image.fill(colours.ORANGE)
+        self.image = surface_cache.get_filled_surface(colours.ORANGE, self.image.get_size())  # the image is shared, so don't fill it
         return self.duplicate()
 
     @abc.abstractmethod
@@ -98,7 +97,7 @@ class LinearTowerIcon(TowerIcon):
         assert isinstance(dimension, tuple) and len(dimension) == 2, 'start must be a 2-element tuple'
 
         super().__init__(colour, position, dimension)
-        self._tower_type = tower.LINEAR_TOWER
+        self.tower_type = tower.LINEAR_TOWER
 
     def duplicate(self):
         """
@@ -121,7 +120,7 @@ class ThreeSixtyTowerIcon(TowerIcon):
         assert isinstance(dimension, tuple) and len(dimension) == 2, 'start must be a 2-element tuple'
 
         super().__init__(colour, position, dimension)
-        self._tower_type = tower.THREE_SIXTY_TOWER
+        self.tower_type = tower.THREE_SIXTY_TOWER
 
     def duplicate(self):
         """
@@ -144,7 +143,7 @@ class ExplosionTowerIcon(TowerIcon):
         assert isinstance(dimension, tuple) and len(dimension) == 2, 'start must be a 2-element tuple'
 
         super().__init__(colour, position, dimension)
-        self._tower_type = tower.EXPLOSION_TOWER
+        self.tower_type = tower.EXPLOSION_TOWER
 
     def duplicate(self):
         """
@@ -167,7 +166,7 @@ class TeleportationTowerIcon(TowerIcon):
         assert isinstance(dimension, tuple) and len(dimension) == 2, 'start must be a 2-element tuple'
 
         super().__init__(colour, position, dimension)
-        self._tower_type = tower.TELEPORTATION_TOWER
+        self.tower_type = tower.TELEPORTATION_TOWER
 
     def duplicate(self):
         """
@@ -182,12 +181,14 @@ class UpgradeIcon(Icon, metaclass=abc.ABCMeta):
     Base class for all Upgrade-relatedIcons
     """
 
-    def __init__(self, colour, position, dimension, tower_upgrade_method):
+    def __init__(self, colour, position, dimension, tower_upgrade_method, upgraded_tower=None, upgrade=None):
         """
         :param colour: colour.COLOUR_CONSTANT, the colour of the icon
         :param position: 2-element tuple, where this icon is to be placed
         :param dimension: 2-element tuple, the size of this icon
         :param tower_upgrade_method: method of the related upgrade method from the associated tower
+        :param upgraded_tower: tower.Tower or None, the tower this icon upgrades
+        :param upgrade: str constant or None, the upgrade this icon buys, eg, tower.UPGRADE_SPEED
         """
 
         assert isinstance(colour, tuple) and len(colour) == 4, 'colour must be a 4-element tuple'
@@ -196,6 +197,8 @@ class UpgradeIcon(Icon, metaclass=abc.ABCMeta):
         assert hasattr(tower_upgrade_method, '__call__'), '_tower_upgrade_method must be a callable (eg, method)'
 
         self._tower_upgrade_method = tower_upgrade_method
+        self.tower = upgraded_tower
+        self.upgrade = upgrade
         super().__init__(colour, position, dimension)
 
     def on_click(self, upgrade_icon_sprites):
@@ -203,7 +206,7 @@ class UpgradeIcon(Icon, metaclass=abc.ABCMeta):
 
 
 class UpgradeSpeedBaseIcon(UpgradeIcon):
-    def __init__(self, colour, position, dimension, tower_upgrade_method):
+    def __init__(self, colour, position, dimension, tower_upgrade_method, upgraded_tower=None, upgrade=None):
         """
         :param tower_upgrade_method: method of the related upgrade method from the associated tower
         :param colour: colour.COLOUR_CONSTANT, the colour of the icon
@@ -216,7 +219,7 @@ class UpgradeSpeedBaseIcon(UpgradeIcon):
         assert isinstance(dimension, tuple) and len(dimension) == 2, 'start must be a 2-element tuple'
         assert hasattr(tower_upgrade_method, '__call__'), '_tower_upgrade_method must be a callable (eg, method)'
 
-        super().__init__(colour, position, dimension, tower_upgrade_method)
+        super().__init__(colour, position, dimension, tower_upgrade_method, upgraded_tower, upgrade)
 
 
 class UpgradeSpeedIcon1(UpgradeSpeedBaseIcon):
@@ -228,7 +231,7 @@ class UpgradeSpeedIcon2(UpgradeSpeedBaseIcon):
 
 
 class UpgradeRadiusBaseIcon(UpgradeIcon):
-    def __init__(self, colour, position, dimension, tower_upgrade_method):
+    def __init__(self, colour, position, dimension, tower_upgrade_method, upgraded_tower=None, upgrade=None):
         """
         :param colour: colour.COLOUR_CONSTANT, the colour of the icon
         :param position: 2-element tuple, where this icon is to be placed
@@ -241,7 +244,7 @@ class UpgradeRadiusBaseIcon(UpgradeIcon):
         assert isinstance(dimension, tuple) and len(dimension) == 2, 'start must be a 2-element tuple'
         assert hasattr(tower_upgrade_method, '__call__'), '_tower_upgrade_method must be a callable (eg, method)'
 
-        super().__init__(colour, position, dimension, tower_upgrade_method)
+        super().__init__(colour, position, dimension, tower_upgrade_method, upgraded_tower, upgrade)
 
 
 class UpgradeRadiusIcon1(UpgradeRadiusBaseIcon):
@@ -253,7 +256,7 @@ class UpgradeRadiusIcon2(UpgradeRadiusBaseIcon):
 
 
 class UpgradePopPowerBaseIcon(UpgradeIcon):
-    def __init__(self, colour, position, dimension, tower_upgrade_method):
+    def __init__(self, colour, position, dimension, tower_upgrade_method, upgraded_tower=None, upgrade=None):
         """
         :param colour: colour.COLOUR_CONSTANT, the colour of the icon
         :param position: 2-element tuple, where this icon is to be placed
@@ -266,7 +269,7 @@ class UpgradePopPowerBaseIcon(UpgradeIcon):
         assert isinstance(dimension, tuple) and len(dimension) == 2, 'start must be a 2-element tuple'
         assert hasattr(tower_upgrade_method, '__call__'), '_tower_upgrade_method must be a callable (eg, method)'
 
-        super().__init__(colour, position, dimension, tower_upgrade_method)
+        super().__init__(colour, position, dimension, tower_upgrade_method, upgraded_tower, upgrade)
 
 
 class UpgradePopPowerIcon1(UpgradePopPowerBaseIcon):
@@ -296,12 +299,13 @@ class UpgradeIconPlaceholder(UpgradeIcon):
 
 
 class SellTowerIcon(Icon):
-    def __init__(self, colour, position, dimension, sell_tower_method):
+    def __init__(self, colour, position, dimension, sell_tower_method, tower_to_sell=None):
         """
         :param colour: colour.COLOUR_CONSTANT, the colour of the icon
         :param position: 2-element tuple, where this icon is to be placed
         :param dimension: 2-element tuple, the size of this icon
         :param sell_tower_method: the tower that will be solve if this button is clicked
+        :param tower_to_sell: tower.Tower or None, the tower this icon sells
         """
 
         assert isinstance(colour, tuple) and len(colour) == 4, 'colour must be a 4-element tuple'
@@ -310,6 +314,7 @@ class SellTowerIcon(Icon):
         assert hasattr(sell_tower_method, '__call__'), 'sell_tower_method must be a callable (eg, method)'
 
         self.sell_tower_method = sell_tower_method
+        self.tower = tower_to_sell
 
         super().__init__(colour, position, dimension)
 
@@ -351,10 +356,11 @@ def create_tower_icon(tower_icon_type, position):
     raise NotImplementedError('the specified tower tower_icon_type is not implemented')
 
 
-def create_upgrade_type_icons_batch(icon_type, tower_upgrade_method):
+def create_upgrade_type_icons_batch(icon_type, tower_upgrade_method, upgraded_tower=None):
     """
     :param icon_type, str constant, the type of icons to make, eg, speed
     :param tower_upgrade_method: function, the method to call when this icon is clicked
+    :param upgraded_tower: tower.Tower or None, the tower the icons upgrade
     :return: tuple of icons, (S1, S2, P)
     Creates all the tower upgrade icons by group, eg, speed, and they contain the method to call
     """
@@ -366,33 +372,45 @@ def create_upgrade_type_icons_batch(icon_type, tower_upgrade_method):
             UpgradeSpeedIcon1(colour=colours.WHITE,
                               position=(100, 350),
                               dimension=(50, 50),
-                              tower_upgrade_method=tower_upgrade_method),
+                              tower_upgrade_method=tower_upgrade_method,
+                              upgraded_tower=upgraded_tower,
+                              upgrade=tower.UPGRADE_SPEED),
             UpgradeSpeedIcon2(colour=colours.BLACK,
                               position=(100, 350),
                               dimension=(50, 50),
-                              tower_upgrade_method=tower_upgrade_method)
+                              tower_upgrade_method=tower_upgrade_method,
+                              upgraded_tower=upgraded_tower,
+                              upgrade=tower.UPGRADE_SPEED)
         )
     elif icon_type == UPGRADE_RADIUS_ICONS:
         return (
             UpgradeRadiusIcon1(colour=colours.WHITE,
                                position=(200, 350),
                                dimension=(50, 50),
-                               tower_upgrade_method=tower_upgrade_method),
+                               tower_upgrade_method=tower_upgrade_method,
+                               upgraded_tower=upgraded_tower,
+                               upgrade=tower.UPGRADE_RADIUS),
             UpgradeRadiusIcon2(colour=colours.BLACK,
                                position=(200, 350),
                                dimension=(50, 50),
-                               tower_upgrade_method=tower_upgrade_method)
+                               tower_upgrade_method=tower_upgrade_method,
+                               upgraded_tower=upgraded_tower,
+                               upgrade=tower.UPGRADE_RADIUS)
         )
     elif icon_type == UPGRADE_POP_POWER_ICONS:
         return (
             UpgradePopPowerIcon1(colour=colours.WHITE,
                                  position=(300, 350),
                                  dimension=(50, 50),
-                                 tower_upgrade_method=tower_upgrade_method),
+                                 tower_upgrade_method=tower_upgrade_method,
+                                 upgraded_tower=upgraded_tower,
+                                 upgrade=tower.UPGRADE_POP_POWER),
             UpgradePopPowerIcon2(colour=colours.BLACK,
                                  position=(300, 350),
                                  dimension=(50, 50),
-                                 tower_upgrade_method=tower_upgrade_method)
+                                 tower_upgrade_method=tower_upgrade_method,
+                                 upgraded_tower=upgraded_tower,
+                                 upgrade=tower.UPGRADE_POP_POWER)
         )
     raise NotImplementedError('The specified icon_type, {0}, is not implemented'.format(icon_type))
 
@@ -404,5 +422,6 @@ def create_placeholder_upgrade_icon(position, dimension):
                                   dimension=dimension)
 
 
-def create_sell_tower_icon(sell_tower_method):
-    return SellTowerIcon(colour=colours.ORANGE, position=(50, 375), dimension=(40, 20), sell_tower_method=sell_tower_method)
+def create_sell_tower_icon(sell_tower_method, tower_to_sell=None):
+    return SellTowerIcon(colour=colours.ORANGE, position=(50, 375), dimension=(40, 20), sell_tower_method=sell_tower_method,
+                         tower_to_sell=tower_to_sell)
@@ -1,9 +1,7 @@
 import logging
-import logging.config
 import path
 import balloon
 
-logging.config.fileConfig('logging.conf')
 
 # create logger
 logger = logging.getLogger('simpleLogger')
@@ -60,7 +58,7 @@ class Level:
 class Level1(Level):
     def __init__(self):
         # logger.debug('Level1 started')
-        balloon_path = path.Path()
+        balloon_path = path.get_path(path.DEFAULT_PATH)
         # the balloons to output on this level
         numbers_representing_balloons = [4]
         super().__init__(numbers_representing_balloons, balloon_path)
@@ -68,7 +66,7 @@ class Level1(Level):
 
 class Level2(Level):
     def __init__(self):
-        balloon_path = path.Path()
+        balloon_path = path.get_path(path.DEFAULT_PATH)
         # the balloons to output on this level
         numbers_representing_balloons = [2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2]
         super().__init__(numbers_representing_balloons, balloon_path)
@@ -77,7 +75,7 @@ class Level2(Level):
 class Level3(Level):
     def __init__(self):
         # logger.debug('Level3 started')
-        balloon_path = path.Path()
+        balloon_path = path.get_path(path.DEFAULT_PATH)
         # the balloons to output on this level
         numbers_representing_balloons = [1, 1, 1, 1, 1, 1, 1, 1, 1]
         super().__init__(numbers_representing_balloons, balloon_path)
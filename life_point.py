@@ -1,39 +1,49 @@
-import message_buffer
-import logging.config
+import logging
 
-logging.config.fileConfig('logging.conf')
 
 # create logger
 logger = logging.getLogger('simpleLogger')
 
 
-life_balance = 20 #amount of money user currently has
+STARTING_LIFE_BALANCE = 20
 
-def increase(amount=1):
-    """
-    :param amount: int, adds the specified amount of money to the balance
-    """
 
-    assert isinstance(amount, int), 'amount must be an integer'
+class LifePoint:
+    """The life points of one match. Every match has its own, see match_state.MatchState"""
 
-    global life_balance
-    life_balance += amount
+    def __init__(self, messages, life_balance=STARTING_LIFE_BALANCE):
+        """
+        :param messages: message_buffer.MessageBuffer or None, where the new life balance is pushed every time it changes. None
+        pushes nothing
+        :param life_balance: int, the life points user starts with
+        """
+        self.messages = messages
+        self.life_balance = life_balance #amount of money user currently has
 
-    # if client & server, they will use this value balance from message_buffer. If solo, adding this to message_buffer doesn't affect game play
-    # thus, add new balance to message_buffer
-    message_buffer.push_lifepoint_message(life_balance)
+    def increase(self, amount=1):
+        """
+        :param amount: int, adds the specified amount of money to the balance
+        """
 
+        assert isinstance(amount, int), 'amount must be an integer'
 
-def decrease(amount=1):
-    """
-    :param amount: int, decreases the specified amount of money to the balance
-    """
+        self.life_balance += amount
 
-    assert isinstance(amount, int), 'amount must be an integer'
+        # if client & server, they will use this value balance from message_buffer. If solo, adding this to message_buffer doesn't affect game play
+        # thus, add new balance to message_buffer
+        if self.messages is not None:
+            self.messages.push_lifepoint_message(self.life_balance)
 
-    global life_balance
-    life_balance -= amount
+    def decrease(self, amount=1):
+        """
+        :param amount: int, decreases the specified amount of money to the balance
+        """
 
-    # if client & server, they will use this value balance from message_buffer. If solo, adding this to message_buffer doesn't affect game play
-    # thus, add new balance to message_buffer
-    message_buffer.push_lifepoint_message(life_balance)
+        assert isinstance(amount, int), 'amount must be an integer'
+
+        self.life_balance -= amount
+
+        # if client & server, they will use this value balance from message_buffer. If solo, adding this to message_buffer doesn't affect game play
+        # thus, add new balance to message_buffer
+        if self.messages is not None:
+            self.messages.push_lifepoint_message(self.life_balance)
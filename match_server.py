@@ -0,0 +1,174 @@
+"""Contains a server that hosts many matches in one process. Each attacker that connects is routed to a match, which has its
+own Simulation, and with it its own bank balance, life points and unsent messages (see match_state.MatchState). Every match
+is stepped on the same thread, one after the other, once per tick"""
+
+import time
+import logging
+
+import balloon
+import bootstrap
+import message_buffer
+import network
+import protocol
+import simulation
+
+logger = logging.getLogger('simpleLogger')
+
+FRAMES_PER_SECOND = 15  # same as the game's clock
+
+
+class Match:
+    """One hosted game: a Simulation plus the attackers playing it"""
+
+    def __init__(self, match_id, levels=None, tower_layout=(), use_balloon_batch=False, use_bullet_pool=False):
+        """
+        :param match_id: int, identifies this match in its MatchServer
+        :param levels: list of level.Level, the levels to play. If None, the game's levels are used
+        :param tower_layout: iterable of (tower_type, position), the towers the attackers play against
+        :param use_balloon_batch: boolean, see simulation.Simulation
+        :param use_bullet_pool: boolean, see simulation.Simulation
+        """
+        self.match_id = match_id
+        self.attacker_connection_ids = []
+
+        self.messages = message_buffer.MessageBuffer()
+        self.simulation = simulation.Simulation(levels, use_balloon_batch=use_balloon_batch,
+                                                use_bullet_pool=use_bullet_pool, use_own_sprite_groups=True,
+                                                messages=self.messages)
+        for tower_type, position in tower_layout:
+            self.simulation.place_tower(tower_type, position)
+        # attackers get the whole state when they join, so nothing from the setup needs to be sent
+        self.messages.clear_pending()
+
+    def get_full_state_message(self):
+        """returns bytes, the messages that tell a new attacker everything it would have been sent so far"""
+        return message_buffer.encode_full_state(self.simulation.life_point.life_balance, self.simulation.bank.balance,
+                                                self.simulation.tower_sprites)
+
+    def spawn_balloon(self, number_of_layers):
+        """Queues the balloon an attacker asked for, it's added at the next step. Returns whether number_of_layers was valid"""
+        if number_of_layers not in balloon.BALLOON_TYPE_BY_NUMBER_OF_LAYERS:
+            return False
+        self.simulation.queue_input(simulation.SPAWN_BALLOON, number_of_layers)
+        return True
+
+    def step(self):
+        """
+        :return: bytes, the messages for the attackers about what changed this frame. Empty if nothing did
+        Simulates one frame
+        """
+        self.simulation.step()
+        self.messages.flush_frame()
+        return b''.join(self.messages.drain_messages(timeout=0))
+
+
+class MatchServer:
+    """Accepts attackers on one port, routes each to a match and steps every match at a fixed rate"""
+
+    def __init__(self, ip_address='127.0.0.1', port=1060, max_matches=64, attackers_per_match=1, tower_layout=(),
+                 create_levels=None):
+        """
+        :param ip_address: str, eg, '127.0.0.1'
+        :param port: int, eg, 1060. 0 picks any free port
+        :param max_matches: int, the most matches to host at once. Attackers past that are disconnected
+        :param attackers_per_match: int, the number of attackers routed to a match before a new one is started
+        :param tower_layout: iterable of (tower_type, position), the towers placed in every new match
+        :param create_levels: function returning a list of level.Level, called for every new match. If None, the game's
+        levels are used
+        """
+        assert isinstance(max_matches, int) and max_matches > 0, 'max_matches must be a positive integer'
+        assert isinstance(attackers_per_match, int) and attackers_per_match > 0, 'attackers_per_match must be a positive integer'
+
+        self.max_matches = max_matches
+        self.attackers_per_match = attackers_per_match
+        self.tower_layout = list(tower_layout)
+        self.create_levels = create_levels
+
+        self.matches = {}  # match_id : Match
+        self.match_by_connection_id = {}
+        self._next_match_id = 1
+
+        self.transport = network.Transport()
+        self.port = self.transport.listen(ip_address, port)
+
+    def route_attacker(self, connection_id):
+        """
+        :return: Match or None, the match the attacker joined. None if every match is full and no new one can be started
+        Puts the attacker in the first match that still has room, or in a new match
+        """
+        for match in self.matches.values():
+            if len(match.attacker_connection_ids) < self.attackers_per_match:
+                break
+        else:
+            if len(self.matches) >= self.max_matches:
+                return None
+            levels = self.create_levels() if self.create_levels is not None else None
+            match = Match(self._next_match_id, levels, self.tower_layout)
+            self.matches[match.match_id] = match
+            self._next_match_id += 1
+            logger.info('started match {}'.format(match.match_id))
+
+        match.attacker_connection_ids.append(connection_id)
+        self.match_by_connection_id[connection_id] = match
+        self.transport.send(connection_id, match.get_full_state_message())
+        return match
+
+    def end_match(self, match):
+        """Stops hosting match and disconnects its attackers, once what's queued for them is sent"""
+        for connection_id in match.attacker_connection_ids:
+            del self.match_by_connection_id[connection_id]
+            self.transport.close(connection_id)
+        del self.matches[match.match_id]
+        logger.info('ended match {}'.format(match.match_id))
+
+    def handle_events(self):
+        """Routes new attackers, spawns the balloons they ask for and forgets the ones that left"""
+        for event, connection_id, message in self.transport.get_events():
+            if event == network.CONNECTED:
+                if self.route_attacker(connection_id) is None:
+                    logger.warning('no match for connection {}, every match is full'.format(connection_id))
+                    self.transport.close(connection_id)
+            elif connection_id not in self.match_by_connection_id:
+                continue  # the match already ended
+            elif event == network.DISCONNECTED:
+                match = self.match_by_connection_id.pop(connection_id)
+                match.attacker_connection_ids.remove(connection_id)
+                if not match.attacker_connection_ids:
+                    self.end_match(match)
+            elif message[0] == protocol.SPAWN_BALLOON:
+                if not self.match_by_connection_id[connection_id].spawn_balloon(message[1]):
+                    logger.critical('the client message {} is not valid and was ignored'.format(message))
+            else:
+                logger.critical('the client message {} is not valid and was ignored'.format(message))
+
+    def tick(self):
+        """Handles what the attackers sent, then steps every match one frame and sends each one's changes to its attackers"""
+        self.handle_events()
+        for match in list(self.matches.values()):
+            messages = match.step()
+            if messages:
+                for connection_id in match.attacker_connection_ids:
+                    self.transport.send(connection_id, messages)
+            if match.simulation.is_finished():
+                self.end_match(match)
+
+    def run_forever(self, frames_per_second=FRAMES_PER_SECOND):
+        """Ticks frames_per_second times a second. A tick that runs late doesn't make the next ones run early"""
+        seconds_per_tick = 1 / frames_per_second
+        next_tick_time = time.monotonic()
+        try:
+            while True:
+                self.tick()
+                next_tick_time += seconds_per_tick
+                sleep_time = next_tick_time - time.monotonic()
+                if sleep_time > 0:
+                    time.sleep(sleep_time)
+                else:
+                    next_tick_time = time.monotonic()  # fell behind, don't try to catch up
+        finally:
+            self.transport.shutdown()
+
+
+if __name__ == '__main__':
+    bootstrap.configure_logging()  # no display, a match server has no window
+    MatchServer().run_forever()
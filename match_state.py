@@ -0,0 +1,23 @@
+"""Contains the state that belongs to one match rather than to the game: its bank, its life points and the messages it hasn't
+sent yet. A simulation.Simulation owns one and hands it to its towers and balloons, so matches never share any of it and can
+be stepped from different threads. Only a match that has a client to tell has messages, a headless one has none to pile up"""
+
+import logging
+
+import bank
+import life_point
+
+logger = logging.getLogger('simpleLogger')
+
+
+class MatchState:
+    """The bank, life points and unsent messages of one match"""
+
+    def __init__(self, messages=None):
+        """
+        :param messages: message_buffer.MessageBuffer or None, where the changes of this match are pushed for the client. None
+        if there is no client, then nothing is pushed
+        """
+        self.messages = messages
+        self.bank = bank.Bank(self.messages)
+        self.life_point = life_point.LifePoint(self.messages)
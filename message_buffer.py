@@ -1,73 +1,159 @@
-"""This is a message buffer and is used by server.py and contains the messages for server to send to client. These messages include the stats of tower"""
-
+"""This is a message buffer and is used by server.py and contains the messages for server to send to client. These messages include the stats of tower.
+The messages are already encoded by protocol.py, so the server can send them as they are.
+Every match has its own MessageBuffer, see match_state.MatchState.
+Values (life points, bank balance and the attack values and pop count of each tower) aren't sent as soon as they're pushed:
+only the latest value of each is kept until flush_frame() is called at the end of a frame, and values the client already
+has are left out"""
+
+import collections
 import threading
 
-buffer = []
-binary_semaphore = threading.Semaphore(value=1)  # since it is inconsistent to read and push to buffer
-
-
-def __push_message(message):
-    """Adds message to buffer and calls server to display that message. A message cannot be added and read at the same time,
-    thus, implemented a semaphore. THis is intended to be an internal method, please don't call"""
-    with binary_semaphore:
-        buffer.append(message)
-
-
-def get_zeroth_message():
-    """Gets the message at the front of the list. Consider using a queue instead. If no message, return None"""
-    front_message = None
-    with binary_semaphore:
-        try:
-            front_message = buffer.pop(0)
-        except:
-            front_message = None
-    return front_message
-
-
-def push_lifepoint_message(lifepoint):
-    """Sends the lifepoint of the server to the client.
-    Format: L=18.
+import protocol
+
+
+class MessageBuffer:
+    """The messages of one match, from being pushed to being taken by the server"""
+
+    def __init__(self):
+        self.buffer = collections.deque()
+        self.message_available = threading.Condition()  # signalled every time a message is pushed, so readers can sleep until then
+
+        self.pending_lock = threading.Lock()  # guards the pending values and events below
+        self.pending_values = {}  # the latest value pushed this frame. Key is protocol.LIFEPOINT, protocol.BANK_BALANCE or (tower_id, field)
+        self.pending_events = []  # encoded tower creations and sales of this frame, in the order they happened
+        self.last_sent_values = {}  # same keys as pending_values, the value the client was last sent
+
+    def _push_message(self, message):
+        """Adds message to buffer and wakes up the thread waiting for messages. A message cannot be added and read at the
+        same time, thus, the condition's lock is held. THis is intended to be an internal method, please don't call"""
+        with self.message_available:
+            self.buffer.append(message)
+            self.message_available.notify()
+
+    def get_zeroth_message(self):
+        """Gets the message at the front of the buffer without waiting. If no message, return None"""
+        with self.message_available:
+            if self.buffer:
+                return self.buffer.popleft()
+        return None
+
+    def drain_messages(self, timeout=None):
+        """
+        :param timeout: float or None, the most seconds to wait for a message. None waits until one is pushed
+        :return: list of bytes, every message in the buffer, oldest first. Empty if the timeout ran out first
+        Sleeps until there is at least one message, then takes all of them at once
+        """
+        with self.message_available:
+            if not self.message_available.wait_for(lambda: self.buffer, timeout):
+                return []
+            messages = list(self.buffer)
+            self.buffer.clear()
+        return messages
+
+    def _push_value(self, key, value):
+        """Keeps value as the latest for key, replacing whatever was pushed for key earlier in this frame"""
+        with self.pending_lock:
+            self.pending_values[key] = value
+
+    def flush_frame(self):
+        """
+        Pushes everything that happened since the last call as one message: the tower creations and sales in order, then
+        the latest of each value, unless the client already has it. Call once at the end of every frame
+        """
+        with self.pending_lock:
+            messages = self.pending_events[:]
+            del self.pending_events[:]
+            for key, value in self.pending_values.items():
+                if key in self.last_sent_values and self.last_sent_values[key] == value:
+                    continue
+                self.last_sent_values[key] = value
+                messages.append(_encode_value(key, value))
+            self.pending_values.clear()
+
+        if messages:
+            self._push_message(b''.join(messages))
+
+    def clear_pending(self):
+        """Forgets the values and events that haven't been flushed and the values sent so far, eg, for a new client"""
+        with self.pending_lock:
+            self.pending_values.clear()
+            del self.pending_events[:]
+            self.last_sent_values.clear()
+
+    def push_lifepoint_message(self, lifepoint):
+        """Sends the lifepoint of the server to the client. See protocol.encode_lifepoint(...)"""
+        self._push_value(protocol.LIFEPOINT, lifepoint)
+
+    def push_bank_balance_message(self, bank_balance):
+        """See protocol.encode_bank_balance(...)"""
+        self._push_value(protocol.BANK_BALANCE, bank_balance)
+
+    def push_create_new_tower_message(self, tower_id, tower_type, speed, radius, pop_power, x_pos, y_pos):
+        """See protocol.encode_create_tower(...)"""
+        with self.pending_lock:
+            self.pending_events.append(protocol.encode_create_tower(tower_id, tower_type, speed, radius, pop_power, x_pos,
+                                                                    y_pos))
+            # the new tower's values go out with it, so only later changes need to be sent
+            self.last_sent_values[(tower_id, protocol.TOWER_SPEED)] = speed
+            self.last_sent_values[(tower_id, protocol.TOWER_RADIUS)] = radius
+            self.last_sent_values[(tower_id, protocol.TOWER_POP_POWER)] = pop_power
+            self.last_sent_values[(tower_id, protocol.TOWER_POP_COUNT)] = 0
+
+    def push_tower_created_message(self, new_tower):
+        """Tells the client about a tower that was placed, see push_create_new_tower_message(...)"""
+        speed, radius, pop_power, _ = new_tower.get_attack_stats()
+        self.push_create_new_tower_message(id(new_tower), new_tower.tower_type, speed, radius, pop_power,
+                                           new_tower.rect.centerx, new_tower.rect.centery)
+
+    def push_update_tower_speed_message(self, tower_id, speed):
+        """See protocol.encode_update_tower(...)"""
+        self._push_value((tower_id, protocol.TOWER_SPEED), speed)
+
+    def push_update_tower_radius_message(self, tower_id, radius):
+        """See protocol.encode_update_tower(...)"""
+        self._push_value((tower_id, protocol.TOWER_RADIUS), radius)
+
+    def push_update_tower_pop_power_message(self, tower_id, pop_power):
+        """See protocol.encode_update_tower(...)"""
+        self._push_value((tower_id, protocol.TOWER_POP_POWER), pop_power)
+
+    def push_update_tower_pop_count_message(self, tower_id, pop_count):
+        """See protocol.encode_update_tower(...)"""
+        self._push_value((tower_id, protocol.TOWER_POP_COUNT), pop_count)
+
+    def push_sell_tower_message(self, tower_id):
+        """See protocol.encode_sell_tower(...). The values of the tower that haven't been sent yet are dropped, and since
+        ids are reused by new towers, so is what the client was sent about it"""
+        with self.pending_lock:
+            self.pending_events.append(protocol.encode_sell_tower(tower_id))
+            for key in [key for key in self.pending_values if isinstance(key, tuple) and key[0] == tower_id]:
+                del self.pending_values[key]
+            for key in [key for key in self.last_sent_values if isinstance(key, tuple) and key[0] == tower_id]:
+                del self.last_sent_values[key]
+
+
+def _encode_value(key, value):
+    """returns the message that tells the client key now has value"""
+    if key == protocol.LIFEPOINT:
+        return protocol.encode_lifepoint(value)
+    elif key == protocol.BANK_BALANCE:
+        return protocol.encode_bank_balance(value)
+    tower_id, field = key
+    return protocol.encode_update_tower(tower_id, field, value)
+
+
+def encode_full_state(life_balance, bank_balance, towers):
     """
-    formatted_lifepoint_message = 'L={}.'.format(lifepoint)
-    __push_message(formatted_lifepoint_message)
-
-
-def push_bank_balance_message(bank_balance):
-    """ Format: B=625."""
-
-    formatted_bank_balance_message = 'B={}.'.format(bank_balance)
-    __push_message(formatted_bank_balance_message)
-
-
-def push_create_new_tower_message(tower_id, tower_type, speed, radius, pop_power, x_pos, y_pos):
-    """Format: T=499987854.t=LINEAR_TOWER.s=2.r=70.p=1.x=150.y=150"""
-    formatted_tower_message = 'T={0}.t={1}.s={2}.r={3}.p={4}.x={5}.y={6}'.format(tower_id, tower_type, speed, radius, pop_power, x_pos, y_pos)
-    __push_message(formatted_tower_message)
-
-
-def push_update_tower_speed_message(tower_id, speed):
-    """Format: T=499984651.s=2."""
-    formatted_tower_message = 'T={0}.s={1}.'.format(tower_id, speed)
-    __push_message(formatted_tower_message)
-
-
-def push_update_tower_radius_message(tower_id, radius):
-    """Format: T=499984651.r=2."""
-    formatted_tower_message = 'T={0}.r={1}.'.format(tower_id, radius)
-    __push_message(formatted_tower_message)
-
-
-def push_update_tower_pop_power_message(tower_id, pop_power):
-    """Format: T=499984651.p=2."""
-    formatted_tower_message = 'T={0}.p={1}.'.format(tower_id, pop_power)
-    __push_message(formatted_tower_message)
-
-def push_update_tower_pop_count_message(tower_id, pop_count):
-    """Format: T=499984651.c=5"""
-    formatted_tower_message = 'T={0}.c={1}.'.format(tower_id, pop_count)
-    __push_message(formatted_tower_message)
-
-def push_sell_tower_message(tower_id):
-    """Format: T=499984651."""
-    formatted_tower_message = 'T={0}.'.format(tower_id)
-    __push_message(formatted_tower_message)
+    :param life_balance: int, the life points so far
+    :param bank_balance: int, the bank balance so far
+    :param towers: iterable of tower.Tower, the towers placed so far
+    :return: bytes, the messages that tell a client that just connected everything it would have been sent so far
+    """
+    messages = [protocol.encode_lifepoint(life_balance), protocol.encode_bank_balance(bank_balance)]
+    for tow in towers:
+        speed, radius, pop_power, pop_count = tow.get_attack_stats()
+        messages.append(protocol.encode_create_tower(id(tow), tow.tower_type, speed, radius, pop_power, tow.rect.centerx,
+                                                     tow.rect.centery))
+        if pop_count:
+            messages.append(protocol.encode_update_tower(id(tow), protocol.TOWER_POP_COUNT, pop_count))
+    return b''.join(messages)
@@ -0,0 +1,196 @@
+"""Contains the asyncio transport used by server.py and client.py. The event loop runs on one background thread and does all
+the reading and writing for every connection, so the pygame loop never waits on a socket. It talks to the pygame loop
+through thread-safe queues: send(...) and broadcast(...) hand bytes to the loop, get_events() hands back what arrived"""
+
+import asyncio
+import itertools
+import queue
+import threading
+import logging
+
+import protocol
+
+logger = logging.getLogger('simpleLogger')
+
+# the kinds of events returned by Transport.get_events()
+CONNECTED = 'CONNECTED'
+MESSAGE = 'MESSAGE'
+DISCONNECTED = 'DISCONNECTED'
+
+MAX_QUEUED_SENDS = 256  # a peer that falls this far behind is disconnected instead of making everyone else wait
+SHUTDOWN_TIMEOUT = 2  # seconds to spend writing what's left to every peer when shutting down
+
+
+class _Connection:
+    """The streams of one peer and the bytes waiting to be written to it. Only used on the event loop's thread"""
+
+    def __init__(self, connection_id, reader, writer):
+        self.connection_id = connection_id
+        self.reader = reader
+        self.writer = writer
+        self.outgoing = asyncio.Queue(MAX_QUEUED_SENDS)  # bytes to write, None once nothing more will be written
+        self.read_task = None
+        self.write_task = None
+
+
+class Transport:
+    """Owns the event loop thread and every connection made through it, whether accepted by listen(...) or opened by
+    connect(...). Connections are identified by an int connection_id"""
+
+    def __init__(self):
+        self._loop = asyncio.new_event_loop()
+        self._events = queue.SimpleQueue()  # (event, connection_id, message), read by the pygame loop
+        self._connections = {}  # connection_id : _Connection
+        self._listening_servers = []
+        self._connection_ids = itertools.count(1)
+
+        self._thread = threading.Thread(target=self._loop.run_forever, name='network_thread', daemon=True)
+        self._thread.start()
+
+    def _run(self, coroutine):
+        """Runs coroutine on the event loop and waits for its result"""
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    def listen(self, ip_address='127.0.0.1', port=1060):
+        """
+        :param ip_address: str, eg, '127.0.0.1'
+        :param port: int, eg, 1060. 0 picks any free port
+        :return: int, the port that is listened on
+        Accepts any number of connections from now on. Each one shows up as a CONNECTED event
+        """
+        listening_server = self._run(asyncio.start_server(self._on_accepted, ip_address, port))
+        self._listening_servers.append(listening_server)
+        return listening_server.sockets[0].getsockname()[1]
+
+    def connect(self, ip_address='127.0.0.1', port=1060):
+        """
+        :return: int, the connection_id of the new connection
+        Connects to a listening Transport. Raises OSError if nothing is listening there
+        """
+
+        async def open_connection():
+            reader, writer = await asyncio.open_connection(ip_address, port)
+            return self._add_connection(reader, writer)
+
+        return self._run(open_connection())
+
+    def send(self, connection_id, message):
+        """
+        :param message: bytes, one or more messages encoded by protocol.py
+        Queues message for one peer and returns right away. Messages to an unknown or closed connection are dropped
+        """
+        self._loop.call_soon_threadsafe(self._queue_message, connection_id, message)
+
+    def broadcast(self, message):
+        """Queues message for every connected peer and returns right away"""
+        self._loop.call_soon_threadsafe(self._queue_message_to_all, message)
+
+    def close(self, connection_id):
+        """Closes one connection once everything already queued for it is written"""
+        self._loop.call_soon_threadsafe(self._queue_close, connection_id)
+
+    def get_events(self, timeout=0):
+        """
+        :param timeout: float or None, the most seconds to wait for the first event. 0 doesn't wait, None waits forever
+        :return: list of (event, connection_id, message), every event since the last call, oldest first. message is a
+        tuple decoded by protocol.decode_message(...) for MESSAGE events and None for CONNECTED and DISCONNECTED
+        """
+        events = []
+        try:
+            if timeout != 0:
+                events.append(self._events.get(timeout=timeout))
+            while True:
+                events.append(self._events.get_nowait())
+        except queue.Empty:
+            pass
+        return events
+
+    def shutdown(self):
+        """Stops accepting connections, writes what's queued to every peer, closes them and stops the event loop thread"""
+        if not self._thread.is_alive():
+            return
+        self._run(self._shutdown())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    # everything below runs on the event loop's thread
+
+    def _add_connection(self, reader, writer):
+        connection = _Connection(next(self._connection_ids), reader, writer)
+        self._connections[connection.connection_id] = connection
+        connection.read_task = self._loop.create_task(self._read(connection))
+        connection.write_task = self._loop.create_task(self._write(connection))
+        self._events.put((CONNECTED, connection.connection_id, None))
+        return connection.connection_id
+
+    async def _on_accepted(self, reader, writer):
+        self._add_connection(reader, writer)
+
+    def _remove_connection(self, connection):
+        """Closes the connection right away, dropping anything not yet written"""
+        if self._connections.pop(connection.connection_id, None) is None:
+            return  # already removed
+        current_task = asyncio.current_task()
+        for task in (connection.read_task, connection.write_task):
+            if task is not current_task:
+                task.cancel()
+        connection.writer.close()
+        self._events.put((DISCONNECTED, connection.connection_id, None))
+
+    async def _read(self, connection):
+        decoder = protocol.StreamDecoder()
+        try:
+            while True:
+                data = await connection.reader.read(4096)
+                if not data:
+                    break  # the peer closed the connection
+                for message in decoder.feed(data):
+                    self._events.put((MESSAGE, connection.connection_id, message))
+        except (ConnectionError, OSError) as e:
+            logger.debug('connection {} could not be read: {}'.format(connection.connection_id, e))
+        self._remove_connection(connection)
+
+    async def _write(self, connection):
+        try:
+            while True:
+                message = await connection.outgoing.get()
+                if message is None:
+                    break
+                connection.writer.write(message)
+                await connection.writer.drain()  # waits while the peer's socket buffer is full
+        except (ConnectionError, OSError) as e:
+            logger.debug('connection {} could not be written: {}'.format(connection.connection_id, e))
+        self._remove_connection(connection)
+
+    def _queue_message(self, connection_id, message):
+        connection = self._connections.get(connection_id)
+        if connection is None:
+            return
+        try:
+            connection.outgoing.put_nowait(message)
+        except asyncio.QueueFull:
+            logger.warning('connection {} is too far behind and was closed'.format(connection_id))
+            self._remove_connection(connection)
+
+    def _queue_message_to_all(self, message):
+        for connection_id in list(self._connections):
+            self._queue_message(connection_id, message)
+
+    def _queue_close(self, connection_id):
+        connection = self._connections.get(connection_id)
+        if connection is not None:
+            self._loop.create_task(connection.outgoing.put(None))
+
+    async def _shutdown(self):
+        for listening_server in self._listening_servers:
+            listening_server.close()
+
+        connections = list(self._connections.values())
+        for connection in connections:
+            self._loop.create_task(connection.outgoing.put(None))
+        write_tasks = [connection.write_task for connection in connections]
+        if write_tasks:
+            await asyncio.wait(write_tasks, timeout=SHUTDOWN_TIMEOUT)
+        for connection in list(self._connections.values()):
+            self._remove_connection(connection)
@@ -1,21 +1,128 @@
-import logging.config
+import numpy as np
+import logging
 
-logging.config.fileConfig('logging.conf')
 logger = logging.getLogger('simpleLogger')
 
+DEFAULT_PATH = 'DEFAULT_PATH'
+DEFAULT_WAYPOINTS = ((100, 30), (100, 359))  # the path of the game: a straight line down
+
+
+def round_like_rect(values):
+    """returns values rounded the way pygame.Rect rounds floats: halves are rounded away from zero"""
+    return np.trunc(values + np.copysign(0.5, values))
+
 
 class Path:
-    """Represents the path a balloon will take"""
+    """Represents the path a balloon will take. The path is a polyline through its waypoints, sampled every spacing pixels
+    of arc length into a lookup table of points. A balloon's place on the path is an index into that table, and can be
+    fractional so balloons can move by less than a point per frame.
+    Paths aren't changed after they're made, so the game uses the ones registered with register_path(...) and shares them
+    between every level and balloon, see get_path(...)"""
+
+    def __init__(self, waypoints=DEFAULT_WAYPOINTS, spacing=1, path_id=None):
+        """
+        :param waypoints: sequence of 2-element tuples, the corners of the path, in the order balloons go through them
+        :param spacing: int or float, the arc length between two points of the lookup table, in pixels
+        :param path_id: str or None, the id this path is registered with. Use register_path(...) instead of setting it here
+        """
+        assert len(waypoints) >= 2, 'a path needs at least 2 waypoints'
+        assert spacing > 0, 'spacing must be positive'
+
+        self.waypoints = tuple(tuple(waypoint) for waypoint in waypoints)
+        self.spacing = spacing
+        self.path_id = path_id
 
-    def __init__(self):
-        self.points = [(100, y) for y in range(30, 360)]
+        waypoint_x = np.array([waypoint[0] for waypoint in waypoints], dtype=np.float64)
+        waypoint_y = np.array([waypoint[1] for waypoint in waypoints], dtype=np.float64)
+        # the arc length from the first waypoint to each waypoint
+        self.cumulative_lengths = np.concatenate(([0.0], np.cumsum(np.hypot(np.diff(waypoint_x), np.diff(waypoint_y)))))
+        self.length = float(self.cumulative_lengths[-1])
+
+        # the lookup table, shared by every balloon on this path
+        distances = np.arange(int(self.length // spacing) + 1) * spacing
+        self.x = np.interp(distances, self.cumulative_lengths, waypoint_x)
+        self.y = np.interp(distances, self.cumulative_lengths, waypoint_y)
+        self.x.flags.writeable = False
+        self.y.flags.writeable = False
+
+        # rounded the way pygame.Rect rounds, so a balloon at a whole path_position is drawn exactly on a point
+        self.points = list(zip(round_like_rect(self.x).astype(int).tolist(),
+                               round_like_rect(self.y).astype(int).tolist()))
+        self._x_list = self.x.tolist()
+        self._y_list = self.y.tolist()
+        self._indexes = np.arange(len(self.points), dtype=np.float64)
 
     def __len__(self):
         return len(self.points)
 
+    def __reduce_ex__(self, protocol):
+        """A registered path is pickled (and copied) as its path_id, so it comes back as the shared instance instead of a
+        copy of its tables"""
+        if self.path_id is not None and _registered_paths.get(self.path_id) is self:
+            return get_path, (self.path_id,)
+        return super().__reduce_ex__(protocol)
+
     def __getitem__(self, position):
         """
         :param position: int or slice (eg, 5:), used as the element inside the [ ] operators
         :return: self.points[position]
         """
         return self.points[position]
+
+    def get_position(self, path_position):
+        """
+        :param path_position: int or float, from 0 to len(self) - 1, the index of a point. Fractions are between two points
+        :return: 2-element tuple, the x and y at path_position
+        """
+        index = int(path_position)
+        fraction = path_position - index
+        if fraction == 0:
+            return self.points[index]
+
+        x, y = self._x_list, self._y_list
+        next_index = min(index + 1, len(x) - 1)
+        return (x[index] + (x[next_index] - x[index]) * fraction,
+                y[index] + (y[next_index] - y[index]) * fraction)
+
+    def get_positions(self, path_positions):
+        """
+        :param path_positions: NumPy array of float, indexes of points, see get_position(...)
+        :return: 2 NumPy arrays of float, the x and the y at every path_position
+        Same as get_position(...) for many balloons at once
+        """
+        return np.interp(path_positions, self._indexes, self.x), np.interp(path_positions, self._indexes, self.y)
+
+
+_registered_paths = {}  # path_id : Path
+
+
+def register_path(path_id, waypoints, spacing=1):
+    """
+    :param path_id: str, the id to register the path with, eg, DEFAULT_PATH
+    :param waypoints: sequence of 2-element tuples, see Path
+    :param spacing: int or float, see Path
+    :return: Path, the registered path. Registering the same path_id again with the same waypoints and spacing returns it too
+    """
+    assert isinstance(path_id, str), 'path_id must be a string'
+
+    registered_path = _registered_paths.get(path_id)
+    if registered_path is None:
+        registered_path = Path(waypoints, spacing, path_id)
+        _registered_paths[path_id] = registered_path
+    elif registered_path.waypoints != tuple(tuple(waypoint) for waypoint in waypoints) or registered_path.spacing != spacing:
+        raise ValueError('a different path is already registered as {}'.format(path_id))
+    return registered_path
+
+
+def get_path(path_id=DEFAULT_PATH):
+    """
+    :param path_id: str, the id the path was registered with
+    :return: Path, the one shared instance of that path
+    """
+    try:
+        return _registered_paths[path_id]
+    except KeyError:
+        raise NotImplementedError('the path {} is not registered'.format(path_id))
+
+
+register_path(DEFAULT_PATH, DEFAULT_WAYPOINTS)
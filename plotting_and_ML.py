@@ -1,27 +1,17 @@
-"""Contains algo for machine learning and plotting tower positions"""
-
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
-import numpy as np
-import logging.config
-import threading
-import matplotlib.pyplot as plt
-import mpl_toolkits.mplot3d.axes3d as p3
-import matplotlib.animation as animation
-import matplotlib.pyplot as plt
-from matplotlib.colors import ListedColormap
-from sklearn import neighbors, datasets
-from sklearn.neighbors import KNeighborsClassifier
-
-logging.config.fileConfig('logging.conf')
+"""Contains algo for machine learning and plotting tower positions.
+matplotlib and scikit-learn take seconds to import, and only the client ever plots or learns, so they're imported the first
+time they're used instead of when this module is. Importing this module (and so client.py and game.py) stays cheap"""
+
+import logging
+
 logger = logging.getLogger('simpleLogger')
 
+_plt = None  # matplotlib.pyplot, once get_pyplot() imported it
+_ax1 = None  # the 3D axes of the plot, made the first time it's shown
+
 # the plot is a x, y z plot representing the position of towers and their pop values, where x is x position
 # y is y position, and z is the pop count
 
-fig = plt.figure()
-ax1 = fig.add_subplot(111, projection='3d')
-
 x_pos = [0]
 y_pos = [0]
 z_pos = [0]  # zpos represents the count values, always starts at zero
@@ -31,6 +21,25 @@ dy = [0]
 dz = [0]  # this would be the height
 
 
+def get_pyplot():
+    """returns matplotlib.pyplot, importing it (and the 3D projection) the first time this is called"""
+    global _plt
+    if _plt is None:
+        import matplotlib.pyplot as plt
+        import mpl_toolkits.mplot3d  # registers the '3d' projection
+        _plt = plt
+    return _plt
+
+
+def get_axes():
+    """returns the 3D axes the towers are plotted on, making the figure the first time this is called"""
+    global _ax1
+    if _ax1 is None:
+        fig = get_pyplot().figure()
+        _ax1 = fig.add_subplot(111, projection='3d')
+    return _ax1
+
+
 # binary_semaphore = threading.Semaphore(value=1)  # since it is inconsistent to read and push to buffer
 
 
@@ -102,9 +111,10 @@ def update_plot_with_new_tower(x, y):
 
 
 def show_plot():
+    plt = get_pyplot()
     plt.ion()
     # logger.debug('inside show_plot. x_pos is: ' + str(x_pos))
-    ax1.bar3d(x_pos, y_pos, z_pos, dx, dy, dz)
+    get_axes().bar3d(x_pos, y_pos, z_pos, dx, dy, dz)
     logger.debug('inside show_plot. x_pos are' + str(x_pos))
     plt.draw()
     plt.pause(0.001)
@@ -112,6 +122,7 @@ def show_plot():
 
 
 def try_machine_learning(tower_stats_dict):
+    from sklearn.neighbors import KNeighborsClassifier  # only imported when the player asks for a prediction
 
     X = []  #this is the x,y position of all towers
     y = []  #this is their pop counts
@@ -0,0 +1,126 @@
+"""Contains the wire format of the messages sent between server.py and client.py. Every message is a frame: a 2-byte length,
+then a 1-byte message type and the struct-packed values of that type. TCP can split frames across recv(...) calls or pack
+several into one, so the receiving side feeds whatever it got to a StreamDecoder, which hands back only complete messages"""
+
+import struct
+import logging
+
+logger = logging.getLogger('simpleLogger')
+
+# message types, the first byte of every frame
+LIFEPOINT = 1
+BANK_BALANCE = 2
+CREATE_TOWER = 3
+UPDATE_TOWER = 4
+SELL_TOWER = 5
+SPAWN_BALLOON = 6
+
+# the value an UPDATE_TOWER message changes. Same letters the ascii messages used
+TOWER_SPEED = 's'
+TOWER_RADIUS = 'r'
+TOWER_POP_POWER = 'p'
+TOWER_POP_COUNT = 'c'
+
+_LENGTH = struct.Struct('!H')  # the number of bytes in the frame after the length itself
+_MESSAGE_TYPE = struct.Struct('!B')
+
+_LIFEPOINT = struct.Struct('!i')
+_BANK_BALANCE = struct.Struct('!i')
+_CREATE_TOWER = struct.Struct('!Qiiiii')  # tower_id, speed, radius, pop_power, x_pos, y_pos. The tower_type follows it
+_UPDATE_TOWER = struct.Struct('!Qci')  # tower_id, which value, the new value
+_SELL_TOWER = struct.Struct('!Q')
+_SPAWN_BALLOON = struct.Struct('!B')  # the number of layers of the balloon, 1 to 5
+
+
+def _frame(message_type, payload):
+    """returns the bytes to send for a message of message_type whose packed values are payload"""
+    return _LENGTH.pack(_MESSAGE_TYPE.size + len(payload)) + _MESSAGE_TYPE.pack(message_type) + payload
+
+
+def encode_lifepoint(lifepoint):
+    return _frame(LIFEPOINT, _LIFEPOINT.pack(lifepoint))
+
+
+def encode_bank_balance(bank_balance):
+    return _frame(BANK_BALANCE, _BANK_BALANCE.pack(bank_balance))
+
+
+def encode_create_tower(tower_id, tower_type, speed, radius, pop_power, x_pos, y_pos):
+    """:param tower_type: str, one of the tower type constants in tower.py, eg, LINEAR_TOWER"""
+    return _frame(CREATE_TOWER, _CREATE_TOWER.pack(tower_id, speed, radius, pop_power, x_pos, y_pos) +
+                  tower_type.encode('ascii'))
+
+
+def encode_update_tower(tower_id, field, value):
+    """:param field: str, TOWER_SPEED, TOWER_RADIUS, TOWER_POP_POWER or TOWER_POP_COUNT"""
+    assert field in (TOWER_SPEED, TOWER_RADIUS, TOWER_POP_POWER, TOWER_POP_COUNT), 'field must be a tower value constant'
+    return _frame(UPDATE_TOWER, _UPDATE_TOWER.pack(tower_id, field.encode('ascii'), value))
+
+
+def encode_sell_tower(tower_id):
+    return _frame(SELL_TOWER, _SELL_TOWER.pack(tower_id))
+
+
+def encode_spawn_balloon(number_of_layers):
+    """:param number_of_layers: int, 1 to 5, which balloon the client wants the server to send"""
+    return _frame(SPAWN_BALLOON, _SPAWN_BALLOON.pack(number_of_layers))
+
+
+def decode_message(body):
+    """
+    :param body: bytes, a frame without its length
+    :return: tuple, the message type followed by its values, in the order of the matching encode_...(...) arguments
+    """
+    message_type = body[0]
+    payload = body[_MESSAGE_TYPE.size:]
+
+    if message_type == LIFEPOINT:
+        return (LIFEPOINT,) + _LIFEPOINT.unpack(payload)
+    elif message_type == BANK_BALANCE:
+        return (BANK_BALANCE,) + _BANK_BALANCE.unpack(payload)
+    elif message_type == CREATE_TOWER:
+        tower_id, speed, radius, pop_power, x_pos, y_pos = _CREATE_TOWER.unpack_from(payload)
+        tower_type = payload[_CREATE_TOWER.size:].decode('ascii')
+        return CREATE_TOWER, tower_id, tower_type, speed, radius, pop_power, x_pos, y_pos
+    elif message_type == UPDATE_TOWER:
+        tower_id, field, value = _UPDATE_TOWER.unpack(payload)
+        return UPDATE_TOWER, tower_id, field.decode('ascii'), value
+    elif message_type == SELL_TOWER:
+        return (SELL_TOWER,) + _SELL_TOWER.unpack(payload)
+    elif message_type == SPAWN_BALLOON:
+        return (SPAWN_BALLOON,) + _SPAWN_BALLOON.unpack(payload)
+
+    raise NotImplementedError('the message type {} is not valid'.format(message_type))
+
+
+class StreamDecoder:
+    """Collects the bytes received from a socket and cuts them into messages"""
+
+    def __init__(self):
+        self._received = bytearray()  # bytes of frames that haven't fully arrived yet
+
+    def feed(self, data):
+        """
+        :param data: bytes, whatever the last recv(...) returned
+        :return: list of tuple, every message completed by data, decoded by decode_message(...). A frame that can't be
+        decoded is logged and skipped; the length prefix still says where the next one starts
+        """
+        received = self._received
+        received += data
+
+        messages = []
+        start = 0
+        while len(received) - start >= _LENGTH.size:
+            (length,) = _LENGTH.unpack_from(received, start)
+            end = start + _LENGTH.size + length
+            if end > len(received):
+                break
+            body = bytes(received[start + _LENGTH.size:end])
+            try:
+                messages.append(decode_message(body))
+            except (NotImplementedError, struct.error, UnicodeDecodeError, IndexError):
+                logger.critical('could not decode the message {}, it was skipped'.format(body))
+            start = end
+
+        del received[:start]
+        return messages
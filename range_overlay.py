@@ -0,0 +1,82 @@
+"""Contains the layer that shows every tower's attack radius. The circles only change when a tower is placed, sold or has its
+radius upgraded, so they're composited onto one layer then, instead of each tower drawing its circle every frame. Each radius
+is drawn once, onto a Surface shared by every tower with that radius"""
+
+import pygame
+import logging
+
+import colours
+
+logger = logging.getLogger('simpleLogger')
+
+TRANSPARENT_COLOUR = colours.BLACK  # the layer's colorkey, the circles are never this colour
+
+_circle_surfaces = {}  # radius : pygame.Surface
+
+
+def get_circle_surface(radius):
+    """
+    :param radius: int, the radius of the circle, in pixels
+    :return: pygame.Surface, a 1-pixel white circle outline centered on the Surface, the rest is transparent. Shared by every
+    caller asking for the same radius, so it must never be drawn on
+    """
+    circle_surface = _circle_surfaces.get(radius)
+    if circle_surface is None:
+        circle_surface = pygame.Surface((2 * radius + 2, 2 * radius + 2))
+        circle_surface.fill(TRANSPARENT_COLOUR)
+        pygame.draw.circle(circle_surface, colours.WHITE, (radius + 1, radius + 1), radius, 1)
+        circle_surface.set_colorkey(TRANSPARENT_COLOUR)
+        _circle_surfaces[radius] = circle_surface
+    return circle_surface
+
+
+def clear():
+    """Forgets every cached circle Surface"""
+    _circle_surfaces.clear()
+
+
+class RangeOverlay:
+    """The attack radiuses of every tower in a sprite group, composited onto one transparent layer"""
+
+    def __init__(self, tower_sprites, size=(400, 400), is_enabled=True):
+        """
+        :param tower_sprites: pygame.sprite.AbstractGroup, the towers to show the radius of, eg, sprite_groups.tower_sprites
+        :param size: 2-element tuple, the size of the layer, same as the display
+        :param is_enabled: boolean, whether the radiuses are shown. If False, nothing is ever composited
+        """
+        self.tower_sprites = tower_sprites
+        self.is_enabled = is_enabled
+        self.layer = pygame.Surface(size)
+        self.layer.set_colorkey(TRANSPARENT_COLOUR)
+
+        self._composited_key = None  # the centers and radiuses on the layer, None if it hasn't been composited yet
+
+    def toggle(self):
+        """Shows the radiuses if they're hidden, hides them otherwise"""
+        self.is_enabled = not self.is_enabled
+
+    def _get_key(self):
+        if not self.is_enabled:
+            return ()
+        return tuple((tow.rect.center, tow._attack_values.radius) for tow in self.tower_sprites)
+
+    def update(self):
+        """
+        :return: boolean, whether the layer changed, ie, a tower was placed, sold or had its radius upgraded, or the overlay
+        was toggled
+        Composites the layer again if it changed since the last call
+        """
+        key = self._get_key()
+        if key == self._composited_key:
+            return False
+
+        self.layer.fill(TRANSPARENT_COLOUR)
+        for (centerx, centery), radius in key:
+            self.layer.blit(get_circle_surface(radius), (centerx - radius - 1, centery - radius - 1))
+        self._composited_key = key
+        return True
+
+    def draw(self, surface):
+        """Draws the layer onto surface. Does nothing if the overlay is disabled"""
+        if self.is_enabled:
+            surface.blit(self.layer, (0, 0))
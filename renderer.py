@@ -0,0 +1,100 @@
+"""Contains the dirty rectangle renderer used by game.py and server.py. The parts of the screen that never move (the black board,
+the dashboard, the tower icons and the towers' radiuses) are drawn onto a background Surface, again only when they change. Every frame, only the places where something was
+drawn last frame are restored from the background, and only the places that look different from last frame are sent to the
+display, instead of filling and updating the whole screen"""
+
+import pygame
+import logging
+
+import colours
+import frame_profiler
+import text_cache
+
+logger = logging.getLogger('simpleLogger')
+
+DASHBOARD_RECT = (0, 300, 400, 100)
+
+
+class DirtyRectRenderer:
+    """Draws the moving sprites, circles and labels over a pre-rendered background and keeps track of what changed"""
+
+    def __init__(self, display_surface, static_sprite_groups=(), range_overlay=None, profiler=None):
+        """
+        :param display_surface: pygame.Surface, the display Surface, eg, DISPLAYSURF
+        :param static_sprite_groups: iterable of pygame.sprite.AbstractGroup, sprites that don't move, eg, the tower icons.
+        They're drawn onto the background, which is drawn again only if one of their images changes
+        :param range_overlay: range_overlay.RangeOverlay or None, the towers' radiuses, drawn onto the background under the
+        static sprites. None shows no radiuses
+        :param profiler: frame_profiler.FrameProfiler or None, times the sprite drawing and the text rendering of every frame.
+        None measures nothing
+        """
+        self.display_surface = display_surface
+        self.static_sprite_groups = list(static_sprite_groups)
+        self.range_overlay = range_overlay
+        self.profiler = profiler if profiler is not None else frame_profiler.NULL_PROFILER
+        self.background = pygame.Surface(display_surface.get_size())
+
+        self._static_key = None  # what the static sprites looked like when the background was last drawn
+        self._drawn_items = {}  # what was drawn last frame, key : pygame.Rect. See draw_frame(...)
+        self._is_full_update_needed = True
+
+    def _get_static_key(self):
+        return [(spr.image, tuple(spr.rect)) for sprite_group in self.static_sprite_groups for spr in sprite_group]
+
+    def _draw_background(self):
+        """Draws the board, the dashboard, the radiuses and the static sprites onto the background"""
+        self.background.fill(colours.BLACK)
+        pygame.draw.rect(self.background, colours.GRAY, DASHBOARD_RECT)
+        if self.range_overlay is not None:
+            self.range_overlay.draw(self.background)
+        for sprite_group in self.static_sprite_groups:
+            sprite_group.draw(self.background)
+
+    def invalidate(self):
+        """Makes the next frame redraw and update the whole screen, eg, after something else was drawn on the display"""
+        self._is_full_update_needed = True
+
+    def draw_frame(self, sprite_group_list, labels=()):
+        """
+        :param sprite_group_list: list of pygame.sprite.AbstractGroup, the moving sprites, drawn in order
+        :param labels: iterable of (font, text, colour, position), drawn last. Rendered by text_cache, so a label whose text
+        didn't change is the same Surface as last frame
+        :return: list of pygame.Rect, the parts of the display that changed. Pass it to pygame.display.update(...)
+        """
+        static_key = self._get_static_key()
+        is_range_overlay_changed = self.range_overlay is not None and self.range_overlay.update()
+        if static_key != self._static_key or is_range_overlay_changed:
+            self._draw_background()
+            self._static_key = static_key
+            self._is_full_update_needed = True
+
+        surface = self.display_surface
+        background = self.background
+
+        if self._is_full_update_needed:
+            surface.blit(background, (0, 0))
+        else:
+            for rect in self._drawn_items.values():
+                surface.blit(background, rect, rect)
+
+        # an item that is drawn the same as last frame doesn't change the display by itself, so it's keyed by what it looks
+        # like and where it is. Anything that overlaps it and did change is dirty anyway
+        drawn_items = {}
+        for sprite_group in sprite_group_list:
+            for spr in sprite_group:
+                drawn_items[(spr.image, tuple(spr.rect))] = surface.blit(spr.image, spr.rect)
+        self.profiler.lap(frame_profiler.SPRITE_DRAWING)
+        for font, text, colour, position in labels:
+            label = text_cache.render(font, text, colour)
+            drawn_items[(label, tuple(position))] = surface.blit(label, position)
+        self.profiler.lap(frame_profiler.TEXT_RENDERING)
+
+        if self._is_full_update_needed:
+            dirty_rects = [surface.get_rect()]
+            self._is_full_update_needed = False
+        else:
+            dirty_rects = [rect for key, rect in self._drawn_items.items() if key not in drawn_items]
+            dirty_rects.extend(rect for key, rect in drawn_items.items() if key not in self._drawn_items)
+
+        self._drawn_items = drawn_items
+        return dirty_rects
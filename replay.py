@@ -0,0 +1,249 @@
+"""Contains the recorder and player of replays. A match plays out the same from the same seed, levels and inputs (see
+simulation.py), so a replay only stores those, not what happened: a header with the seed and the levels' balloons, then a few
+bytes per input, tagged with the tick it was applied at. A whole match is a few hundred bytes to a few KiB.
+
+The player rebuilds the match and fast-forwards it to any tick by stepping the headless simulation, without drawing anything.
+On the way it takes a snapshot every CHECKPOINT_INTERVAL ticks (see snapshot.py), so seeking back, or forward past where it
+has already been, restores the nearest one instead of playing the match again from the start.
+
+The format, all integers big-endian:
+    header: MAGIC, then version (B), seed (q), number of levels (B)
+    level:  length of the path_id (B), the path_id in UTF-8, number of balloons (H), one byte per balloon
+    input:  tick (I), input code (B), then the arguments of the input, see _ARGUMENT_FORMATS
+The inputs are appended as they're applied, so a file recorded by a game that crashed is still valid up to its last input"""
+
+import struct
+import logging
+
+import path
+import level
+import tower
+import simulation
+import snapshot
+
+logger = logging.getLogger('simpleLogger')
+
+MAGIC = b'TDRP'
+FORMAT_VERSION = 1
+CHECKPOINT_INTERVAL = 10 * simulation.TICKS_PER_SECOND  # ticks between two snapshots of the match being played back
+
+# the codes written for the constants. Only ever append to these, or replays already recorded will decode to other inputs
+INPUT_TYPES = (simulation.PLACE_TOWER, simulation.UPGRADE_TOWER, simulation.SELL_TOWER, simulation.SPAWN_BALLOON)
+TOWER_TYPES = (tower.LINEAR_TOWER, tower.THREE_SIXTY_TOWER, tower.EXPLOSION_TOWER, tower.TELEPORTATION_TOWER)
+UPGRADES = (simulation.UPGRADE_SPEED, simulation.UPGRADE_RADIUS, simulation.UPGRADE_POP_POWER)
+
+_HEADER = struct.Struct('!BqB')
+_PATH_ID_LENGTH = struct.Struct('!B')
+_BALLOON_COUNT = struct.Struct('!H')
+_INPUT = struct.Struct('!IB')
+_ARGUMENT_FORMATS = {
+    simulation.PLACE_TOWER: struct.Struct('!Bhh'),  # tower type code, x, y
+    simulation.UPGRADE_TOWER: struct.Struct('!hhB'),  # x, y, upgrade code
+    simulation.SELL_TOWER: struct.Struct('!hh'),  # x, y
+    simulation.SPAWN_BALLOON: struct.Struct('!B'),  # number of layers
+}
+
+
+def encode_header(seed, levels):
+    """
+    :param seed: int, the seed of the match, fits in 64 signed bits
+    :param levels: list of level.Level, every level of the match, none started yet. Their paths must be registered, see
+    path.register_path(...)
+    :return: bytes
+    """
+    assert -2 ** 63 <= seed < 2 ** 63, 'seed must fit in 64 signed bits'
+    assert len(levels) < 256, 'a replay holds at most 255 levels'
+
+    encoded = [MAGIC, _HEADER.pack(FORMAT_VERSION, seed, len(levels))]
+    for lev in levels:
+        path_id = lev.balloon_path.path_id
+        assert path_id is not None, "the levels' paths must be registered"
+        encoded_path_id = path_id.encode('utf-8')
+        encoded.append(_PATH_ID_LENGTH.pack(len(encoded_path_id)))
+        encoded.append(encoded_path_id)
+        encoded.append(_BALLOON_COUNT.pack(len(lev.numbers_representing_balloons)))
+        encoded.append(bytes(lev.numbers_representing_balloons))
+    return b''.join(encoded)
+
+
+def encode_input(tick, input_type, args):
+    """
+    :param tick: int, the tick the input was applied at
+    :param input_type: str constant, one of simulation.INPUT_TYPES
+    :param args: tuple, the arguments of input_type
+    :return: bytes
+    """
+    if input_type == simulation.PLACE_TOWER:
+        tower_type, (x, y) = args
+        arguments = (TOWER_TYPES.index(tower_type), x, y)
+    elif input_type == simulation.UPGRADE_TOWER:
+        (x, y), upgrade = args
+        arguments = (x, y, UPGRADES.index(upgrade))
+    elif input_type == simulation.SELL_TOWER:
+        (x, y), = args
+        arguments = (x, y)
+    elif input_type == simulation.SPAWN_BALLOON:
+        arguments = args
+    else:
+        raise ValueError('the input {} is not valid'.format(input_type))
+    return _INPUT.pack(tick, INPUT_TYPES.index(input_type)) + _ARGUMENT_FORMATS[input_type].pack(*arguments)
+
+
+def decode(data):
+    """
+    :param data: bytes, a replay, eg, read from a file InputRecorder wrote
+    :return: (seed, levels, inputs). levels is a list of (path_id, list of balloon numbers), inputs a list of
+    (tick, input_type, args), in the order they were applied. An input cut off at the end of data is dropped
+    """
+    data = bytes(data)
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError('not a replay')
+    offset = len(MAGIC)
+    version, seed, level_count = _HEADER.unpack_from(data, offset)
+    if version != FORMAT_VERSION:
+        raise ValueError('replay format version {} is not supported'.format(version))
+    offset += _HEADER.size
+
+    levels = []
+    for _ in range(level_count):
+        path_id_length, = _PATH_ID_LENGTH.unpack_from(data, offset)
+        offset += _PATH_ID_LENGTH.size
+        path_id = data[offset:offset + path_id_length].decode('utf-8')
+        offset += path_id_length
+        balloon_count, = _BALLOON_COUNT.unpack_from(data, offset)
+        offset += _BALLOON_COUNT.size
+        levels.append((path_id, list(data[offset:offset + balloon_count])))
+        offset += balloon_count
+
+    inputs = []
+    while offset + _INPUT.size <= len(data):
+        tick, input_code = _INPUT.unpack_from(data, offset)
+        input_type = INPUT_TYPES[input_code]
+        argument_format = _ARGUMENT_FORMATS[input_type]
+        if offset + _INPUT.size + argument_format.size > len(data):
+            break  # cut off while it was being written
+        arguments = argument_format.unpack_from(data, offset + _INPUT.size)
+        offset += _INPUT.size + argument_format.size
+
+        if input_type == simulation.PLACE_TOWER:
+            args = (TOWER_TYPES[arguments[0]], arguments[1:])
+        elif input_type == simulation.UPGRADE_TOWER:
+            args = (arguments[:2], UPGRADES[arguments[2]])
+        elif input_type == simulation.SELL_TOWER:
+            args = (arguments,)
+        else:
+            args = arguments
+        inputs.append((tick, input_type, args))
+    return seed, levels, inputs
+
+
+class InputRecorder:
+    """Records every input a match applies, see Simulation.input_recorder"""
+
+    def __init__(self, match, file_path=None):
+        """
+        :param match: simulation.Simulation, not stepped yet
+        :param file_path: str or None, the file to write the replay to as it's recorded. None only keeps it in self.data
+        """
+        assert match.tick == 0, 'a match must be recorded from its first tick'
+
+        self.match = match
+        self.data = bytearray(encode_header(match.seed, [match.current_level] + match.levels))
+        self.input_count = 0
+
+        self._file = None
+        if file_path is not None:
+            self._file = open(file_path, 'wb')
+            self._write(self.data)
+        match.input_recorder = self
+
+    def _write(self, encoded):
+        if self._file is not None:
+            self._file.write(encoded)
+            self._file.flush()  # so a crash loses nothing already played
+
+    def record(self, tick, input_type, args):
+        """Called by the match with every input it applies"""
+        if input_type == simulation.SPAWN_BALLOON and args[0] not in range(256):
+            return  # not a balloon, so the match ignores it too
+        encoded = encode_input(tick, input_type, args)
+        self.data += encoded
+        self.input_count += 1
+        self._write(encoded)
+
+    def close(self):
+        """Stops recording and closes the file"""
+        if self.match.input_recorder is self:
+            self.match.input_recorder = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class ReplayPlayer:
+    """Plays a replay back on a headless simulation, and fast-forwards (or rewinds) it to any tick"""
+
+    def __init__(self, data, checkpoint_interval=CHECKPOINT_INTERVAL, **simulation_kwargs):
+        """
+        :param data: bytes, a replay, see decode(...)
+        :param checkpoint_interval: int, the ticks between two snapshots of the match
+        :param simulation_kwargs: the other arguments of simulation.Simulation, eg, use_balloon_batch=True. The match gets its
+        own sprite groups, so the game's aren't touched. The bank and life points are still the game's
+        """
+        assert isinstance(checkpoint_interval, int) and checkpoint_interval > 0, 'checkpoint_interval must be positive'
+
+        self.seed, self.levels, self.inputs = decode(data)
+        self.checkpoint_interval = checkpoint_interval
+        self.checkpoints = {}  # tick : snapshot.Snapshot, taken as the match is played
+        self.simulation_kwargs = dict(simulation_kwargs, use_own_sprite_groups=True)
+        self.match = None  # the match being played, once create_simulation() or seek(...) made it
+
+    @classmethod
+    def load(cls, file_path, checkpoint_interval=CHECKPOINT_INTERVAL, **simulation_kwargs):
+        with open(file_path, 'rb') as replay_file:
+            return cls(replay_file.read(), checkpoint_interval, **simulation_kwargs)
+
+    @property
+    def last_input_tick(self):
+        """int, the tick the last input was applied at, -1 if there are no inputs"""
+        return self.inputs[-1][0] if self.inputs else -1
+
+    def create_simulation(self):
+        """returns simulation.Simulation, the match at tick 0 with every input of the replay queued"""
+        levels = [level.Level(list(numbers), path.get_path(path_id)) for path_id, numbers in self.levels]
+        match = simulation.Simulation(levels, seed=self.seed, **self.simulation_kwargs)
+        for tick, input_type, args in self.inputs:
+            match.queue_input(input_type, *args, tick=tick)
+        return match
+
+    def seek(self, tick):
+        """
+        :param tick: int, the tick to go to, ie, the match has simulated the ticks before it
+        :return: simulation.Simulation, self.match
+        Restores the latest checkpoint at or before tick if the match is past tick or behind that checkpoint, then steps the
+        match forward to tick, taking the checkpoints it passes
+        """
+        assert isinstance(tick, int) and tick >= 0, 'tick must be a non-negative integer'
+
+        checkpoint_tick = max((checkpoint_tick for checkpoint_tick in self.checkpoints if checkpoint_tick <= tick),
+                              default=None)
+        if self.match is None or (tick < self.match.tick and checkpoint_tick is None):
+            self.match = self.create_simulation()
+        if checkpoint_tick is not None and (tick < self.match.tick or checkpoint_tick > self.match.tick):
+            snapshot.restore_snapshot(self.checkpoints[checkpoint_tick], self.match)
+
+        while self.match.tick < tick:
+            next_checkpoint_tick = (self.match.tick // self.checkpoint_interval + 1) * self.checkpoint_interval
+            self.match.step(min(tick, next_checkpoint_tick) - self.match.tick)
+            if self.match.tick == next_checkpoint_tick and next_checkpoint_tick not in self.checkpoints:
+                self.checkpoints[next_checkpoint_tick] = snapshot.take_snapshot(self.match)
+        return self.match
+
+    def play_to_end(self, max_ticks=100000):
+        """
+        :param max_ticks: int, the most ticks to simulate, in case the match can never finish
+        :return: simulation.Simulation, self.match, once every input was applied and the match is won or lost
+        """
+        match = self.seek(min(self.last_input_tick + 1, max_ticks))
+        match.run_until_finished(max_ticks - match.tick)
+        return match
@@ -0,0 +1,297 @@
+"""Contains the headless simulation of a match. The simulation runs the rules of the game (spawning balloons, towers attacking,
+balloons moving and bullets travelling) without a display or a frame clock, so a match can run as fast as the CPU allows.
+A match is stepped one tick at a time and never looks at the time. Inputs from outside (towers the player places, balloons an
+attacker sends) are queued for a tick with queue_input(...), and anything random must come from Simulation.random, so the same
+seed and inputs always play out the same match"""
+
+import collections
+import random
+import time
+import pygame
+import logging
+
+import sprite_groups
+import balloon
+import path
+import match_state
+import tower
+import game_utility
+import balloon_batch
+import spatial_index
+import collision
+import bullet_pool
+import frame_profiler
+
+logger = logging.getLogger('simpleLogger')
+
+FRAMES_BETWEEN_BALLOONS = 10  # the number of frames to wait before the next balloon of a level is added
+TICKS_PER_SECOND = 15  # the game's speed, the ticks TickClock asks for every second
+
+# the inputs that can be queued with Simulation.queue_input(...), followed by their arguments
+PLACE_TOWER = 'PLACE_TOWER'  # tower_type, position. See Simulation.place_tower(...)
+UPGRADE_TOWER = 'UPGRADE_TOWER'  # position, upgrade. See Simulation.upgrade_tower(...)
+SELL_TOWER = 'SELL_TOWER'  # position. See Simulation.sell_tower(...)
+SPAWN_BALLOON = 'SPAWN_BALLOON'  # number_of_layers. See Simulation.spawn_balloon(...)
+INPUT_TYPES = (PLACE_TOWER, UPGRADE_TOWER, SELL_TOWER, SPAWN_BALLOON)
+
+# the upgrades of UPGRADE_TOWER, see Tower.upgrade(...)
+UPGRADE_SPEED = tower.UPGRADE_SPEED
+UPGRADE_RADIUS = tower.UPGRADE_RADIUS
+UPGRADE_POP_POWER = tower.UPGRADE_POP_POWER
+UPGRADES = (UPGRADE_SPEED, UPGRADE_RADIUS, UPGRADE_POP_POWER)
+
+
+class Simulation:
+    """Owns the state of a match (sprite groups, bank, life points, unsent messages and the queue of levels) and steps it one
+    frame at a time"""
+
+    def __init__(self, levels=None, use_balloon_batch=False, use_bullet_pool=False, use_own_sprite_groups=False,
+                 profiler=None, seed=None, messages=None):
+        """
+        :param levels: list of level.Level, the levels to play, in order. If None, the game's levels are used
+        :param use_balloon_batch: boolean, whether to store the balloons in a balloon_batch.BalloonBatchGroup, which moves them
+        with NumPy, instead of sprite_groups.balloon_sprites
+        :param use_bullet_pool: boolean, whether to store the bullets in a bullet_pool.BulletPool, which moves them with NumPy
+        and reuses killed bullets, instead of sprite_groups.bullet_sprites
+        :param use_own_sprite_groups: boolean, whether to make new tower, balloon and bullet groups for this simulation instead
+        of using the game's sprite groups, so several simulations can exist at once
+        :param profiler: frame_profiler.FrameProfiler or None, times the spawning and the tower, balloon and bullet updates of
+        every step. None measures nothing
+        :param seed: int or None, the seed of self.random. None picks one at random, it's kept in self.seed so the match can
+        still be replayed
+        :param messages: message_buffer.MessageBuffer or None, where what changes is pushed for a client, eg, by server.py.
+        None for a headless match, which then pushes no messages at all
+        Empties the game's sprite groups if they're used, so every simulation starts from the same state
+        """
+        self.sprite_groups = sprite_groups
+        # the bank, life points and unsent messages of this match, handed to its towers and balloons
+        self.match_state = match_state.MatchState(messages)
+        self.bank = self.match_state.bank
+        self.life_point = self.match_state.life_point
+
+        if use_own_sprite_groups:
+            self.tower_sprites = pygame.sprite.Group()
+            self.balloon_sprites = sprite_groups.BalloonGroup(self.match_state)
+            self.bullet_sprites = pygame.sprite.Group()
+        else:
+            self.tower_sprites = self.sprite_groups.tower_sprites
+            self.balloon_sprites = self.sprite_groups.balloon_sprites
+            self.balloon_sprites.match_state = self.match_state
+            self.bullet_sprites = self.sprite_groups.bullet_sprites
+        if use_balloon_batch:
+            self.balloon_sprites = balloon_batch.BalloonBatchGroup(self.match_state)
+        if use_bullet_pool:
+            self.bullet_sprites = bullet_pool.BulletPool()
+        self.balloon_index = spatial_index.UniformGrid()  # rebuilt every frame, before the towers look for balloons
+        self.bullet_hash = collision.BulletSpatialHash()  # rebuilt every frame, before the balloons check for bullets
+
+        self.profiler = profiler if profiler is not None else frame_profiler.NULL_PROFILER
+
+        self.levels = levels if levels is not None else game_utility.create_game_levels()
+        assert self.levels, 'there must be at least one level to simulate'
+        self.current_level = self.levels.pop(0)
+
+        self.make_new_balloon_countdown = FRAMES_BETWEEN_BALLOONS  # dictates when to make the next balloon
+        self.frame_count = 0  # the number of frames simulated so far, ie, the tick the next step simulates
+
+        self.seed = seed if seed is not None else random.randrange(2 ** 63)
+        self.random = random.Random(self.seed)  # the only source of randomness the game rules may use
+        self._queued_inputs = collections.defaultdict(list)  # tick : list of (input_type, args), in the order queued
+        self.input_recorder = None  # called with (tick, input_type, args) for every input applied, see replay.InputRecorder
+        self.on_tower_placed = None  # function called with every tower place_tower(...) adds, eg, to tell the client about it
+
+        self.tower_sprites.empty()
+        self.balloon_sprites.empty()
+        self.bullet_sprites.empty()
+
+    @property
+    def tick(self):
+        """int, the tick the next step simulates. Same as frame_count"""
+        return self.frame_count
+
+    def queue_input(self, input_type, *args, tick=None):
+        """
+        :param input_type: str constant, one of INPUT_TYPES, eg, PLACE_TOWER
+        :param args: the arguments of input_type, see the constants
+        :param tick: int or None, the tick to apply the input at, before anything else of that tick is simulated. None is the
+        next tick to be simulated
+        Inputs of the same tick are applied in the order they were queued
+        """
+        assert input_type in INPUT_TYPES, 'input_type must be one of INPUT_TYPES'
+        if tick is None:
+            tick = self.frame_count
+        assert isinstance(tick, int) and tick >= self.frame_count, 'inputs can only be queued for ticks not simulated yet'
+
+        self._queued_inputs[tick].append((input_type, args))
+
+    def apply_input(self, input_type, *args):
+        """Applies an input right away. Use queue_input(...) so the input is applied at a known tick"""
+        if self.input_recorder is not None:
+            self.input_recorder.record(self.frame_count, input_type, args)
+
+        if input_type == PLACE_TOWER:
+            return self.place_tower(*args)
+        elif input_type == UPGRADE_TOWER:
+            return self.upgrade_tower(*args)
+        elif input_type == SELL_TOWER:
+            return self.sell_tower(*args)
+        elif input_type == SPAWN_BALLOON:
+            return self.spawn_balloon(*args)
+
+        raise ValueError('the input {} is not valid'.format(input_type))
+
+    def is_level_completed(self):
+        """returns whether all the balloons of the current level were added and none of them remain"""
+        return not self.current_level.next_balloon_exists() and len(self.balloon_sprites) == 0
+
+    def is_won(self):
+        """returns whether the player has completed every level without running out of life points"""
+        return self.is_level_completed() and not self.levels and not self.is_lost()
+
+    def is_lost(self):
+        """returns whether the player has run out of life points"""
+        return self.life_point.life_balance <= 0
+
+    def is_finished(self):
+        return self.is_won() or self.is_lost()
+
+    def place_tower(self, tower_type, position):
+        """
+        :param tower_type: str constant, which tower to create, eg, tower.LINEAR_TOWER
+        :param position: 2-element tuple, where the tower is to be created
+        :return: the new tower, or None if the bank balance can't pay for it
+        Creates a tower the same way clicking on the board does: the tower is only added if the player can pay for it
+        """
+        new_tower = tower.create_tower(tower_type, position, self.match_state)
+        if self.bank.balance < new_tower.buy_price:
+            return None
+
+        self.bank.withdraw(new_tower.buy_price)
+        self.tower_sprites.add(new_tower)
+        if self.on_tower_placed is not None:
+            self.on_tower_placed(new_tower)
+        return new_tower
+
+    def get_tower_at(self, position):
+        """
+        :param position: 2-element tuple, the center of a tower, ie, the position it was placed at
+        :return: the first tower placed there, or None if there isn't one
+        """
+        for tow in self.tower_sprites:  # must not be named with tower, will result in name clashes
+            if tow.rect.center == tuple(position):
+                return tow
+        return None
+
+    def upgrade_tower(self, position, upgrade):
+        """
+        :param position: 2-element tuple, the center of the tower to upgrade
+        :param upgrade: str constant, one of UPGRADES, eg, UPGRADE_SPEED
+        :return: boolean, whether there was a tower to upgrade. The upgrade is only bought if the player can pay for it
+        """
+        assert upgrade in UPGRADES, 'upgrade must be one of UPGRADES'
+        tow = self.get_tower_at(position)
+        if tow is None:
+            return False
+        tow.upgrade(upgrade)
+        return True
+
+    def sell_tower(self, position):
+        """
+        :param position: 2-element tuple, the center of the tower to sell
+        :return: boolean, whether there was a tower to sell
+        """
+        tow = self.get_tower_at(position)
+        if tow is None:
+            return False
+        tow.sell_tower()
+        return True
+
+    def spawn_balloon(self, number_of_layers):
+        """
+        :param number_of_layers: int, 1 to 5, the balloon an attacker sent
+        :return: boolean, whether number_of_layers was valid. No balloon is added if it wasn't
+        Adds the balloon at the start of the path
+        """
+        if number_of_layers not in balloon.BALLOON_TYPE_BY_NUMBER_OF_LAYERS:
+            return False
+        self.balloon_sprites.add(
+            balloon.create_balloon(balloon.BALLOON_TYPE_BY_NUMBER_OF_LAYERS[number_of_layers], path.DEFAULT_PATH))
+        return True
+
+    def step(self, n_frames=1):
+        """
+        :param n_frames: int, the number of frames to simulate
+        Simulates n_frames frames. Finishing the game doesn't stop stepping, because in multiplayer the attacker can still
+        send balloons. Use run_until_finished(...) to stop once the game is won or lost
+        """
+        assert isinstance(n_frames, int) and n_frames >= 0, 'n_frames must be a non-negative integer'
+
+        profiler = self.profiler
+        for _ in range(n_frames):
+            for input_type, args in self._queued_inputs.pop(self.frame_count, ()):
+                self.apply_input(input_type, *args)
+
+            # if the current level is finished and there are other levels remaining, start the next one
+            if self.is_level_completed() and self.levels:
+                self.current_level = self.levels.pop(0)
+
+            # if it's time to make a new balloon and the next balloon exists, add it and restart countdown
+            if self.make_new_balloon_countdown == 0:
+                if self.current_level.next_balloon_exists():
+                    self.balloon_sprites.add(self.current_level.get_next_balloon())
+                self.make_new_balloon_countdown = FRAMES_BETWEEN_BALLOONS
+            else:
+                self.make_new_balloon_countdown -= 1
+            profiler.lap(frame_profiler.SPAWN)
+
+            if self.tower_sprites:
+                self.balloon_index.build(self.balloon_sprites)
+                self.tower_sprites.update(self.balloon_sprites, self.bullet_sprites, self.balloon_index)
+            profiler.lap(frame_profiler.TOWER_UPDATE)
+            self.bullet_hash.build(self.bullet_sprites)
+            self.balloon_sprites.update(self.bullet_sprites, self.bullet_hash)
+            profiler.lap(frame_profiler.BALLOON_UPDATE)
+            self.bullet_sprites.update()
+            profiler.lap(frame_profiler.BULLET_UPDATE)
+
+            self.frame_count += 1
+
+    def run_until_finished(self, max_frames=100000):
+        """
+        :param max_frames: int, the most frames to simulate, in case the game can never finish
+        :return: int, the number of frames simulated
+        Simulates frames, as fast as possible, until the game is won or lost
+        """
+        start_frame_count = self.frame_count
+        while not self.is_finished() and self.frame_count - start_frame_count < max_frames:
+            self.step()
+        return self.frame_count - start_frame_count
+
+
+class TickClock:
+    """Says how many ticks are due, so the game steps the simulation TICKS_PER_SECOND times per second of real time however
+    fast or slow it draws. Only the number of ticks depends on the time, never what happens in them"""
+
+    def __init__(self, ticks_per_second=TICKS_PER_SECOND, max_ticks_per_call=5, clock=time.monotonic):
+        """
+        :param ticks_per_second: int
+        :param max_ticks_per_call: int, the most ticks get_ticks_due() returns. When the game falls further behind than that,
+        the rest of the ticks are dropped instead of making every later frame slower too
+        :param clock: function returning the time in seconds, eg, time.monotonic
+        """
+        self.ticks_per_second = ticks_per_second
+        self.max_ticks_per_call = max_ticks_per_call
+        self.clock = clock
+
+        self._start_time = clock()
+        self._ticks_counted = 0  # ticks returned or dropped since _start_time
+
+    def get_ticks_due(self):
+        """returns int, the number of ticks to step now, 0 if it's too early for the next one"""
+        ticks_elapsed = int((self.clock() - self._start_time) * self.ticks_per_second)
+        ticks_due = ticks_elapsed - self._ticks_counted
+        if ticks_due > self.max_ticks_per_call:
+            logger.debug('{} ticks behind, dropped {}'.format(ticks_due, ticks_due - self.max_ticks_per_call))
+            ticks_due = self.max_ticks_per_call
+        self._ticks_counted = ticks_elapsed
+        return ticks_due
@@ -0,0 +1,219 @@
+"""Contains snapshots of a match. A snapshot holds everything a match needs to carry on from a tick: the bank balance, the life
+points, the levels left, the random state, the queued inputs and every tower, balloon and bullet. The towers, balloons and
+bullets are rows of NumPy structured arrays, so a snapshot of thousands of them is a few small buffers, cheap to keep in
+memory, to pickle or to send to another process.
+
+A snapshot is never changed after it's taken: its arrays are read-only and the paths and random state are shared, not copied.
+Restoring only reads it, so the same snapshot can be restored any number of times, eg, to seek a replay (see
+replay.ReplayPlayer) or to try several what-if moves from the same mid-game state (see branch(...))"""
+
+import numpy as np
+import logging
+
+import balloon
+import bullet
+import bullet_pool
+import level
+import tower
+import simulation
+
+logger = logging.getLogger('simpleLogger')
+
+# the codes stored for the constants
+TOWER_TYPES = (tower.LINEAR_TOWER, tower.THREE_SIXTY_TOWER, tower.EXPLOSION_TOWER, tower.TELEPORTATION_TOWER)
+BULLET_TYPES = (bullet.STANDARD_BULLET, bullet.EXPLOSION_BULLET, bullet.TELEPORTATION_BULLET)
+
+TOWER_DTYPE = np.dtype([('tower_type', np.uint8), ('x', np.int32), ('y', np.int32), ('sell_price', np.int32),
+                        ('speed', np.int32), ('radius', np.int32), ('pop_power', np.int32),
+                        ('frames_until_attack_again', np.int32), ('pop_count', np.int32),
+                        ('speed_upgrade_index', np.uint8), ('radius_upgrade_index', np.uint8),
+                        ('pop_power_upgrade_index', np.uint8),
+                        ('is_alive', np.bool_)])  # False for a sold tower whose bullets are still flying
+BALLOON_DTYPE = np.dtype([('number_of_layers', np.uint8), ('path', np.uint16), ('path_position', np.float64),
+                          ('x', np.int32), ('y', np.int32)])
+BULLET_DTYPE = np.dtype([('bullet_type', np.uint8), ('x', np.int32), ('y', np.int32), ('destination_x', np.float64),
+                         ('destination_y', np.float64), ('step_x', np.float64), ('step_y', np.float64),
+                         ('frames_remaining', np.float64), ('pop_power', np.int32),
+                         ('tower', np.int32)])  # the row of the tower that shot it
+
+
+class Snapshot:
+    """The state of a match at one tick, see take_snapshot(...)"""
+
+    def __init__(self, tick, seed, random_state, make_new_balloon_countdown, bank_balance, life_balance, levels,
+                 queued_inputs, paths, towers, balloons, bullets):
+        """
+        :param tick: int, the tick the match will simulate next
+        :param seed: int, the seed of the match
+        :param random_state: tuple, from random.Random.getstate()
+        :param make_new_balloon_countdown: int, see Simulation
+        :param bank_balance: int
+        :param life_balance: int
+        :param levels: tuple of (path.Path, tuple of int), the current level then the levels left, with the balloons they
+        have yet to add
+        :param queued_inputs: tuple of (tick, input_type, args), in the order they're to be applied
+        :param paths: tuple of path.Path, the paths the balloons are on, the 'path' column of balloons is an index into it
+        :param towers: np.ndarray of TOWER_DTYPE, in the order of the match's tower group
+        :param balloons: np.ndarray of BALLOON_DTYPE, in the order of the match's balloon group
+        :param bullets: np.ndarray of BULLET_DTYPE, in the order of the match's bullet group
+        """
+        self.tick = tick
+        self.seed = seed
+        self.random_state = random_state
+        self.make_new_balloon_countdown = make_new_balloon_countdown
+        self.bank_balance = bank_balance
+        self.life_balance = life_balance
+        self.levels = levels
+        self.queued_inputs = queued_inputs
+        self.paths = paths
+        self.towers = towers
+        self.balloons = balloons
+        self.bullets = bullets
+        for array in (towers, balloons, bullets):
+            array.flags.writeable = False  # shared by every match restored from this snapshot
+
+    @property
+    def nbytes(self):
+        """int, the size of the tower, balloon and bullet arrays, in bytes"""
+        return self.towers.nbytes + self.balloons.nbytes + self.bullets.nbytes
+
+
+def take_snapshot(match):
+    """
+    :param match: simulation.Simulation
+    :return: Snapshot, the state of match before its next tick
+    """
+    towers = list(match.tower_sprites)
+    tower_rows = {tow: row for row, tow in enumerate(towers)}
+    # a bullet keeps the tower that shot it, even once the tower is sold, so its pops are still counted
+    for bullet_sprite in match.bullet_sprites:
+        shooter = bullet_sprite.tower_increment_pop_method.__self__
+        if shooter not in tower_rows:
+            tower_rows[shooter] = len(towers)
+            towers.append(shooter)
+
+    tower_array = np.array([(TOWER_TYPES.index(tow.tower_type), tow.rect.centerx, tow.rect.centery, tow.sell_price,
+                             tow._attack_values.speed, tow._attack_values.radius, tow._attack_values.pop_power,
+                             tow.frames_until_attack_again, tow._pop_count,
+                             tow._speed_upgrade_values_and_prices_and_icons.next_upgrade_index,
+                             tow._radius_upgrade_values_and_prices_and_icons.next_upgrade_index,
+                             tow._pop_power_upgrade_values_and_prices_and_icons.next_upgrade_index,
+                             tow.alive())
+                            for tow in towers], dtype=TOWER_DTYPE)
+
+    paths = []
+    path_rows = {}
+    balloon_rows = []
+    for balloon_sprite in match.balloon_sprites:
+        if balloon_sprite.balloon_path not in path_rows:
+            path_rows[balloon_sprite.balloon_path] = len(paths)
+            paths.append(balloon_sprite.balloon_path)
+        balloon_rows.append((balloon_sprite.current_layer.number_of_layers, path_rows[balloon_sprite.balloon_path],
+                             balloon_sprite.path_position, balloon_sprite.rect.centerx, balloon_sprite.rect.centery))
+    balloon_array = np.array(balloon_rows, dtype=BALLOON_DTYPE)
+
+    bullet_sprites = match.bullet_sprites
+    is_bullet_pool = isinstance(bullet_sprites, bullet_pool.BulletPool)  # it counts down the frames in its arrays instead
+    bullet_array = np.array([(BULLET_TYPES.index(bullet_sprite.bullet_type), bullet_sprite.rect.centerx,
+                              bullet_sprite.rect.centery, bullet_sprite.destination_x, bullet_sprite.destination_y,
+                              bullet_sprite.step_x, bullet_sprite.step_y,
+                              bullet_sprites.frames_remaining[bullet_sprite.pool_slot] if is_bullet_pool else
+                              bullet_sprite.frames_remaining_until_self_destroy,
+                              bullet_sprite.pop_power, tower_rows[bullet_sprite.tower_increment_pop_method.__self__])
+                             for bullet_sprite in bullet_sprites], dtype=BULLET_DTYPE)
+
+    levels = tuple((lev.balloon_path, tuple(lev.numbers_representing_balloons))
+                   for lev in [match.current_level] + match.levels)
+    queued_inputs = tuple((tick, input_type, args) for tick in sorted(match._queued_inputs)
+                          for input_type, args in match._queued_inputs[tick])
+
+    return Snapshot(match.frame_count, match.seed, match.random.getstate(), match.make_new_balloon_countdown,
+                    match.bank.balance, match.life_point.life_balance, levels, queued_inputs, tuple(paths), tower_array,
+                    balloon_array, bullet_array)
+
+
+def _create_levels(match_snapshot):
+    return [level.Level(list(numbers), balloon_path) for balloon_path, numbers in match_snapshot.levels]
+
+
+def restore_snapshot(match_snapshot, match):
+    """
+    :param match_snapshot: Snapshot
+    :param match: simulation.Simulation, the match to restore into. Everything it had is replaced, only its sprite group
+    types, profiler and input recorder are kept
+    :return: simulation.Simulation, match
+    """
+    match.frame_count = match_snapshot.tick
+    match.seed = match_snapshot.seed
+    match.random.setstate(match_snapshot.random_state)
+    match.make_new_balloon_countdown = match_snapshot.make_new_balloon_countdown
+    match.bank.balance = match_snapshot.bank_balance
+    match.life_point.life_balance = match_snapshot.life_balance
+
+    levels = _create_levels(match_snapshot)
+    match.current_level = levels.pop(0)
+    match.levels = levels
+
+    match._queued_inputs.clear()
+    for tick, input_type, args in match_snapshot.queued_inputs:
+        match._queued_inputs[tick].append((input_type, args))
+
+    match.tower_sprites.empty()
+    towers = []
+    for row in match_snapshot.towers.tolist():
+        (tower_type, x, y, sell_price, speed, radius, pop_power, frames_until_attack_again, pop_count, speed_upgrade_index,
+         radius_upgrade_index, pop_power_upgrade_index, is_alive) = row
+        tow = tower.create_tower(TOWER_TYPES[tower_type], (x, y), match.match_state)
+        tow.sell_price = sell_price
+        tow._attack_values.speed = speed
+        tow._attack_values.radius = radius
+        tow._attack_values.pop_power = pop_power
+        tow.frames_until_attack_again = frames_until_attack_again
+        tow._pop_count = pop_count
+        tow._speed_upgrade_values_and_prices_and_icons.next_upgrade_index = speed_upgrade_index
+        tow._radius_upgrade_values_and_prices_and_icons.next_upgrade_index = radius_upgrade_index
+        tow._pop_power_upgrade_values_and_prices_and_icons.next_upgrade_index = pop_power_upgrade_index
+        towers.append(tow)
+        if is_alive:
+            match.tower_sprites.add(tow)
+
+    match.balloon_sprites.empty()
+    balloon_rows = match_snapshot.balloons.tolist()
+    match.balloon_sprites.add(*[balloon.create_balloon(balloon.BALLOON_TYPE_BY_NUMBER_OF_LAYERS[number_of_layers],
+                                                       match_snapshot.paths[path_row])
+                                for number_of_layers, path_row, path_position, x, y in balloon_rows])
+    # set once they're in the group, a balloon_batch.BalloonBatchGroup stores them elsewhere
+    for balloon_sprite, (number_of_layers, path_row, path_position, x, y) in zip(match.balloon_sprites.sprites(),
+                                                                                  balloon_rows):
+        balloon_sprite.path_position = path_position
+        balloon_sprite.rect.center = (x, y)
+
+    match.bullet_sprites.empty()
+    new_bullets = []
+    for (bullet_type, x, y, destination_x, destination_y, step_x, step_y, frames_remaining, pop_power,
+         tower_row) in match_snapshot.bullets.tolist():
+        # any destination but (x, y) will do, a bullet already there can't be made. What reset(...) works out from it is
+        # replaced right after
+        new_bullet = bullet.create_bullet(BULLET_TYPES[bullet_type], (x, y), (x + 1, y), pop_power,
+                                          towers[tower_row].increment_pop_count)
+        new_bullet.destination_x = destination_x
+        new_bullet.destination_y = destination_y
+        new_bullet.step_x = step_x
+        new_bullet.step_y = step_y
+        new_bullet.frames_remaining_until_self_destroy = frames_remaining
+        new_bullets.append(new_bullet)
+    match.bullet_sprites.add(*new_bullets)
+
+    return match
+
+
+def branch(match_snapshot, **simulation_kwargs):
+    """
+    :param match_snapshot: Snapshot
+    :param simulation_kwargs: the other arguments of simulation.Simulation, eg, use_balloon_batch=True
+    :return: simulation.Simulation, a new match restored from match_snapshot, with its own sprite groups, bank and life
+    points, so it can be stepped alongside any other match
+    """
+    match = simulation.Simulation(_create_levels(match_snapshot), seed=match_snapshot.seed,
+                                  **dict(simulation_kwargs, use_own_sprite_groups=True))
+    return restore_snapshot(match_snapshot, match)
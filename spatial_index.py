@@ -0,0 +1,61 @@
+"""Contains a uniform grid over the centers of the balloons. Towers query it for the balloons within their radius instead of
+measuring the distance to every balloon in the game"""
+
+import math
+import logging
+
+logger = logging.getLogger('simpleLogger')
+
+
+class UniformGrid:
+    """Buckets balloons by the square cell their center is in. A query only looks at the cells that overlap its circle"""
+
+    def __init__(self, cell_size=50):
+        """
+        :param cell_size: int, the width and height of a cell, in pixels. Works best when close to the radius of the towers
+        """
+        assert isinstance(cell_size, int) and cell_size > 0, 'cell_size must be a positive integer'
+
+        self.cell_size = cell_size
+        self._cells = {}  # (column, row) : list of (order, x, y, balloon)
+
+    def __len__(self):
+        return sum(len(cell) for cell in self._cells.values())
+
+    def build(self, balloons):
+        """
+        :param balloons: iterable of Balloon, eg, the balloon sprite group
+        Replaces the contents of the grid with the current centers of balloons. Must be called again after balloons move
+        """
+        cell_size = self.cell_size
+        cells = {}
+        for order, balloon in enumerate(balloons):
+            x = balloon.get_centerX()
+            y = balloon.get_centerY()
+            key = (x // cell_size, y // cell_size)
+            if key in cells:
+                cells[key].append((order, x, y, balloon))
+            else:
+                cells[key] = [(order, x, y, balloon)]
+        self._cells = cells
+
+    def find_first_within(self, position, radius):
+        """
+        :param position: 2-element tuple, the center of the circle to search in
+        :param radius: int, the radius of the circle to search in
+        :return: Balloon or None, of the balloons whose center is within radius of position, the one that came first in
+        build(...). This is the same balloon a tower finds by going through the balloons in order
+        """
+        x, y = position
+        cell_size = self.cell_size
+        cells = self._cells
+
+        first_entry = None
+        for column in range(int((x - radius) // cell_size), int((x + radius) // cell_size) + 1):
+            for row in range(int((y - radius) // cell_size), int((y + radius) // cell_size) + 1):
+                for entry in cells.get((column, row), ()):
+                    if (first_entry is None or entry[0] < first_entry[0]) and \
+                                    math.hypot(entry[1] - x, entry[2] - y) <= radius:
+                        first_entry = entry
+
+        return first_entry[3] if first_entry is not None else None
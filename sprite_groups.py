@@ -1,23 +1,23 @@
 import pygame
-import logging.config
+import logging
 
-logging.config.fileConfig('logging.conf')
 logger = logging.getLogger('simpleLogger')
 
 
 class BalloonGroup(pygame.sprite.AbstractGroup):
     """Sprite group for storing Balloons (aka, Balloon objects"""
 
-    def __init__(self):
+    def __init__(self, match_state=None):
+        """
+        :param match_state: match_state.MatchState or None, the state of the match the balloons are in. Every balloon added
+        is given it, so it can pay its bounty and take life points. See simulation.Simulation
+        """
         super().__init__()
+        self.match_state = match_state
 
-    def draw(self, surface):
-        """Modified from Abstract group to draw the Balloon's current_balloon instead of its rect values"""
-        sprites = self.sprites()
-        surface_blit = surface.blit
-        for spr in sprites:
-            self.spritedict[spr] = surface_blit(spr.current_balloon_state.image, spr.current_balloon_state.rect)
-        self.lostsprites = []
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        sprite.match_state = self.match_state
 
 
 bullet_sprites = pygame.sprite.Group()
@@ -35,3 +35,7 @@ selected_tower_icon_sprite = pygame.sprite.GroupSingle()
 
 #contains all sprites, used to draw them to board
 all_sprites = [bullet_sprites, tower_sprites, balloon_sprites, tower_icon_sprites, upgrade_icon_sprites, sell_tower_icon_sprite, selected_tower_icon_sprite]
+
+# the tower icons never move, so they're drawn onto the renderer's background instead of every frame
+static_sprites = [tower_icon_sprites]
+moving_sprites = [sprite_group for sprite_group in all_sprites if sprite_group not in static_sprites]
@@ -0,0 +1,31 @@
+"""Contains a cache of filled Surfaces. Every L1 balloon, every bullet and every LinearTower looks the same, so sprites of the
+same colour and dimension share one Surface instead of each making and filling their own"""
+
+import pygame
+import logging
+
+logger = logging.getLogger('simpleLogger')
+
+_filled_surfaces = {}  # (colour, dimension) : pygame.Surface
+
+
+def get_filled_surface(colour, dimension):
+    """
+    :param colour: 4-element tuple, the colour to fill the Surface with
+    :param dimension: 2-element tuple, the width and height of the Surface
+    :return: pygame.Surface, shared by every caller asking for the same colour and dimension
+    The returned Surface is shared, so it must never be drawn on or filled. To change how a sprite looks, give it another
+    Surface from this function instead
+    """
+    key = (tuple(colour), tuple(dimension))
+    filled_surface = _filled_surfaces.get(key)
+    if filled_surface is None:
+        filled_surface = pygame.Surface([dimension[0], dimension[1]])
+        filled_surface.fill(colour)
+        _filled_surfaces[key] = filled_surface
+    return filled_surface
+
+
+def clear():
+    """Forgets every cached Surface. Sprites already using them keep them"""
+    _filled_surfaces.clear()
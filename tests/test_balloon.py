@@ -7,317 +7,247 @@ import balloon
 import pygame
 import bullet
 import path
-import bank
+import colours
 
 
 class TestBalloon(TestCase):
     def test_init_with_all_params(self):
-        p = [(100, y) for y in range(30, 360)]
-        b = balloon.BalloonState((0, 0, 255), (50, 60), p, 30, 40)
+        p = path.Path()
+        b = balloon.Balloon(balloon.get_balloon_layer(balloon.BALLOON_L4), p, 40)
 
-        self.assertEqual(b.image.get_width(), 50)
-        self.assertEqual(b.image.get_height(), 60)
-        self.assertEqual(b.image.get_at((10, 10)), (0, 0, 255, 255))
+        self.assertEqual(b.image.get_width(), 30)
+        self.assertEqual(b.image.get_height(), 30)
+        self.assertEqual(b.image.get_at((10, 10)), colours.GREEN)
         self.assertEqual(b.path_index, 40)
         self.assertEqual(b.rect.centerx, 100)
         self.assertEqual(b.rect.centery, 70)
-        self.assertEqual(b.path, p)
-        self.assertEqual(b.bounty, 30)
+        self.assertIs(b.balloon_path, p)
+        self.assertEqual(b.current_layer.bounty, 40)
 
     def test_init_with_defaults(self):
-        p = [(100, y) for y in range(30, 360)]
-        b = balloon.BalloonState((0, 0, 255), (50, 60), p)
+        p = path.Path()
+        b = balloon.Balloon(balloon.get_balloon_layer(balloon.BALLOON_L2), p)
 
-        self.assertEqual(b.image.get_width(), 50)
-        self.assertEqual(b.image.get_height(), 60)
-        self.assertEqual(b.image.get_at((10, 10)), (0, 0, 255, 255))
+        self.assertEqual(b.image.get_at((10, 10)), colours.ORANGE)
         self.assertEqual(b.path_index, 0)
         self.assertEqual(b.rect.centerx, 100)
         self.assertEqual(b.rect.centery, 30)
-        self.assertEqual(b.path, p)
-        self.assertEqual(b.bounty, 20)
+        self.assertIs(b.balloon_path, p)
+        self.assertEqual(b.current_layer.bounty, 20)
 
     @patch.object(pygame.sprite, 'spritecollide')
     def test_update_with_no_collided_bullets(self, mock_spritecollide):
-        mock_spritecollide.return_value = None
-        p = [(100, y) for y in range(30, 360)]
-        b = balloon.BalloonState((0, 0, 255), (50, 60), p)
+        mock_spritecollide.return_value = []
+        b = balloon.create_balloon(balloon.BALLOON_L2, path.Path())
 
-        return_value = b.update('fake_bullet_sprites')
+        return_value = b.update(pygame.sprite.Group())
 
         self.assertIsNone(return_value)
+        self.assertEqual(b.path_index, 1)
 
     @patch.object(pygame.sprite, 'spritecollide')
     def test_update_with_StandardBullet_as_collided_bullets(self, mock_spritecollide):
-        collided_bullets = Mock(spec=bullet.StandardBullet)
-        collided_bullets.pop_power = Mock(spec=int)
+        collided_bullet = Mock(spec=bullet.StandardBullet)
+        collided_bullet.pop_power = 1
+        collided_bullet.tower_increment_pop_method = Mock()
+        mock_spritecollide.return_value = [collided_bullet]
+        b = balloon.create_balloon(balloon.BALLOON_L2, path.Path())
 
-        mock_spritecollide.return_value = [collided_bullets]
-
-        p = [(100, y) for y in range(30, 360)]
-        b = balloon.BalloonState((0, 0, 255), (50, 60), p)
-
-        return_value = b.update('fake_bullet_sprites')
-
-        self.assertIsInstance(return_value, int)
+        b.update(pygame.sprite.Group())
 
+        collided_bullet.handle_collision_with_balloon.assert_called_once_with()
+        collided_bullet.tower_increment_pop_method.assert_called_once_with()
+        self.assertIs(b.current_layer, balloon.get_balloon_layer(balloon.BALLOON_L1))
+        self.assertEqual(b.path_index, 0)
 
     @patch.object(pygame.sprite, 'spritecollide')
     def test_update_with_ExplosionBullet_as_collided_bullets(self, mock_spritecollide):
-        collided_bullets = Mock(spec=bullet.ExplosionBullet)
-        collided_bullets.pop_power = Mock(spec=int)
-        mock_spritecollide.return_value = [collided_bullets]
-
-        p = [(100, y) for y in range(30, 360)]
-        b = balloon.BalloonState((0, 0, 255), (50, 60), p)
+        collided_bullet = Mock(spec=bullet.ExplosionBullet)
+        collided_bullet.pop_power = 1
+        collided_bullet.tower_increment_pop_method = Mock()
+        collided_bullet.handle_collision_with_balloon.return_value = []
+        mock_spritecollide.return_value = [collided_bullet]
+        bullet_sprites = pygame.sprite.Group()
+        b = balloon.create_balloon(balloon.BALLOON_L2, path.Path())
 
-        return_value = b.update('fake_bullet_sprites')
+        b.update(bullet_sprites)
 
-        self.assertIsInstance(return_value, int)
+        collided_bullet.handle_collision_with_balloon.assert_called_once_with(bullet_sprites)
+        self.assertIs(b.current_layer, balloon.get_balloon_layer(balloon.BALLOON_L1))
 
     @patch.object(pygame.sprite, 'spritecollide')
     def test_update_with_TeleportationBullet_as_collided_bullets(self, mock_spritecollide):
-        collided_bullets = Mock(spec=bullet.TeleportationBullet)
-        mock_spritecollide.return_value = [collided_bullets]
-
-        p = [(100, y) for y in range(30, 360)]
-        b = balloon.BalloonState((0, 0, 255), (50, 60), p)
+        collided_bullet = Mock(spec=bullet.TeleportationBullet)
+        mock_spritecollide.return_value = [collided_bullet]
+        b = balloon.create_balloon(balloon.BALLOON_L2, path.Path(), 50)
 
-        return_value = b.update('fake_bullet_sprites')
+        b.update(pygame.sprite.Group())
 
-        self.assertFalse(return_value)
+        collided_bullet.handle_collision_with_balloon.assert_called_once_with()
+        self.assertIs(b.current_layer, balloon.get_balloon_layer(balloon.BALLOON_L2))
+        self.assertEqual(b.path_index, 30)
 
     @patch.object(pygame.sprite, 'spritecollide')
     def test_update_with_invalid_type_as_collided_bullets(self, mock_spritecollide):
-        collided_bullets = Mock(spec=int)
-        mock_spritecollide.return_value = [collided_bullets]
-
-        p = [(100, y) for y in range(30, 360)]
-        b = balloon.BalloonState((0, 0, 255), (50, 60), p)
+        mock_spritecollide.return_value = [Mock(spec=int)]
+        b = balloon.create_balloon(balloon.BALLOON_L2, path.Path())
 
-        self.assertRaises(NotImplementedError, b.update, 'fake_bullet_sprites')
+        self.assertRaises(NotImplementedError, b.update, pygame.sprite.Group())
 
     def test_move_with_valid_path_index(self):
-        p = [(100, y) for y in range(30, 360)]
-        b = balloon.BalloonState((0, 0, 255), (50, 60), p)
-        b.path_index = 10
+        b = balloon.create_balloon(balloon.BALLOON_L1, path.Path(), 10)
 
         b.move()
+
         self.assertEqual(b.rect.centerx, 100)
-        self.assertEqual(b.rect.centery, 40)
+        self.assertEqual(b.rect.centery, 41)
         self.assertEqual(b.path_index, 11)
 
-    def test_move_with_out_of_range_path_index(self):
-        p = [(100, y) for y in range(30, 360)]
-        b = balloon.BalloonState((0, 0, 255), (50, 60), p)
-
-        b.path_index = 329
-        self.assertRaises(NotImplementedError, b.move)
-
-        b.path_index = 500
-        self.assertRaises(NotImplementedError, b.move)
+    def test_move_past_end_of_path(self):
+        p = path.Path()
+        b = balloon.create_balloon(balloon.BALLOON_L1, p, len(p) - 1)
+        b.match_state = Mock()
+        group = pygame.sprite.Group(b)
 
-    def test_teleport_with_larger_default_back_track(self):
-        p = [(100, y) for y in range(30, 360)]
-        b = balloon.BalloonState((0, 0, 255), (50, 60), p)
-        b.path_index = 10
-        b.teleport()
-
-        self.assertEqual(b.path_index, 0)
+        b.move()
 
-    def test_teleport_with_smaller_default_back_track(self):
-        p = [(100, y) for y in range(30, 360)]
-        b = balloon.BalloonState((0, 0, 255), (50, 60), p)
-        b.path_index = 50
-        b.teleport()
+        self.assertEqual(len(group), 0)
+        b.match_state.life_point.decrease.assert_called_once_with()
 
-        self.assertEqual(b.path_index, 30)
+    def test_move_back_past_start_of_path(self):
+        b = balloon.create_balloon(balloon.BALLOON_L1, path.Path(), 10)
 
-    def test_teleport_with_larger_custom_back_track(self):
-        p = [(100, y) for y in range(30, 360)]
-        b = balloon.BalloonState((0, 0, 255), (50, 60), p)
-        b.path_index = 50
-        b.teleport(70)
+        b.move(-20)
 
         self.assertEqual(b.path_index, 0)
+        self.assertEqual(b.rect.center, (100, 30))
+
+    def test_move_back(self):
+        b = balloon.create_balloon(balloon.BALLOON_L1, path.Path(), 50)
 
-    def test_teleport_with_smaller_custom_back_track(self):
-        p = [(100, y) for y in range(30, 360)]
-        b = balloon.BalloonState((0, 0, 255), (50, 60), p)
-        b.path_index = 50
-        b.teleport(40)
+        b.move(-40)
 
         self.assertEqual(b.path_index, 10)
+        self.assertEqual(b.rect.center, (100, 40))
 
 
-class TestBalloonL1(TestCase):
-    def test_peel_layer(self):
-        p = [(100, y) for y in range(30, 360)]
-        b1 = balloon.BalloonStateL1((0, 0, 255), (50, 60), p)
+class TestBalloonContext(TestCase):
+    def test_init(self):
+        layer = balloon.get_balloon_layer(balloon.BALLOON_L2)
+        balloon_context = balloon.Balloon(layer, path.Path(), 40)
+        self.assertIs(balloon_context.current_layer, layer)
+        self.assertIs(balloon_context.image, layer.image)
+        self.assertEqual(balloon_context.rect.center, (100, 70))
 
-        return_value = b1.peel_layer()
-        self.assertIsNone(return_value)
+    def test_get_centerX(self):
+        balloon_context = balloon.create_balloon(balloon.BALLOON_L1, path.Path())
+        balloon_context.rect.centerx = 120
 
+        return_value = balloon_context.get_centerX()
 
-class TestBalloonL2(TestCase):
-    def test_peel_layer(self):
-        p = [(100, y) for y in range(30, 360)]
-        b2 = balloon.BalloonStateL2((0, 0, 255), (50, 60), p)
+        self.assertEqual(return_value, 120)
 
-        return_value = b2.peel_layer()
-        self.assertIsInstance(return_value, balloon.BalloonStateL1)
+    def test_get_centerY(self):
+        balloon_context = balloon.create_balloon(balloon.BALLOON_L1, path.Path())
+        balloon_context.rect.centery = 120
 
+        return_value = balloon_context.get_centerY()
 
-class TestBalloonL3(TestCase):
-    def test_peel_layer(self):
-        p = [(100, y) for y in range(30, 360)]
-        b3 = balloon.BalloonStateL3((0, 0, 255), (50, 60), p)
+        self.assertEqual(return_value, 120)
 
-        return_value = b3.peel_layer()
-        self.assertIsInstance(return_value, balloon.BalloonStateL2)
 
+class TestBalloonModule(TestCase):
+    def test_get_balloon_layer_BALLOON_L1(self):
+        return_value = balloon.get_balloon_layer(balloon.BALLOON_L1)
+        self.assertEqual(return_value.number_of_layers, 1)
 
-class TestBalloonL4(TestCase):
-    def test_peel_layer(self):
-        p = [(100, y) for y in range(30, 360)]
-        b4 = balloon.BalloonStateL4((0, 0, 255), (50, 60), p)
+    def test_get_balloon_layer_BALLOON_L2(self):
+        return_value = balloon.get_balloon_layer(balloon.BALLOON_L2)
+        self.assertEqual(return_value.number_of_layers, 2)
 
-        return_value = b4.peel_layer()
-        self.assertIsInstance(return_value, balloon.BalloonStateL3)
+    def test_get_balloon_layer_BALLOON_L3(self):
+        return_value = balloon.get_balloon_layer(balloon.BALLOON_L3)
+        self.assertEqual(return_value.number_of_layers, 3)
 
+    def test_get_balloon_layer_BALLOON_L4(self):
+        return_value = balloon.get_balloon_layer(balloon.BALLOON_L4)
+        self.assertEqual(return_value.number_of_layers, 4)
 
-class TestBalloonL5(TestCase):
-    def test_peel_layer(self):
-        p = [(100, y) for y in range(30, 360)]
-        b5 = balloon.BalloonStateL5((0, 0, 255), (50, 60), p)
+    def test_get_balloon_layer_BALLOON_L5(self):
+        return_value = balloon.get_balloon_layer(balloon.BALLOON_L5)
+        self.assertEqual(return_value.number_of_layers, 5)
 
-        return_value = b5.peel_layer()
-        self.assertIsInstance(return_value, balloon.BalloonStateL4)
+    def test_create_balloon_context(self):
+        return_value = balloon.create_balloon(balloon.BALLOON_L3, path.Path())
+        self.assertIsInstance(return_value, balloon.Balloon)
 
+    def test_create_balloon_with_path_id(self):
+        return_value = balloon.create_balloon(balloon.BALLOON_L3, path.DEFAULT_PATH)
+        self.assertIs(return_value.balloon_path, path.get_path(path.DEFAULT_PATH))
 
-class TestBalloonContext(TestCase):
-    def test_init(self):
-        p = [(100, y) for y in range(30, 360)]
-        b = balloon.BalloonState((0, 0, 255), (50, 60), p)
-        balloon_context = balloon.Balloon(b)
-        self.assertEqual(balloon_context.current_balloon_state, b)
-
-    @patch.object(balloon.BalloonState, 'update')
-    @patch.object(balloon.Balloon, 'handle_pop')
-    def test_update_with_true_is_handle_pop(self, mock_handle_pop, mock_update):
-        mock_update.return_value = True
-
-        p = [(100, y) for y in range(30, 360)]
-        b = balloon.BalloonState((0, 0, 255), (50, 60), p)
-        balloon_context = balloon.Balloon(b)
-
-        balloon_context.update('fake_bullet_sprites')
-        self.assertEqual(mock_handle_pop.call_count, 1)
-
-    @patch.object(balloon.BalloonState, 'update')
-    @patch.object(balloon.Balloon, 'handle_pop')
-    def test_update_with_false_is_handle_pop(self, mock_handle_pop, mock_update):
-        mock_update.return_value = False
-
-        p = [(100, y) for y in range(30, 360)]
-        b = balloon.BalloonState((0, 0, 255), (50, 60), p)
-        balloon_context = balloon.Balloon(b)
-
-        balloon_context.update('fake_bullet_sprites')
-        self.assertEqual(mock_handle_pop.call_count, 0)
-
-    @patch.object(balloon.BalloonState, 'update')
-    @patch.object(balloon.Balloon, 'handle_pop')
-    def test_update_with_none_is_handle_pop(self, mock_handle_pop, mock_update):
-        mock_update.return_value = None
-
-        p = [(100, y) for y in range(30, 360)]
-        b = balloon.BalloonState((0, 0, 255), (50, 60), p)
-        balloon_context = balloon.Balloon(b)
-
-        balloon_context.update('fake_bullet_sprites')
-        self.assertEqual(mock_handle_pop.call_count, 0)
-
-    @patch.object(bank, 'deposit')
-    @patch.object(balloon.BalloonStateL5, 'peel_layer')
-    @patch.object(pygame.sprite.Sprite, 'kill')
-    def test_handle_pop_with_None_current_ballon(self, mock_kill, mock_peel_layer, mock_deposit):
-        mock_peel_layer.return_value = None
-
-        p = [(100, y) for y in range(30, 360)]
-        bL5 = balloon.BalloonStateL5((0, 0, 255), (50, 60), p)
-        balloon_context = balloon.Balloon(bL5)
-        original_bounty = balloon_context.current_balloon_state.bounty
-        balloon_context.handle_pop()
-
-        self.assertEqual(mock_kill.call_count, 0)
-        self.assertEqual(mock_deposit.call_count, 1)
-        mock_deposit.assert_called_with(original_bounty)
-
-    @patch.object(bank, 'deposit')
-    @patch.object(balloon.BalloonStateL5, 'peel_layer')
-    @patch.object(pygame.sprite.Sprite, 'kill')
-    def test_handle_pop_with_None_current_ballon(self, mock_kill, mock_peel_layer, mock_deposit):
-        mock_peel_layer.return_value = balloon.create_balloon_state(balloon.BALLOON_L4, path.Path())
-
-        p = [(100, y) for y in range(30, 360)]
-        bL5 = balloon.BalloonStateL5((0, 0, 255), (50, 60), p)
-        balloon_context = balloon.Balloon(bL5)
-        original_bounty = balloon_context.current_balloon_state.bounty
-        balloon_context.handle_pop(1)
-
-        self.assertEqual(mock_kill.call_count, 0)
-        self.assertEqual(mock_deposit.call_count, 1)
-        mock_deposit.assert_called_with(original_bounty)
+    def test_get_balloon_layer_is_shared(self):
+        self.assertIs(balloon.get_balloon_layer(balloon.BALLOON_L3), balloon.get_balloon_layer(balloon.BALLOON_L3))
 
+    def test_get_balloon_layer_exception(self):
+        self.assertRaises(NotImplementedError, balloon.get_balloon_layer, 'Invalid type')
 
-    def test_get_centerX(self):
-        p = [(100, y) for y in range(30, 360)]
-        b = balloon.BalloonState((0, 0, 255), (50, 60), p)
-        b.rect.centerx = 120
-        balloon_context = balloon.Balloon(b)
 
-        return_value = balloon_context.get_centerX()
+class TestBalloonSubPixelMovement(TestCase):
+    def test_fractional_speed(self):
+        slow_layer = balloon.BalloonLayer((255, 0, 0, 255), (30, 30), 10, speed=0.5)
+        b = balloon.Balloon(slow_layer, path.Path())
 
-        self.assertEqual(return_value, 120)
+        b.move()
+        self.assertEqual((b.path_position, b.path_index, b.rect.center), (0.5, 0, (100, 31)))
+        b.move()
+        self.assertEqual((b.path_position, b.path_index, b.rect.center), (1, 1, (100, 31)))
 
-    def test_get_centerX(self):
-        p = [(100, y) for y in range(30, 360)]
-        b = balloon.BalloonState((0, 0, 255), (50, 60), p)
-        b.rect.centery = 120
-        balloon_context = balloon.Balloon(b)
+    def test_fractional_speed_reaches_end(self):
+        fast_layer = balloon.BalloonLayer((255, 0, 0, 255), (30, 30), 10, speed=2.5)
+        p = path.Path()
+        b = balloon.Balloon(fast_layer, p, len(p) - 3)
+        group = pygame.sprite.Group(b)
 
-        return_value = balloon_context.get_centerY()
+        b.move()
+        self.assertEqual(len(group), 1)
+        b.move()
+        self.assertEqual(len(group), 0)
 
-        self.assertEqual(return_value, 120)
 
+class TestBalloonLayer(TestCase):
+    def test_next_layer_order(self):
+        layer = balloon.get_balloon_layer(balloon.BALLOON_L5)
+        for balloon_type in [balloon.BALLOON_L4, balloon.BALLOON_L3, balloon.BALLOON_L2, balloon.BALLOON_L1]:
+            layer = layer.next_layer
+            self.assertIs(layer, balloon.get_balloon_layer(balloon_type))
+        self.assertIsNone(layer.next_layer)
 
-class TestBalloonModule(TestCase):
-    def test_create_balloon_BALLOON_L1(self):
-        return_value = balloon.create_balloon_state(balloon.BALLOON_L1, path.Path())
-        self.assertIsInstance(return_value, balloon.BalloonStateL1)
+    def test_number_of_layers(self):
+        self.assertEqual(balloon.get_balloon_layer(balloon.BALLOON_L1).number_of_layers, 1)
+        self.assertEqual(balloon.get_balloon_layer(balloon.BALLOON_L5).number_of_layers, 5)
 
-    def test_create_balloon_BALLOON_L2(self):
-        return_value = balloon.create_balloon_state(balloon.BALLOON_L2, path.Path())
-        self.assertIsInstance(return_value, balloon.BalloonStateL2)
+    def test_peel_layer_keeps_position(self):
+        b = balloon.create_balloon(balloon.BALLOON_L5, path.Path(), 10)
+        b.match_state = Mock()
+        rect = b.rect
 
-    def test_create_balloon_BALLOON_L3(self):
-        return_value = balloon.create_balloon_state(balloon.BALLOON_L3, path.Path())
-        self.assertIsInstance(return_value, balloon.BalloonStateL3)
+        b.peel_layer(3, lambda: None)
 
-    def test_create_balloon_BALLOON_L4(self):
-        return_value = balloon.create_balloon_state(balloon.BALLOON_L4, path.Path())
-        self.assertIsInstance(return_value, balloon.BalloonStateL4)
+        self.assertIs(b.current_layer, balloon.get_balloon_layer(balloon.BALLOON_L2))
+        self.assertIs(b.image, b.current_layer.image)
+        self.assertIs(b.rect, rect)
+        self.assertEqual(b.rect.center, path.Path()[10])
+        self.assertEqual([c[0][0] for c in b.match_state.bank.deposit.call_args_list], [50, 40, 30])
 
-    def test_create_balloon_BALLOON_L5(self):
-        return_value = balloon.create_balloon_state(balloon.BALLOON_L5, path.Path())
-        self.assertIsInstance(return_value, balloon.BalloonStateL5)
+    def test_peel_last_layer_kills_balloon(self):
+        b = balloon.create_balloon(balloon.BALLOON_L1, path.Path())
+        b.match_state = Mock()
+        group = pygame.sprite.Group(b)
 
-    def test_create_balloon_exception(self):
-        self.assertRaises(NotImplementedError, balloon.create_balloon_state, 'Invalid type', path.Path())
+        b.peel_layer(3, lambda: None)
 
-    def test_create_balloon_context(self):
-        return_value = balloon.create_balloon(balloon.BALLOON_L3, path.Path())
-        self.assertIsInstance(return_value, balloon.Balloon)
+        self.assertIsNone(b.current_layer)
+        self.assertEqual(len(group), 0)
+        self.assertEqual(b.match_state.bank.deposit.call_count, 1)
 
 
@@ -0,0 +1,99 @@
+import unittest
+from unittest import TestCase
+from unittest.mock import Mock
+
+import balloon
+import balloon_batch
+import path
+import pygame
+
+
+class TestBalloonBatch(TestCase):
+    def setUp(self):
+        self.p = path.Path()
+        self.batch = balloon_batch.BalloonBatch(self.p, capacity=2)
+
+    def test_add(self):
+        view = self.batch.add(balloon.create_balloon(balloon.BALLOON_L3, self.p, 5))
+
+        self.assertIsInstance(view, balloon.Balloon)
+        self.assertEqual(len(self.batch), 1)
+        self.assertEqual(view.path_index, 5)
+        self.assertEqual(self.batch.layer[view.slot], 3)
+        self.assertEqual((self.batch.x[view.slot], self.batch.y[view.slot]), self.p[5])
+
+    def test_add_past_capacity(self):
+        views = [self.batch.add(balloon.create_balloon(balloon.BALLOON_L1, self.p, i)) for i in range(5)]
+
+        self.assertEqual(len(self.batch), 5)
+        self.assertEqual(sorted(view.slot for view in views), [0, 1, 2, 3, 4])
+        self.assertEqual([view.path_index for view in views], [0, 1, 2, 3, 4])
+
+    def test_remove_reuses_slot(self):
+        view = self.batch.add(balloon.create_balloon(balloon.BALLOON_L1, self.p))
+        self.batch.remove(view.slot)
+        other_view = self.batch.add(balloon.create_balloon(balloon.BALLOON_L1, self.p))
+
+        self.assertEqual(len(self.batch), 1)
+        self.assertEqual(other_view.slot, view.slot)
+
+    def test_advance(self):
+        first = self.batch.add(balloon.create_balloon(balloon.BALLOON_L1, self.p, 10))
+        last = self.batch.add(balloon.create_balloon(balloon.BALLOON_L1, self.p, len(self.p) - 1))
+
+        reached_end = self.batch.advance([first.slot, last.slot])
+
+        self.assertEqual(reached_end, [last])
+        self.assertEqual(first.path_index, 11)
+        self.assertEqual(first.get_centerY(), self.p[11][1])
+        self.assertEqual(last.path_index, len(self.p) - 1)
+
+    def test_advance_with_fractional_speed_matches_balloon_move(self):
+        p = path.Path(waypoints=((0, 0), (30, 0), (30, 40)))
+        batch = balloon_batch.BalloonBatch(p)
+        slow_layer = balloon.BalloonLayer((255, 0, 0, 255), (30, 30), 10, speed=0.75)
+        view = batch.add(balloon.Balloon(slow_layer, p))
+        plain_balloon = balloon.Balloon(slow_layer, p)
+
+        for _ in range(60):
+            batch.advance([view.slot])
+            plain_balloon.move()
+            self.assertEqual(view.path_position, plain_balloon.path_position)
+            self.assertEqual(view.rect.center, plain_balloon.rect.center)
+
+    def test_view_peel_layer(self):
+        view = self.batch.add(balloon.create_balloon(balloon.BALLOON_L3, self.p))
+
+        view.peel_layer(2, lambda: None)
+
+        self.assertEqual(self.batch.layer[view.slot], 1)
+
+
+class TestBalloonBatchGroup(TestCase):
+    def test_update_moves_balloons(self):
+        p = path.Path()
+        group = balloon_batch.BalloonBatchGroup()
+        group.add(balloon.create_balloon(balloon.BALLOON_L1, p, 3))
+
+        group.update(pygame.sprite.Group())
+
+        view = group.sprites()[0]
+        self.assertIsInstance(view, balloon_batch.BalloonView)
+        self.assertEqual(view.path_index, 4)
+
+    def test_update_kills_balloons_at_end_of_path(self):
+        p = path.Path()
+        match_state = Mock()
+        group = balloon_batch.BalloonBatchGroup(match_state)
+        group.add(balloon.create_balloon(balloon.BALLOON_L1, p, len(p) - 1),
+                  balloon.create_balloon(balloon.BALLOON_L1, p, len(p) - 1))
+
+        group.update(pygame.sprite.Group())
+
+        self.assertEqual(len(group), 0)
+        self.assertEqual(group.batches, {})
+        match_state.life_point.decrease.assert_called_with(2)
+
+
+if __name__ == '__main__':
+    unittest.main()
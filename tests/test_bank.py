@@ -7,13 +7,15 @@ import bank
 
 class TestBank(TestCase):
     def test_deposit(self):
-        bank.balance = 0
-        bank.deposit(100)
+        b = bank.Bank(Mock(), balance=0)
+        b.deposit(100)
 
-        self.assertEqual(bank.balance, 100)
+        self.assertEqual(b.balance, 100)
+        b.messages.push_bank_balance_message.assert_called_once_with(100)
 
     def test_withdraw(self):
-        bank.balance = 100
-        bank.withdraw(50)
+        b = bank.Bank(Mock(), balance=100)
+        b.withdraw(50)
 
-        self.assertEqual(bank.balance, 50)
\ No newline at end of file
+        self.assertEqual(b.balance, 50)
+        b.messages.push_bank_balance_message.assert_called_once_with(50)
@@ -0,0 +1,69 @@
+import os
+import sys
+import unittest
+from unittest import TestCase
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+
+import benchmark_simulation
+import balloon
+import tower
+
+
+class TestBenchmarkSimulationModule(TestCase):
+    def test_create_simulation(self):
+        scenario = benchmark_simulation.Scenario('small', tower.LINEAR_TOWER, 10, balloon.BALLOON_L5, 50)
+        match = scenario.create_simulation()
+
+        self.assertEqual(len(match.tower_sprites), 10)
+        self.assertEqual(len(match.balloon_sprites), 50)
+        path_indexes = [bal.path_index for bal in match.balloon_sprites]
+        self.assertEqual(len(set(path_indexes)), 50)  # spread along the path
+
+    def test_run_scenario(self):
+        scenario = benchmark_simulation.Scenario('small', tower.EXPLOSION_TOWER, 4, balloon.BALLOON_L3, 50,
+                                                 use_bullet_pool=True)
+        result = benchmark_simulation.run_scenario(scenario, frames=3, repeats=1)
+
+        self.assertEqual(result['frames'], 3)
+        self.assertGreater(result['frames_per_second'], 0)
+        self.assertGreater(result['entities_per_second'], 0)
+        self.assertGreater(result['peak_memory_bytes'], 0)
+        self.assertGreater(result['allocations'], 0)
+
+    def test_count_allocations_counts_freed_blocks(self):
+        scenario = benchmark_simulation.Scenario('small', tower.THREE_SIXTY_TOWER, 4, balloon.BALLOON_L3, 50)
+        match = scenario.create_simulation()
+        match.step(5)  # bullets are flying and being destroyed from now on
+
+        self.assertGreater(benchmark_simulation.count_allocations(match, 5), 0)
+
+    def test_add_relative_speeds(self):
+        results = {benchmark_simulation.REFERENCE_SCENARIO: {'frames_per_second': 50}, 'a': {'frames_per_second': 100}}
+        benchmark_simulation.add_relative_speeds(results)
+
+        self.assertEqual(results[benchmark_simulation.REFERENCE_SCENARIO]['relative_speed'], 1)
+        self.assertEqual(results['a']['relative_speed'], 2)
+
+    def test_compare_to_baseline(self):
+        baseline = {'a': {'frames': 600, 'relative_speed': 1}, 'b': {'frames': 600, 'relative_speed': 1}}
+        results = {'a': {'frames': 600, 'relative_speed': 0.85}, 'b': {'frames': 600, 'relative_speed': 0.75},
+                   'new': {'frames': 600, 'relative_speed': 0.01}}
+
+        self.assertEqual(benchmark_simulation.compare_to_baseline(results, baseline, tolerance=0.2), ['b'])
+
+    def test_compare_to_baseline_with_other_frames(self):
+        baseline = {'a': {'frames': 600, 'relative_speed': 1}}
+        results = {'a': {'frames': 6000, 'relative_speed': 0.1}}
+
+        self.assertEqual(benchmark_simulation.get_comparable_names(results, baseline), [])
+        self.assertEqual(benchmark_simulation.compare_to_baseline(results, baseline, tolerance=0.2), [])
+
+    def test_scenario_names_are_unique(self):
+        names = [scenario.name for scenario in benchmark_simulation.SCENARIOS]
+        self.assertEqual(len(names), len(set(names)))
+        self.assertIn(benchmark_simulation.REFERENCE_SCENARIO, names)
+
+
+if __name__ == '__main__':
+    unittest.main()
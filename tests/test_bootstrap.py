@@ -0,0 +1,76 @@
+import os
+import subprocess
+import sys
+import unittest
+from unittest import TestCase
+from unittest.mock import patch
+
+import bootstrap
+
+
+class TestBootstrapModule(TestCase):
+    @patch('bootstrap._is_logging_configured', False)
+    @patch('logging.config.fileConfig')
+    def test_configure_logging_only_once(self, mock_file_config):
+        bootstrap.configure_logging()
+        bootstrap.configure_logging()
+
+        mock_file_config.assert_called_once_with(bootstrap.LOGGING_CONFIG_FILE)
+
+    def test_import_has_no_side_effects(self):
+        # a fresh interpreter, since the other tests may already have set up pygame
+        code = ('import logging.config, unittest.mock, pygame\n'
+                'with unittest.mock.patch("logging.config.fileConfig") as mock_file_config:\n'
+                '    import tower, simulation, evaluator, match_server, game\n'
+                'print(mock_file_config.called, pygame.display.get_init(), game.bootstrap.display_surface)')
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                                env=dict(os.environ, SDL_VIDEODRIVER='dummy'))
+
+        self.assertEqual(output.stdout.strip().splitlines()[-1], 'False False None', output.stderr)
+
+    def run_entry_point(self, args, seconds=3):
+        """returns the output of the game run with args, or None if it was still running after seconds, ie, it didn't
+        crash before its start screen"""
+        game_process = subprocess.Popen([sys.executable] + args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+                                        env=dict(os.environ, SDL_VIDEODRIVER='dummy'))
+        try:
+            return game_process.communicate(timeout=seconds)
+        except subprocess.TimeoutExpired:
+            game_process.kill()
+            game_process.communicate()
+            return None
+
+    def test_entry_points_show_start_screen(self):
+        for entry_point in ('bootstrap.py', 'game.py'):
+            self.assertIsNone(self.run_entry_point([entry_point]), entry_point)
+
+    def test_entry_point_sets_game_settings(self):
+        # run bootstrap.py as the script, like `python bootstrap.py`, with the game replaced by a report of what it sees
+        code = ('import runpy, sys, game\n'
+                'game.run = lambda: print(game.bootstrap.display_surface is not None, game.bootstrap.frame_profile_path,\n'
+                '                         game.bootstrap.record_path)\n'
+                'sys.argv = ["bootstrap.py", "--frame-profile", "frames.json", "--record", "match.tdrp"]\n'
+                'runpy.run_path("bootstrap.py", run_name="__main__")')
+
+        stdout, stderr = self.run_entry_point(['-c', code])
+
+        self.assertEqual(stdout.strip().splitlines()[-1], 'True frames.json match.tdrp', stderr)
+
+    def test_profile_imports(self):
+        import_times = bootstrap.profile_imports('tower')
+        modules = [module for module, self_time, cumulative in import_times]
+
+        self.assertIn('tower', modules)
+        self.assertIn('bullet', modules)
+        self_times = [self_time for module, self_time, cumulative in import_times]
+        self.assertEqual(self_times, sorted(self_times, reverse=True))
+        for module, self_time, cumulative in import_times:
+            self.assertLessEqual(self_time, cumulative)
+
+    def test_profile_imports_of_missing_module(self):
+        with self.assertRaises(RuntimeError):
+            bootstrap.profile_imports('not_a_module')
+
+
+if __name__ == '__main__':
+    unittest.main()
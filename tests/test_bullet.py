@@ -99,6 +99,39 @@ class TestBullet(TestCase):
 
 
 
+class TestBulletExpiry(TestCase):
+    def test_update_moves_while_frames_remain(self):
+        b = bullet.create_bullet(bullet.STANDARD_BULLET, (0, 0), (50, 0), 1, Mock())
+        group = pygame.sprite.Group(b)
+        self.assertEqual(b.frames_remaining_until_self_destroy, 2.5)
+
+        # the last of the fractional frames still moves
+        for expected_centerx in (20, 40, 60):
+            b.update()
+            self.assertEqual(b.rect.centerx, expected_centerx)
+            self.assertTrue(b.alive())
+        self.assertEqual(b.frames_remaining_until_self_destroy, -0.5)
+
+        b.update()
+        self.assertEqual(b.rect.centerx, 60)
+        self.assertFalse(b.alive())
+        self.assertEqual(len(group), 0)
+
+    def test_update_kills_at_zero_frames(self):
+        b = bullet.create_bullet(bullet.STANDARD_BULLET, (0, 0), (40, 0), 1, Mock())
+        group = pygame.sprite.Group(b)
+
+        b.update()
+        b.update()
+        self.assertEqual(b.frames_remaining_until_self_destroy, 0)
+        self.assertTrue(b.alive())
+
+        b.update()
+        self.assertEqual(b.rect.centerx, 40)
+        self.assertFalse(b.alive())
+        self.assertEqual(len(group), 0)
+
+
 class TestStandardBullet(TestCase):
 
     @patch.object(pygame.sprite.Sprite, 'kill')
@@ -0,0 +1,102 @@
+import unittest
+from unittest import TestCase
+
+import bullet
+import bullet_pool
+import pygame
+
+
+def make_bullet(bullet_type=bullet.STANDARD_BULLET, start=(0, 0), destination=(50, 0), recycled_bullets=None):
+    return bullet.create_bullet(bullet_type, start, destination, 1, lambda: None, recycled_bullets)
+
+
+class TestBulletPool(TestCase):
+    def setUp(self):
+        self.pool = bullet_pool.BulletPool(capacity=2)
+
+    def test_add_copies_values_into_arrays(self):
+        b = make_bullet(start=(10, 20), destination=(50, 50))
+        self.pool.add(b)
+
+        slot = b.pool_slot
+        self.assertTrue(self.pool.is_live[slot])
+        self.assertEqual((self.pool.x[slot], self.pool.y[slot]), (10, 20))
+        self.assertEqual(self.pool.frames_remaining[slot], 2.5)
+        self.assertEqual(self.pool.step_x[slot], 16)
+        self.assertEqual(self.pool.step_y[slot], 12)
+
+    def test_add_past_capacity(self):
+        bullets = [make_bullet() for _ in range(5)]
+        self.pool.add(bullets)
+
+        self.assertEqual(len(self.pool), 5)
+        self.assertEqual(self.pool.capacity, 8)
+        self.assertEqual(sorted(b.pool_slot for b in bullets), [0, 1, 2, 3, 4])
+
+    def test_update_matches_bullet_update(self):
+        pooled_bullet = make_bullet(start=(3, 7), destination=(41, -25))
+        plain_bullet = make_bullet(start=(3, 7), destination=(41, -25))
+        self.pool.add(pooled_bullet)
+        plain_group = pygame.sprite.Group(plain_bullet)
+
+        for _ in range(5):
+            self.pool.update()
+            plain_group.update()
+            self.assertEqual(pooled_bullet.alive(), plain_bullet.alive())
+            self.assertEqual(pooled_bullet.rect.center, plain_bullet.rect.center)
+
+    def test_update_kills_and_recycles_expired_bullets(self):
+        b = make_bullet(start=(0, 0), destination=(20, 0))
+        self.pool.add(b)
+
+        self.pool.update()
+        self.assertTrue(b.alive())
+        self.pool.update()
+
+        self.assertFalse(b.alive())
+        self.assertEqual(len(self.pool), 0)
+        self.assertIn(b, self.pool.recycled_bullets[bullet.STANDARD_BULLET])
+
+    def test_create_bullet_reuses_recycled_bullet(self):
+        b = make_bullet()
+        self.pool.add(b)
+        b.kill()
+        self.pool.update()
+
+        reused_bullet = make_bullet(start=(100, 100), destination=(100, 140), recycled_bullets=self.pool.recycled_bullets)
+
+        self.assertIs(reused_bullet, b)
+        self.assertEqual(reused_bullet.rect.center, (100, 100))
+        self.assertEqual(reused_bullet.frames_remaining_until_self_destroy, 2)
+
+    def test_killed_bullet_is_not_recycled_before_update(self):
+        b = make_bullet()
+        self.pool.add(b)
+        b.kill()
+
+        self.assertEqual(self.pool.recycled_bullets[bullet.STANDARD_BULLET], [])
+
+    def test_recycled_bullets_are_capped_at_capacity(self):
+        for _ in range(2):
+            bullets = [make_bullet(), make_bullet(bullet.EXPLOSION_BULLET)]
+            self.pool.add(bullets)
+            for b in bullets:
+                b.kill()
+            self.pool.update()
+
+        self.assertEqual(sum(len(recycled) for recycled in self.pool.recycled_bullets.values()), self.pool.capacity)
+
+    def test_pools_do_not_share_recycled_bullets(self):
+        b = make_bullet()
+        self.pool.add(b)
+        b.kill()
+        self.pool.update()
+
+        other_pool = bullet_pool.BulletPool()
+        new_bullet = make_bullet(recycled_bullets=other_pool.recycled_bullets)
+
+        self.assertIsNot(new_bullet, b)
+
+
+if __name__ == '__main__':
+    unittest.main()
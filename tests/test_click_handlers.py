@@ -0,0 +1,79 @@
+import unittest
+from unittest import TestCase
+
+import click_handlers
+import simulation
+import sprite_groups
+import tower
+import icon
+import level
+import path
+
+
+class OneBalloonLevel(level.Level):
+    def __init__(self, number_representing_balloon=1):
+        super().__init__([number_representing_balloon], path.Path())
+
+
+class TestClickHandlers(TestCase):
+    def setUp(self):
+        self.match = simulation.Simulation([OneBalloonLevel()], use_own_sprite_groups=True)
+        self.tower = self.match.place_tower(tower.LINEAR_TOWER, (150, 150))
+        self.handler = click_handlers.create_click_handlers(self.match)
+
+    def tearDown(self):
+        sprite_groups.upgrade_icon_sprites.empty()
+        sprite_groups.sell_tower_icon_sprite.empty()
+        sprite_groups.selected_tower_icon_sprite.empty()
+
+    def test_upgrade_icon_click_queues_upgrade(self):
+        self.tower.on_click(sprite_groups.upgrade_icon_sprites, sprite_groups.sell_tower_icon_sprite)
+        sell_price = self.tower.sell_price
+
+        click_handlers.handle_left_mouse_click(self.handler, (100, 350))  # the speed upgrade icon
+        self.assertEqual(self.tower.sell_price, sell_price)  # bought at the next tick, not right away
+        self.match.step()
+
+        self.assertEqual(self.tower.sell_price, sell_price + 10)
+        self.assertEqual(self.tower._speed_upgrade_values_and_prices_and_icons.next_upgrade_index, 1)
+
+    def test_sell_icon_click_queues_sale(self):
+        self.tower.on_click(sprite_groups.upgrade_icon_sprites, sprite_groups.sell_tower_icon_sprite)
+
+        click_handlers.handle_left_mouse_click(self.handler, (50, 375))  # the sell icon
+        self.assertTrue(self.tower.alive())
+        self.match.step()
+
+        self.assertFalse(self.tower.alive())
+        self.assertEqual(len(sprite_groups.sell_tower_icon_sprite), 0)
+
+    def test_selected_tower_icon_click_queues_new_tower(self):
+        sprite_groups.selected_tower_icon_sprite.add(icon.create_tower_icon(icon.EXPLOSION_TOWER_ICON, (0, 0)))
+
+        click_handlers.handle_left_mouse_click(self.handler, (250, 150))
+        self.match.step()
+
+        new_tower = self.match.get_tower_at((250, 150))
+        self.assertEqual(new_tower.tower_type, tower.EXPLOSION_TOWER)
+        self.assertEqual(len(sprite_groups.selected_tower_icon_sprite), 0)
+
+
+class TestIcons(TestCase):
+    def test_icons_know_their_tower_and_upgrade(self):
+        match = simulation.Simulation([OneBalloonLevel()], use_own_sprite_groups=True)
+        new_tower = match.place_tower(tower.LINEAR_TOWER, (150, 150))
+        upgrade_icons = sprite_groups.upgrade_icon_sprites
+        sell_icon = sprite_groups.sell_tower_icon_sprite
+        new_tower.on_click(upgrade_icons, sell_icon)
+
+        self.assertEqual(sorted(upgrade_icon.upgrade for upgrade_icon in upgrade_icons),
+                         sorted(simulation.UPGRADES))
+        self.assertTrue(all(upgrade_icon.tower is new_tower for upgrade_icon in upgrade_icons))
+        self.assertIs(sell_icon.sprite.tower, new_tower)
+
+        upgrade_icons.empty()
+        sell_icon.empty()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+from unittest import TestCase
+
+import collision
+import bullet
+import pygame
+
+
+def make_bullet(position):
+    return bullet.create_bullet(bullet.STANDARD_BULLET, position, (position[0] + 100, position[1]), 1, lambda: None)
+
+
+class TestBulletSpatialHash(TestCase):
+    def setUp(self):
+        self.bullet_sprites = pygame.sprite.Group()
+        self.bullet_hash = collision.BulletSpatialHash(cell_size=32)
+
+    def test_find_collided_bullets_matches_spritecollide(self):
+        bullets = [make_bullet((x, y)) for x in range(0, 200, 15) for y in range(0, 200, 15)]
+        self.bullet_sprites.add(bullets)
+        self.bullet_hash.build(self.bullet_sprites)
+
+        for rect in [pygame.Rect(40, 40, 30, 30), pygame.Rect(-20, -20, 30, 30), pygame.Rect(500, 500, 30, 30)]:
+            sprite = pygame.sprite.Sprite()
+            sprite.rect = rect
+            self.assertEqual(self.bullet_hash.find_collided_bullets(rect),
+                             pygame.sprite.spritecollide(sprite, self.bullet_sprites, False))
+
+    def test_find_collided_bullets_ignores_killed_bullets(self):
+        hit_bullet = make_bullet((50, 50))
+        self.bullet_sprites.add(hit_bullet)
+        self.bullet_hash.build(self.bullet_sprites)
+
+        hit_bullet.kill()
+
+        self.assertEqual(self.bullet_hash.find_collided_bullets(pygame.Rect(40, 40, 30, 30)), [])
+
+    def test_add_after_build(self):
+        self.bullet_hash.build(self.bullet_sprites)
+        new_bullet = make_bullet((50, 50))
+        self.bullet_sprites.add(new_bullet)
+
+        self.bullet_hash.add([new_bullet])
+
+        self.assertEqual(self.bullet_hash.find_collided_bullets(pygame.Rect(40, 40, 30, 30)), [new_bullet])
+
+    def test_bullet_in_several_cells_is_returned_once(self):
+        straddling_bullet = make_bullet((32, 32))
+        self.bullet_sprites.add(straddling_bullet)
+        self.bullet_hash.build(self.bullet_sprites)
+
+        self.assertEqual(self.bullet_hash.find_collided_bullets(pygame.Rect(0, 0, 64, 64)), [straddling_bullet])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+from unittest import TestCase
+
+import evaluator
+import level
+import path
+import tower
+import bank
+import life_point
+
+
+class OneBalloonLevel(level.Level):
+    def __init__(self, number_representing_balloon=1):
+        super().__init__([number_representing_balloon], path.Path())
+
+
+class TestEvaluatorModule(TestCase):
+    def test_evaluate_layout_without_towers(self):
+        wave = OneBalloonLevel()
+
+        result = evaluator.evaluate_layout([], wave)
+
+        self.assertEqual(result.lives_lost, 1)
+        self.assertEqual(result.pop_counts, [])
+        self.assertEqual(result.bank_curve, [bank.STARTING_BALANCE] * (result.frame_count + 1))
+        self.assertEqual(result.life_curve[-1], life_point.STARTING_LIFE_BALANCE - 1)
+        self.assertTrue(result.is_won)
+        self.assertEqual(wave.numbers_representing_balloons, [1])
+
+    def test_evaluate_layout_with_tower(self):
+        result = evaluator.evaluate_layout([(tower.LINEAR_TOWER, (130, 150))], OneBalloonLevel(3))
+
+        self.assertEqual(result.pop_counts, [3])
+        self.assertEqual(result.lives_lost, 0)
+        self.assertGreater(result.bank_curve[-1], result.bank_curve[0])
+
+    def test_evaluate_layout_with_unaffordable_tower(self):
+        layout = [(tower.LINEAR_TOWER, (130, 150), (1, 1, 1))] + [(tower.LINEAR_TOWER, (130, 200))] * 10
+
+        result = evaluator.evaluate_layout(layout, OneBalloonLevel())
+
+        self.assertIsNone(result.pop_counts[-1])
+        self.assertGreaterEqual(result.bank_curve[0], 0)
+
+    def test_evaluate_layouts_in_processes_matches_in_process(self):
+        layouts = [[], [(tower.LINEAR_TOWER, (130, 150))], [(tower.THREE_SIXTY_TOWER, (150, 100), (0, 0, 1))]]
+        wave = OneBalloonLevel(4)
+
+        in_process = evaluator.evaluate_layouts(layouts, wave, max_workers=1)
+        in_processes = evaluator.evaluate_layouts(layouts, wave, max_workers=2)
+
+        for expected, actual in zip(in_process, in_processes):
+            self.assertEqual(actual.layout, expected.layout)
+            self.assertEqual(actual.pop_counts, expected.pop_counts)
+            self.assertEqual(actual.bank_curve, expected.bank_curve)
+            self.assertEqual(actual.life_curve, expected.life_curve)
+
+
+if __name__ == '__main__':
+    unittest.main()
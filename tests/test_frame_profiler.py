@@ -0,0 +1,105 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import TestCase
+
+import frame_profiler
+import simulation
+import level
+import tower
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestFrameProfiler(TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.profiler = frame_profiler.FrameProfiler(window_size=100, clock=self.clock)
+
+    def play_frame(self, tower_update_seconds, display_update_seconds):
+        self.profiler.begin_frame()
+        self.clock.now += tower_update_seconds
+        self.profiler.lap(frame_profiler.TOWER_UPDATE)
+        self.clock.now += display_update_seconds
+        self.profiler.lap(frame_profiler.DISPLAY_UPDATE)
+        self.profiler.end_frame()
+
+    def test_get_percentiles(self):
+        for i in range(1, 101):
+            self.play_frame(i / 1000, 0.001)
+
+        p50, p95, p99 = self.profiler.get_percentiles(frame_profiler.TOWER_UPDATE)
+        self.assertAlmostEqual(p50, 0.050)
+        self.assertAlmostEqual(p95, 0.095)
+        self.assertAlmostEqual(p99, 0.099)
+        self.assertAlmostEqual(self.profiler.get_percentiles(frame_profiler.FRAME, (100,))[0], 0.101)
+        self.assertEqual(self.profiler.frame_count, 100)
+
+    def test_get_percentiles_of_unmeasured_phase(self):
+        self.assertEqual(self.profiler.get_percentiles(frame_profiler.IDLE), [0.0, 0.0, 0.0])
+
+    def test_percentiles_are_rolling(self):
+        for _ in range(100):
+            self.play_frame(1.0, 0.0)
+        for _ in range(100):
+            self.play_frame(0.002, 0.0)
+
+        self.assertAlmostEqual(self.profiler.get_percentiles(frame_profiler.TOWER_UPDATE, (100,))[0], 0.002)
+
+    def test_lap_adds_up_within_a_frame(self):
+        self.profiler.begin_frame()
+        for _ in range(3):
+            self.clock.now += 0.01
+            self.profiler.lap(frame_profiler.TOWER_UPDATE)
+        self.profiler.end_frame()
+
+        self.assertAlmostEqual(self.profiler.get_percentiles(frame_profiler.TOWER_UPDATE, (50,))[0], 0.03)
+
+    def test_get_summary_and_overlay_lines(self):
+        self.play_frame(0.004, 0.002)
+        summary = self.profiler.get_summary()
+
+        self.assertEqual(summary['frame_count'], 1)
+        self.assertEqual(list(summary['phases']), [frame_profiler.TOWER_UPDATE, frame_profiler.DISPLAY_UPDATE,
+                                                   frame_profiler.FRAME])
+        self.assertEqual(summary['phases'][frame_profiler.TOWER_UPDATE], {'p50': 4.0, 'p95': 4.0, 'p99': 4.0, 'max': 4.0})
+        self.assertEqual(self.profiler.get_overlay_lines()[0], 'tower_update 4.0 / 4.0 / 4.0 ms')
+
+    def test_periodic_dump(self):
+        with tempfile.TemporaryDirectory() as directory:
+            dump_path = os.path.join(directory, 'frames.json')
+            profiler = frame_profiler.FrameProfiler(dump_path=dump_path, dump_interval=10, clock=self.clock)
+
+            profiler.begin_frame()
+            profiler.end_frame()
+            self.assertFalse(os.path.exists(dump_path))
+
+            self.clock.now += 10
+            profiler.begin_frame()
+            profiler.end_frame()
+            with open(dump_path) as dump_file:
+                self.assertEqual(json.load(dump_file)['frame_count'], 2)
+
+    def test_simulation_laps(self):
+        profiler = frame_profiler.FrameProfiler()
+        match = simulation.Simulation([level.Level1()], use_own_sprite_groups=True, profiler=profiler)
+        match.place_tower(tower.LINEAR_TOWER, (130, 100))
+
+        profiler.begin_frame()
+        match.step(5)
+        profiler.end_frame()
+
+        for phase in (frame_profiler.SPAWN, frame_profiler.TOWER_UPDATE, frame_profiler.BALLOON_UPDATE,
+                      frame_profiler.BULLET_UPDATE):
+            self.assertIn(phase, profiler.get_summary()['phases'])
+
+
+if __name__ == '__main__':
+    unittest.main()
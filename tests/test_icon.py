@@ -56,7 +56,7 @@ class TestLinearTowerIcon(unittest.TestCase):
 
         i = icon.LinearTowerIcon(colour, position, dimension)
 
-        self.assertEqual(i._tower_type, tower.LINEAR_TOWER)
+        self.assertEqual(i.tower_type, tower.LINEAR_TOWER)
 
     def test_on_left_mouse_button(self):
         colour = colours.GREEN
@@ -87,7 +87,7 @@ class TestThreeSixtyTowerIcon(unittest.TestCase):
         self.i = icon.ThreeSixtyTowerIcon(self.colour, self.position, self.dimension)
 
     def test_init(self):
-        self.assertEqual(self.i._tower_type, tower.THREE_SIXTY_TOWER)
+        self.assertEqual(self.i.tower_type, tower.THREE_SIXTY_TOWER)
 
     def test_on_left_mouse_button(self):
         self.i.on_click()
@@ -108,7 +108,7 @@ class TestExplosionTowerIcon(unittest.TestCase):
         self.i = icon.ExplosionTowerIcon(self.colour, self.position, self.dimension)
 
     def test_init(self):
-        self.assertEqual(self.i._tower_type, tower.EXPLOSION_TOWER)
+        self.assertEqual(self.i.tower_type, tower.EXPLOSION_TOWER)
 
     def test_on_left_mouse_button(self):
         self.i.on_click()
@@ -129,7 +129,7 @@ class TestTeleportationTowerIcon(unittest.TestCase):
         self.i = icon.TeleportationTowerIcon(self.colour, self.position, self.dimension)
 
     def test_init(self):
-        self.assertEqual(self.i._tower_type, tower.TELEPORTATION_TOWER)
+        self.assertEqual(self.i.tower_type, tower.TELEPORTATION_TOWER)
 
     def test_on_left_mouse_button(self):
         self.i.on_click()
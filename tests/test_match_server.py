@@ -0,0 +1,143 @@
+import unittest
+from unittest import TestCase
+import time
+import threading
+
+import match_server
+import network
+import protocol
+import tower
+import bank
+import life_point
+import level
+import path
+
+
+class OneBalloonLevel(level.Level):
+    def __init__(self, number_representing_balloon=1):
+        super().__init__([number_representing_balloon], path.Path())
+
+
+class TestMatch(TestCase):
+    def test_matches_have_their_own_balance(self):
+        first_match = match_server.Match(1, [OneBalloonLevel()], [(tower.LINEAR_TOWER, (150, 150))])
+        second_match = match_server.Match(2, [OneBalloonLevel()])
+
+        self.assertEqual(len(first_match.simulation.tower_sprites), 1)
+        self.assertEqual(len(second_match.simulation.tower_sprites), 0)
+        self.assertLess(first_match.simulation.bank.balance, bank.STARTING_BALANCE)
+        self.assertEqual(second_match.simulation.bank.balance, bank.STARTING_BALANCE)
+
+    def test_step_returns_changes_of_the_match_only(self):
+        first_match = match_server.Match(1, [OneBalloonLevel()])
+        second_match = match_server.Match(2, [OneBalloonLevel()])
+        first_match.spawn_balloon(1)
+        second_match.simulation.life_point.life_balance = 100
+
+        messages = b''
+        for _ in range(len(path.Path())):
+            messages += first_match.step()
+            self.assertEqual(second_match.step(), b'')
+
+        self.assertEqual(protocol.StreamDecoder().feed(messages),
+                         [(protocol.LIFEPOINT, life_point.STARTING_LIFE_BALANCE - 1)])
+        self.assertEqual(second_match.simulation.life_point.life_balance, 100)
+
+    def test_matches_can_be_stepped_on_threads(self):
+        def play(match, messages):
+            match.spawn_balloon(5)
+            for _ in range(len(path.Path())):
+                messages.append(match.step())
+
+        expected = []
+        play(match_server.Match(1, [OneBalloonLevel()], [(tower.LINEAR_TOWER, (130, 150))]), expected)
+        matches = [match_server.Match(i, [OneBalloonLevel()], [(tower.LINEAR_TOWER, (130, 150))]) for i in range(4)]
+        messages = [[] for _ in matches]
+        threads = [threading.Thread(target=play, args=(match, match_messages))
+                   for match, match_messages in zip(matches, messages)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        decode = lambda match_messages: [message for message in protocol.StreamDecoder().feed(b''.join(match_messages))
+                                         if message[0] != protocol.UPDATE_TOWER]  # the tower ids differ
+        for match, match_messages in zip(matches, messages):
+            self.assertEqual(decode(match_messages), decode(expected))
+            self.assertEqual(match.simulation.bank.balance, matches[0].simulation.bank.balance)
+
+    def test_spawn_balloon_with_invalid_number_of_layers(self):
+        match = match_server.Match(1, [OneBalloonLevel()])
+
+        self.assertFalse(match.spawn_balloon(9))
+        self.assertEqual(len(match.simulation.balloon_sprites), 0)
+
+    def test_get_full_state_message(self):
+        match = match_server.Match(1, [OneBalloonLevel()], [(tower.LINEAR_TOWER, (150, 150))])
+        linear_tower = match.simulation.tower_sprites.sprites()[0]
+
+        self.assertEqual(protocol.StreamDecoder().feed(match.get_full_state_message()),
+                         [(protocol.LIFEPOINT, life_point.STARTING_LIFE_BALANCE),
+                          (protocol.BANK_BALANCE, bank.STARTING_BALANCE - linear_tower.buy_price),
+                          (protocol.CREATE_TOWER, id(linear_tower), tower.LINEAR_TOWER, 10, 50, 1, 150, 150)])
+
+
+class TestMatchServer(TestCase):
+    def setUp(self):
+        self.match_server = match_server.MatchServer(port=0, max_matches=2,
+                                                     create_levels=lambda: [OneBalloonLevel()])
+        self.attackers = network.Transport()
+
+    def tearDown(self):
+        self.attackers.shutdown()
+        self.match_server.transport.shutdown()
+
+    def tick_until(self, condition, timeout=5):
+        deadline = time.monotonic() + timeout
+        while not condition() and time.monotonic() < deadline:
+            self.match_server.tick()
+            time.sleep(0.001)
+
+    def test_each_attacker_gets_a_match(self):
+        self.attackers.connect('127.0.0.1', self.match_server.port)
+        self.attackers.connect('127.0.0.1', self.match_server.port)
+
+        self.tick_until(lambda: len(self.match_server.matches) == 2)
+
+        self.assertEqual(len(self.match_server.matches), 2)
+
+    def test_attacker_past_max_matches_is_disconnected(self):
+        connection_ids = [self.attackers.connect('127.0.0.1', self.match_server.port) for _ in range(3)]
+        events = []
+
+        def is_third_attacker_disconnected():
+            events.extend(self.attackers.get_events())
+            return (network.DISCONNECTED, connection_ids[2], None) in events
+
+        self.tick_until(is_third_attacker_disconnected)
+
+        self.assertIn((network.DISCONNECTED, connection_ids[2], None), events)
+        self.assertEqual(len(self.match_server.matches), 2)
+
+    def test_attacker_spawns_balloon_in_its_match(self):
+        connection_id = self.attackers.connect('127.0.0.1', self.match_server.port)
+        self.tick_until(lambda: self.match_server.matches)
+        match = list(self.match_server.matches.values())[0]
+
+        self.attackers.send(connection_id, protocol.encode_spawn_balloon(3))
+        self.tick_until(lambda: match.simulation.balloon_sprites)
+
+        self.assertEqual(len(match.simulation.balloon_sprites), 1)
+
+    def test_match_ends_when_its_attacker_leaves(self):
+        connection_id = self.attackers.connect('127.0.0.1', self.match_server.port)
+        self.tick_until(lambda: self.match_server.matches)
+
+        self.attackers.close(connection_id)
+        self.tick_until(lambda: not self.match_server.matches)
+
+        self.assertEqual(self.match_server.matches, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
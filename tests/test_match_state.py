@@ -0,0 +1,48 @@
+import unittest
+from unittest import TestCase
+
+import match_state
+import message_buffer
+import sprite_groups
+import balloon
+import tower
+import bank
+import life_point
+import path
+
+
+class TestMatchState(TestCase):
+    def test_init(self):
+        messages = message_buffer.MessageBuffer()
+        state = match_state.MatchState(messages)
+
+        self.assertIs(state.messages, messages)
+        self.assertIs(state.bank.messages, state.messages)
+        self.assertIs(state.life_point.messages, state.messages)
+        self.assertEqual(state.bank.balance, bank.STARTING_BALANCE)
+        self.assertEqual(state.life_point.life_balance, life_point.STARTING_LIFE_BALANCE)
+
+    def test_headless_by_default(self):
+        state = match_state.MatchState()
+
+        self.assertIsNone(state.messages)
+        self.assertIsNone(state.bank.messages)
+        self.assertIsNone(state.life_point.messages)
+
+    def test_balloons_and_towers_use_their_match_state(self):
+        state = match_state.MatchState()
+        group = sprite_groups.BalloonGroup(state)
+        b = balloon.create_balloon(balloon.BALLOON_L2, path.Path())
+        group.add(b)
+        linear_tower = tower.create_tower(tower.LINEAR_TOWER, (150, 150), state)
+
+        b.peel_layer(1, linear_tower.increment_pop_count)
+        linear_tower.sell_tower()
+
+        self.assertIs(b.match_state, state)
+        self.assertEqual(state.bank.balance, bank.STARTING_BALANCE + balloon.get_balloon_layer(balloon.BALLOON_L2).bounty +
+                         linear_tower.sell_price)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+import unittest
+from unittest import TestCase
+import threading
+
+import message_buffer
+import protocol
+import tower
+
+
+class TestMessageBufferModule(TestCase):
+    def setUp(self):
+        self.messages = message_buffer.MessageBuffer()
+
+    def test_get_zeroth_message(self):
+        self.messages.push_lifepoint_message(18)
+        self.messages.flush_frame()
+        self.messages.push_bank_balance_message(625)
+        self.messages.flush_frame()
+
+        self.assertEqual(self.messages.get_zeroth_message(), protocol.encode_lifepoint(18))
+        self.assertEqual(self.messages.get_zeroth_message(), protocol.encode_bank_balance(625))
+        self.assertIsNone(self.messages.get_zeroth_message())
+
+    def test_drain_messages(self):
+        self.messages.push_lifepoint_message(18)
+        self.messages.flush_frame()
+        self.messages.push_sell_tower_message(499984651)
+        self.messages.flush_frame()
+
+        self.assertEqual(self.messages.drain_messages(),
+                         [protocol.encode_lifepoint(18), protocol.encode_sell_tower(499984651)])
+        self.assertEqual(len(self.messages.buffer), 0)
+
+    def test_drain_messages_timeout(self):
+        self.assertEqual(self.messages.drain_messages(timeout=0.01), [])
+
+    def test_drain_messages_wakes_up_on_push(self):
+        drained = []
+        t = threading.Thread(target=lambda: drained.extend(self.messages.drain_messages(timeout=5)))
+        t.start()
+
+        self.messages.push_bank_balance_message(100)
+        self.messages.flush_frame()
+        t.join(5)
+
+        self.assertFalse(t.is_alive())
+        self.assertEqual(drained, [protocol.encode_bank_balance(100)])
+
+
+class TestMessageBufferCoalescing(TestCase):
+    def setUp(self):
+        self.messages = message_buffer.MessageBuffer()
+
+    def flush_and_decode(self):
+        self.messages.flush_frame()
+        return protocol.StreamDecoder().feed(b''.join(self.messages.drain_messages(timeout=0)))
+
+    def test_only_latest_value_is_sent(self):
+        for balance in [10, 20, 30]:
+            self.messages.push_bank_balance_message(balance)
+        for pop_count in [1, 2, 3]:
+            self.messages.push_update_tower_pop_count_message(7, pop_count)
+
+        self.assertEqual(self.flush_and_decode(), [(protocol.BANK_BALANCE, 30),
+                                                   (protocol.UPDATE_TOWER, 7, protocol.TOWER_POP_COUNT, 3)])
+
+    def test_unchanged_value_is_not_sent_again(self):
+        self.messages.push_lifepoint_message(18)
+        self.flush_and_decode()
+
+        self.messages.push_lifepoint_message(17)
+        self.messages.push_lifepoint_message(18)
+
+        self.assertEqual(self.flush_and_decode(), [])
+
+    def test_empty_frame_pushes_nothing(self):
+        self.messages.flush_frame()
+
+        self.assertEqual(len(self.messages.buffer), 0)
+
+    def test_create_tower_is_sent_before_its_updates(self):
+        self.messages.push_update_tower_pop_count_message(7, 1)
+        self.messages.push_create_new_tower_message(7, 'LINEAR_TOWER', 10, 50, 1, 150, 160)
+        self.messages.push_update_tower_speed_message(7, 10)
+        self.messages.push_update_tower_radius_message(7, 60)
+
+        self.assertEqual(self.flush_and_decode(), [(protocol.CREATE_TOWER, 7, 'LINEAR_TOWER', 10, 50, 1, 150, 160),
+                                                   (protocol.UPDATE_TOWER, 7, protocol.TOWER_POP_COUNT, 1),
+                                                   (protocol.UPDATE_TOWER, 7, protocol.TOWER_RADIUS, 60)])
+
+    def test_sell_tower_drops_its_pending_values(self):
+        self.messages.push_create_new_tower_message(7, 'LINEAR_TOWER', 10, 50, 1, 150, 160)
+        self.flush_and_decode()
+
+        self.messages.push_update_tower_pop_count_message(7, 4)
+        self.messages.push_sell_tower_message(7)
+        self.messages.push_create_new_tower_message(7, 'LINEAR_TOWER', 10, 50, 1, 150, 160)
+        self.messages.push_update_tower_pop_count_message(7, 1)
+
+        self.assertEqual(self.flush_and_decode(), [(protocol.SELL_TOWER, 7),
+                                                   (protocol.CREATE_TOWER, 7, 'LINEAR_TOWER', 10, 50, 1, 150, 160),
+                                                   (protocol.UPDATE_TOWER, 7, protocol.TOWER_POP_COUNT, 1)])
+
+    def test_encode_full_state(self):
+        new_tower = tower.create_tower(tower.LINEAR_TOWER, (150, 160))
+        new_tower.increment_pop_count(3)
+
+        self.assertEqual(protocol.StreamDecoder().feed(message_buffer.encode_full_state(18, 625, [new_tower])),
+                         [(protocol.LIFEPOINT, 18), (protocol.BANK_BALANCE, 625),
+                          (protocol.CREATE_TOWER, id(new_tower), tower.LINEAR_TOWER, 10, 50, 1, 150, 160),
+                          (protocol.UPDATE_TOWER, id(new_tower), protocol.TOWER_POP_COUNT, 3)])
+
+
+if __name__ == '__main__':
+    unittest.main()
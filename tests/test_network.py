@@ -0,0 +1,80 @@
+import unittest
+from unittest import TestCase
+import time
+
+import network
+import protocol
+
+
+def get_events_until(transport, number_of_events, timeout=5):
+    """returns the next number_of_events events of transport, waiting up to timeout seconds for them"""
+    events = []
+    deadline = time.monotonic() + timeout
+    while len(events) < number_of_events and time.monotonic() < deadline:
+        events.extend(transport.get_events(timeout=deadline - time.monotonic()))
+    return events
+
+
+class TestTransport(TestCase):
+    def setUp(self):
+        self.server_transport = network.Transport()
+        self.client_transport = network.Transport()
+        self.port = self.server_transport.listen('127.0.0.1', 0)
+
+    def tearDown(self):
+        self.client_transport.shutdown()
+        self.server_transport.shutdown()
+
+    def connect(self):
+        """returns the connection_id of the new connection on the client and on the server side"""
+        client_connection_id = self.client_transport.connect('127.0.0.1', self.port)
+        event, server_connection_id, message = get_events_until(self.server_transport, 1)[0]
+        self.assertEqual(event, network.CONNECTED)
+        return client_connection_id, server_connection_id
+
+    def test_get_events_without_events(self):
+        self.assertEqual(self.server_transport.get_events(), [])
+
+    def test_send_both_ways(self):
+        client_connection_id, server_connection_id = self.connect()
+
+        self.client_transport.send(client_connection_id, protocol.encode_spawn_balloon(3))
+        self.server_transport.send(server_connection_id, protocol.encode_lifepoint(18) + protocol.encode_bank_balance(5))
+
+        self.assertEqual(get_events_until(self.server_transport, 1),
+                         [(network.MESSAGE, server_connection_id, (protocol.SPAWN_BALLOON, 3))])
+        self.assertEqual(get_events_until(self.client_transport, 3)[1:],
+                         [(network.MESSAGE, client_connection_id, (protocol.LIFEPOINT, 18)),
+                          (network.MESSAGE, client_connection_id, (protocol.BANK_BALANCE, 5))])
+
+    def test_broadcast_to_many_connections(self):
+        connection_ids = [self.connect()[0] for _ in range(3)]
+        get_events_until(self.client_transport, 3)  # the CONNECTED events
+
+        self.server_transport.broadcast(protocol.encode_lifepoint(7))
+
+        events = get_events_until(self.client_transport, 3)
+        self.assertEqual(sorted(connection_id for event, connection_id, message in events), sorted(connection_ids))
+        self.assertTrue(all(message == (protocol.LIFEPOINT, 7) for event, connection_id, message in events))
+
+    def test_close_writes_queued_messages_first(self):
+        client_connection_id, server_connection_id = self.connect()
+        get_events_until(self.client_transport, 1)
+
+        for lifepoint in range(50):
+            self.server_transport.send(server_connection_id, protocol.encode_lifepoint(lifepoint))
+        self.server_transport.close(server_connection_id)
+
+        events = get_events_until(self.client_transport, 51)
+        self.assertEqual([message for event, connection_id, message in events[:50]],
+                         [(protocol.LIFEPOINT, lifepoint) for lifepoint in range(50)])
+        self.assertEqual(events[50], (network.DISCONNECTED, client_connection_id, None))
+
+    def test_send_to_unknown_connection_is_dropped(self):
+        self.server_transport.send(12345, protocol.encode_lifepoint(1))
+
+        self.assertEqual(self.server_transport.get_events(timeout=0.05), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
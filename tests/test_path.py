@@ -3,6 +3,12 @@ from unittest import TestCase
 from unittest.mock import patch
 from unittest.mock import Mock
 
+import copy
+import pickle
+
+import numpy as np
+import pygame
+
 import path
 
 class TestPath(TestCase):
@@ -39,4 +45,73 @@ class TestPath(TestCase):
         p = path.Path()
         return_value = p[2:5]
 
-        self.assertEqual(return_value, [(100, 32), (100, 33), (100, 34) ])
\ No newline at end of file
+        self.assertEqual(return_value, [(100, 32), (100, 33), (100, 34) ])
+
+class TestRoundLikeRect(TestCase):
+    def test_rounds_like_rect(self):
+        values = [-2.5, -1.4, -0.5, 0.4, 0.5, 1.5, 2.6]
+        rect = pygame.Rect(0, 0, 1, 1)
+        expected = []
+        for value in values:
+            rect.x = value
+            expected.append(rect.x)
+
+        self.assertEqual(path.round_like_rect(np.array(values)).tolist(), expected)
+
+
+class TestPathTables(TestCase):
+    def test_polyline_is_sampled_by_arc_length(self):
+        p = path.Path(waypoints=((0, 0), (3, 0), (3, 4)))
+
+        self.assertEqual(p.length, 7)
+        self.assertEqual(p.cumulative_lengths.tolist(), [0, 3, 7])
+        self.assertEqual(p.points, [(0, 0), (1, 0), (2, 0), (3, 0), (3, 1), (3, 2), (3, 3), (3, 4)])
+
+    def test_spacing(self):
+        p = path.Path(spacing=10)
+
+        self.assertEqual(len(p), 33)
+        self.assertEqual(p[1], (100, 40))
+
+    def test_get_position(self):
+        p = path.Path()
+
+        self.assertEqual(p.get_position(5), (100, 35))
+        self.assertEqual(p.get_position(5.25), (100, 35.25))
+
+    def test_get_positions_matches_get_position(self):
+        p = path.Path(waypoints=((0, 0), (30, 0), (30, 40), (100, 40)))
+        path_positions = [0, 1.5, 29.75, 30.5, 64.2, len(p) - 1]
+
+        x, y = p.get_positions(path_positions)
+
+        self.assertEqual(list(zip(x.tolist(), y.tolist())), [p.get_position(pos) for pos in path_positions])
+
+    def test_tables_are_read_only(self):
+        p = path.Path()
+
+        self.assertRaises(ValueError, p.x.__setitem__, 0, 5)
+
+
+class TestPathRegistry(TestCase):
+    def test_get_path_is_shared(self):
+        self.assertIs(path.get_path(path.DEFAULT_PATH), path.get_path())
+        self.assertEqual(path.get_path().points, path.Path().points)
+
+    def test_get_unregistered_path(self):
+        self.assertRaises(NotImplementedError, path.get_path, 'UNREGISTERED_PATH')
+
+    def test_register_path(self):
+        registered_path = path.register_path('TEST_L_PATH', [(0, 0), (3, 0), (3, 4)])
+
+        self.assertEqual(registered_path.path_id, 'TEST_L_PATH')
+        self.assertIs(path.get_path('TEST_L_PATH'), registered_path)
+        self.assertIs(path.register_path('TEST_L_PATH', [(0, 0), (3, 0), (3, 4)]), registered_path)
+        self.assertRaises(ValueError, path.register_path, 'TEST_L_PATH', [(0, 0), (5, 0)])
+
+    def test_copies_of_registered_path_are_shared(self):
+        registered_path = path.get_path()
+
+        self.assertIs(copy.deepcopy(registered_path), registered_path)
+        self.assertIs(pickle.loads(pickle.dumps(registered_path)), registered_path)
+        self.assertIsNot(copy.deepcopy(path.Path()), registered_path)
@@ -0,0 +1,30 @@
+import subprocess
+import sys
+import unittest
+from unittest import TestCase
+from unittest.mock import Mock
+
+import plotting_and_ML
+
+
+class TestPlottingAndMLModule(TestCase):
+    def test_import_does_not_load_matplotlib_or_sklearn(self):
+        # a fresh interpreter, since another test may already have imported them
+        code = ('import sys, client, plotting_and_ML; '
+                'print(any(name.split(".")[0] in ("matplotlib", "sklearn") for name in sys.modules))')
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                                env={'SDL_VIDEODRIVER': 'dummy', 'SDL_AUDIODRIVER': 'dummy', 'PATH': ''})
+
+        self.assertEqual(output.stdout.strip().splitlines()[-1], 'False', output.stderr)
+
+    def test_set_up_values(self):
+        tower_stat = Mock(x_pos=100, y_pos=200, pop_count=7)
+        plotting_and_ML.set_up_values({1: tower_stat})
+
+        self.assertEqual(plotting_and_ML.x_pos, [0, 100])
+        self.assertEqual(plotting_and_ML.y_pos, [0, 200])
+        self.assertEqual(plotting_and_ML.dz, [0, 7])
+
+
+if __name__ == '__main__':
+    unittest.main()
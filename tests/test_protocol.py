@@ -0,0 +1,52 @@
+import unittest
+from unittest import TestCase
+
+import protocol
+
+
+class TestProtocolModule(TestCase):
+    def test_round_trip(self):
+        messages = [(protocol.encode_lifepoint(18), (protocol.LIFEPOINT, 18)),
+                    (protocol.encode_bank_balance(-5), (protocol.BANK_BALANCE, -5)),
+                    (protocol.encode_create_tower(140234567890123, 'LINEAR_TOWER', 10, 50, 1, 150, 160),
+                     (protocol.CREATE_TOWER, 140234567890123, 'LINEAR_TOWER', 10, 50, 1, 150, 160)),
+                    (protocol.encode_update_tower(499984651, protocol.TOWER_POP_COUNT, 7),
+                     (protocol.UPDATE_TOWER, 499984651, protocol.TOWER_POP_COUNT, 7)),
+                    (protocol.encode_sell_tower(499984651), (protocol.SELL_TOWER, 499984651)),
+                    (protocol.encode_spawn_balloon(3), (protocol.SPAWN_BALLOON, 3))]
+
+        for encoded, decoded in messages:
+            self.assertEqual(protocol.StreamDecoder().feed(encoded), [decoded])
+
+    def test_update_tower_invalid_field(self):
+        self.assertRaises(AssertionError, protocol.encode_update_tower, 499984651, 'x', 2)
+
+
+class TestStreamDecoder(TestCase):
+    def setUp(self):
+        self.decoder = protocol.StreamDecoder()
+
+    def test_several_messages_in_one_chunk(self):
+        data = protocol.encode_bank_balance(12) + protocol.encode_bank_balance(15) + protocol.encode_lifepoint(17)
+
+        self.assertEqual(self.decoder.feed(data),
+                         [(protocol.BANK_BALANCE, 12), (protocol.BANK_BALANCE, 15), (protocol.LIFEPOINT, 17)])
+
+    def test_message_split_across_chunks(self):
+        data = protocol.encode_create_tower(1, 'THREE_SIXTY_TOWER', 10, 50, 1, 150, 160) + protocol.encode_lifepoint(3)
+
+        messages = []
+        for i in range(len(data)):
+            messages.extend(self.decoder.feed(data[i:i + 1]))
+
+        self.assertEqual(messages, [(protocol.CREATE_TOWER, 1, 'THREE_SIXTY_TOWER', 10, 50, 1, 150, 160),
+                                    (protocol.LIFEPOINT, 3)])
+
+    def test_invalid_message_is_skipped(self):
+        data = b'\x00\x02\xff\x00' + protocol.encode_lifepoint(3)
+
+        self.assertEqual(self.decoder.feed(data), [(protocol.LIFEPOINT, 3)])
+
+
+if __name__ == '__main__':
+    unittest.main()
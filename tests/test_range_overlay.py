@@ -0,0 +1,91 @@
+import unittest
+from unittest import TestCase
+from unittest.mock import Mock
+
+import pygame
+
+import range_overlay
+import colours
+import surface_cache
+
+
+class FakeTower(pygame.sprite.Sprite):
+    def __init__(self, position, radius):
+        super().__init__()
+        self.image = surface_cache.get_filled_surface(colours.YELLOW, (10, 10))
+        self.rect = self.image.get_rect(center=position)
+        self._attack_values = Mock(radius=radius)
+
+
+class TestRangeOverlayModule(TestCase):
+    def setUp(self):
+        range_overlay.clear()
+
+    def test_get_circle_surface_is_shared(self):
+        self.assertIs(range_overlay.get_circle_surface(40), range_overlay.get_circle_surface(40))
+        self.assertIsNot(range_overlay.get_circle_surface(40), range_overlay.get_circle_surface(41))
+
+    def test_get_circle_surface(self):
+        circle_surface = range_overlay.get_circle_surface(40)
+
+        self.assertEqual(circle_surface.get_size(), (82, 82))
+        self.assertEqual(circle_surface.get_colorkey(), range_overlay.TRANSPARENT_COLOUR)
+
+
+class TestRangeOverlay(TestCase):
+    def setUp(self):
+        self.towers = pygame.sprite.Group(FakeTower((100, 100), 40), FakeTower((350, 380), 60))
+        self.overlay = range_overlay.RangeOverlay(self.towers)
+
+    def assertSameSurface(self, first, second):
+        self.assertEqual(pygame.image.tobytes(first, 'RGB'), pygame.image.tobytes(second, 'RGB'))
+
+    def test_draw_matches_drawing_each_circle(self):
+        self.overlay.update()
+        surface = pygame.Surface((400, 400))
+        self.overlay.draw(surface)
+
+        expected = pygame.Surface((400, 400))
+        for tow in self.towers:
+            pygame.draw.circle(expected, colours.WHITE, tow.rect.center, tow._attack_values.radius, 1)
+        self.assertSameSurface(surface, expected)
+
+    def test_update_only_when_towers_change(self):
+        self.assertTrue(self.overlay.update())
+        self.assertFalse(self.overlay.update())
+
+        tow = FakeTower((200, 200), 30)
+        self.towers.add(tow)
+        self.assertTrue(self.overlay.update())
+
+        tow._attack_values.radius = 50  # radius upgraded
+        self.assertTrue(self.overlay.update())
+
+        self.towers.remove(tow)  # sold
+        self.assertTrue(self.overlay.update())
+        self.assertFalse(self.overlay.update())
+
+    def test_toggle(self):
+        self.overlay.update()
+        self.overlay.toggle()
+
+        self.assertFalse(self.overlay.is_enabled)
+        self.assertTrue(self.overlay.update())
+        surface = pygame.Surface((400, 400))
+        surface.fill(colours.RED)
+        self.overlay.draw(surface)
+        self.assertEqual(surface.get_at((60, 100)), colours.RED)
+
+        self.overlay.toggle()
+        self.assertTrue(self.overlay.update())
+
+    def test_disabled(self):
+        overlay = range_overlay.RangeOverlay(self.towers, is_enabled=False)
+
+        overlay.update()
+        self.towers.add(FakeTower((200, 200), 30))
+        self.assertFalse(overlay.update())
+
+
+if __name__ == '__main__':
+    unittest.main()
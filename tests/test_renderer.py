@@ -0,0 +1,114 @@
+import unittest
+from unittest import TestCase
+from unittest.mock import Mock
+
+import pygame
+
+import renderer
+import range_overlay
+import colours
+import surface_cache
+import text_cache
+
+
+class Square(pygame.sprite.Sprite):
+    def __init__(self, colour, position):
+        super().__init__()
+        self.image = surface_cache.get_filled_surface(colour, (10, 10))
+        self.rect = self.image.get_rect(topleft=position)
+
+
+class FakeTower(pygame.sprite.Sprite):
+    def __init__(self, position, radius):
+        super().__init__()
+        self.image = surface_cache.get_filled_surface(colours.YELLOW, (10, 10))
+        self.rect = self.image.get_rect(center=position)
+        self._attack_values = Mock(radius=radius)
+
+
+class TestDirtyRectRenderer(TestCase):
+    def setUp(self):
+        self.display_surface = pygame.Surface((400, 400))
+        self.icons = pygame.sprite.Group(Square(colours.BLUE, (300, 100)))
+        self.moving = pygame.sprite.Group()
+        self.dirty_renderer = renderer.DirtyRectRenderer(self.display_surface, [self.icons])
+
+    def draw_full_frame(self, circles=()):
+        """returns what the display would look like if the whole screen was drawn again"""
+        expected = pygame.Surface((400, 400))
+        expected.fill(colours.BLACK)
+        pygame.draw.rect(expected, colours.GRAY, renderer.DASHBOARD_RECT)
+        for center, radius in circles:
+            pygame.draw.circle(expected, colours.WHITE, center, radius, 1)
+        self.icons.draw(expected)
+        self.moving.draw(expected)
+        return expected
+
+    def assertSameSurface(self, first, second):
+        self.assertEqual(pygame.image.tobytes(first, 'RGB'), pygame.image.tobytes(second, 'RGB'))
+
+    def test_first_frame_updates_whole_screen(self):
+        dirty_rects = self.dirty_renderer.draw_frame([self.moving])
+
+        self.assertEqual(dirty_rects, [self.display_surface.get_rect()])
+        self.assertSameSurface(self.display_surface, self.draw_full_frame())
+
+    def test_unchanged_frame_updates_nothing(self):
+        self.moving.add(Square(colours.RED, (50, 50)))
+        self.dirty_renderer.draw_frame([self.moving])
+
+        self.assertEqual(self.dirty_renderer.draw_frame([self.moving]), [])
+
+    def test_moved_sprite_updates_old_and_new_rect(self):
+        square = Square(colours.RED, (50, 50))
+        self.moving.add(square)
+        self.dirty_renderer.draw_frame([self.moving])
+
+        square.rect.move_ip(5, 0)
+        dirty_rects = self.dirty_renderer.draw_frame([self.moving])
+
+        self.assertCountEqual([tuple(rect) for rect in dirty_rects], [(50, 50, 10, 10), (55, 50, 10, 10)])
+        self.assertSameSurface(self.display_surface, self.draw_full_frame())
+
+    def test_matches_full_redraw(self):
+        squares = [Square(colours.RED, (20 * i, 10 * i)) for i in range(10)]
+        self.moving.add(*squares)
+        towers = pygame.sprite.Group(FakeTower((150, 150), 40), FakeTower((290, 310), 25))
+        self.dirty_renderer.range_overlay = range_overlay.RangeOverlay(towers)
+        for frame in range(20):
+            for i, square in enumerate(squares):
+                square.rect.move_ip(i % 3, 2)
+            if frame == 10:
+                self.moving.remove(squares[0])
+                towers.remove(next(iter(towers)))
+            self.dirty_renderer.draw_frame([self.moving])
+
+            self.assertSameSurface(self.display_surface,
+                                   self.draw_full_frame([(tow.rect.center, tow._attack_values.radius) for tow in towers]))
+
+    def test_static_sprite_change_redraws_background(self):
+        self.dirty_renderer.draw_frame([self.moving])
+        next(iter(self.icons)).image = surface_cache.get_filled_surface(colours.ORANGE, (10, 10))
+
+        dirty_rects = self.dirty_renderer.draw_frame([self.moving])
+
+        self.assertEqual(dirty_rects, [self.display_surface.get_rect()])
+        self.assertSameSurface(self.display_surface, self.draw_full_frame())
+
+    def test_unchanged_label_updates_nothing(self):
+        font = text_cache.get_font(15)
+        self.dirty_renderer.draw_frame([self.moving], labels=[(font, 'Life points: 5', colours.WHITE, (300, 30))])
+
+        self.assertEqual(self.dirty_renderer.draw_frame([self.moving], labels=[(font, 'Life points: 5', colours.WHITE, (300, 30))]), [])
+        dirty_rects = self.dirty_renderer.draw_frame([self.moving], labels=[(font, 'Life points: 4', colours.WHITE, (300, 30))])
+        self.assertEqual(len(dirty_rects), 2)
+
+    def test_invalidate(self):
+        self.dirty_renderer.draw_frame([self.moving])
+        self.dirty_renderer.invalidate()
+
+        self.assertEqual(self.dirty_renderer.draw_frame([self.moving]), [self.display_surface.get_rect()])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+import os
+import tempfile
+import unittest
+from unittest import TestCase
+
+import replay
+import simulation
+import level
+import path
+import tower
+
+
+def create_levels():
+    return [level.Level([3, 2, 1] * 5, path.get_path(path.DEFAULT_PATH)),
+            level.Level([4, 4], path.get_path(path.DEFAULT_PATH))]
+
+
+def play_recorded_match(recorder_file_path=None):
+    """returns (InputRecorder, the match's final state), the match is recorded while it's played"""
+    s = simulation.Simulation(create_levels(), use_own_sprite_groups=True, seed=11)
+    recorder = replay.InputRecorder(s, recorder_file_path)
+    s.queue_input(simulation.PLACE_TOWER, tower.LINEAR_TOWER, (130, 100), tick=0)
+    s.queue_input(simulation.UPGRADE_TOWER, (130, 100), simulation.UPGRADE_SPEED, tick=5)
+    s.queue_input(simulation.PLACE_TOWER, tower.EXPLOSION_TOWER, (70, 200), tick=30)
+    s.queue_input(simulation.SPAWN_BALLOON, 5, tick=40)
+    s.queue_input(simulation.SELL_TOWER, (130, 100), tick=60)
+    s.run_until_finished()
+    recorder.close()
+    return recorder, get_state(s)
+
+
+def get_state(s):
+    return (s.tick, s.bank.balance, s.life_point.life_balance, s.random.random(),
+            sorted((tow.rect.center, tow._pop_count) for tow in s.tower_sprites))
+
+
+class TestReplay(TestCase):
+    def test_encode_and_decode(self):
+        encoded = replay.encode_header(-5, create_levels())
+        encoded += replay.encode_input(3, simulation.PLACE_TOWER, (tower.TELEPORTATION_TOWER, (12, 34)))
+        encoded += replay.encode_input(4, simulation.UPGRADE_TOWER, ((12, 34), simulation.UPGRADE_POP_POWER))
+        encoded += replay.encode_input(4, simulation.SELL_TOWER, ((12, 34),))
+        encoded += replay.encode_input(70000, simulation.SPAWN_BALLOON, (2,))
+
+        seed, levels, inputs = replay.decode(encoded)
+
+        self.assertEqual(seed, -5)
+        self.assertEqual(levels, [(path.DEFAULT_PATH, [3, 2, 1] * 5), (path.DEFAULT_PATH, [4, 4])])
+        self.assertEqual(inputs, [(3, simulation.PLACE_TOWER, (tower.TELEPORTATION_TOWER, (12, 34))),
+                                  (4, simulation.UPGRADE_TOWER, ((12, 34), simulation.UPGRADE_POP_POWER)),
+                                  (4, simulation.SELL_TOWER, ((12, 34),)),
+                                  (70000, simulation.SPAWN_BALLOON, (2,))])
+
+    def test_decode_drops_input_cut_off(self):
+        encoded = replay.encode_header(1, create_levels()) + replay.encode_input(3, simulation.SELL_TOWER, ((1, 2),))
+
+        self.assertEqual(len(replay.decode(encoded)[2]), 1)
+        self.assertEqual(replay.decode(encoded[:-1])[2], [])
+
+    def test_encode_invalid_input(self):
+        with self.assertRaises(ValueError):
+            replay.encode_input(3, 'NOT_AN_INPUT', ())
+
+    def test_decode_not_a_replay(self):
+        with self.assertRaises(ValueError):
+            replay.decode(b'not a replay')
+
+    def test_recorder_must_start_at_first_tick(self):
+        s = simulation.Simulation(create_levels(), use_own_sprite_groups=True)
+        s.step()
+
+        with self.assertRaises(AssertionError):
+            replay.InputRecorder(s)
+
+    def test_recorder_records_applied_inputs(self):
+        recorder, _ = play_recorded_match()
+
+        self.assertEqual(recorder.input_count, 5)
+        self.assertEqual([(tick, input_type) for tick, input_type, args in replay.decode(recorder.data)[2]],
+                         [(0, simulation.PLACE_TOWER), (5, simulation.UPGRADE_TOWER), (30, simulation.PLACE_TOWER),
+                          (40, simulation.SPAWN_BALLOON), (60, simulation.SELL_TOWER)])
+
+    def test_play_to_end_plays_the_same_match(self):
+        recorder, state = play_recorded_match()
+
+        match = replay.ReplayPlayer(recorder.data).play_to_end()
+
+        self.assertEqual(get_state(match), state)
+
+    def test_play_to_end_with_balloon_batch_and_bullet_pool(self):
+        recorder, state = play_recorded_match()
+
+        match = replay.ReplayPlayer(recorder.data, use_balloon_batch=True, use_bullet_pool=True).play_to_end()
+
+        self.assertEqual(get_state(match), state)
+
+    def test_seek_forward_and_back(self):
+        recorder, _ = play_recorded_match()
+        player = replay.ReplayPlayer(recorder.data)
+
+        self.assertEqual(player.seek(50).tick, 50)
+        self.assertEqual(len(player.match.tower_sprites), 2)
+        later_state = get_state(player.seek(70))
+        self.assertEqual(len(player.match.tower_sprites), 1)
+
+        self.assertEqual(player.seek(10).tick, 10)
+        self.assertEqual(len(player.match.tower_sprites), 1)
+        self.assertEqual(get_state(player.seek(70)), later_state)
+
+    def test_seek_takes_and_restores_checkpoints(self):
+        recorder, state = play_recorded_match()
+        player = replay.ReplayPlayer(recorder.data, checkpoint_interval=20)
+
+        later_state = get_state(player.seek(70))
+        self.assertEqual(sorted(player.checkpoints), [20, 40, 60])
+
+        first_match = player.match
+        self.assertEqual(player.seek(45).tick, 45)
+        self.assertIs(player.match, first_match)  # restored from the checkpoint at 40, not played again from tick 0
+        self.assertEqual(get_state(player.seek(70)), later_state)
+        self.assertEqual(get_state(player.play_to_end()), state)
+
+    def test_recorded_file(self):
+        file_descriptor, file_path = tempfile.mkstemp()
+        os.close(file_descriptor)
+        try:
+            recorder, state = play_recorded_match(file_path)
+
+            player = replay.ReplayPlayer.load(file_path)
+
+            self.assertEqual(player.last_input_tick, 60)
+            self.assertEqual(get_state(player.play_to_end()), state)
+        finally:
+            os.remove(file_path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+from unittest import TestCase
+
+import server
+import simulation
+import protocol
+import tower
+import network
+import level
+import path
+
+
+class OneBalloonLevel(level.Level):
+    def __init__(self, number_representing_balloon=1):
+        super().__init__([number_representing_balloon], path.Path())
+
+
+class TestServer(TestCase):
+    def test_placed_tower_sends_create_tower(self):
+        match = simulation.Simulation([OneBalloonLevel()], use_own_sprite_groups=True)
+        messages = match.match_state.messages
+        match.on_tower_placed = messages.push_tower_created_message
+        match.queue_input(simulation.PLACE_TOWER, tower.LINEAR_TOWER, (150, 150))
+
+        match.step()
+        messages.flush_frame()
+
+        new_tower, = match.tower_sprites
+        speed, radius, pop_power, _ = new_tower.get_attack_stats()
+        self.assertIn(protocol.encode_create_tower(id(new_tower), tower.LINEAR_TOWER, speed, radius, pop_power, 150, 150),
+                      b''.join(messages.drain_messages(timeout=0)))
+
+
+class FakeTransport:
+    def __init__(self, events):
+        self.events = events
+        self.sent = []
+
+    def get_events(self):
+        events, self.events = self.events, []
+        return events
+
+    def send(self, connection_id, message):
+        self.sent.append((connection_id, message))
+
+
+class TestHandleClientMessages(TestCase):
+    def test_connected_client_gets_full_state(self):
+        match = simulation.Simulation([OneBalloonLevel()], use_own_sprite_groups=True)
+        new_tower = match.place_tower(tower.LINEAR_TOWER, (150, 150))
+        new_tower.increment_pop_count(3)
+        speed, radius, pop_power, _ = new_tower.get_attack_stats()
+        transport = FakeTransport([(network.CONNECTED, 7, None)])
+
+        server.handle_client_messages(transport, match)
+
+        (connection_id, message), = transport.sent
+        self.assertEqual(connection_id, 7)
+        self.assertEqual(message, protocol.encode_lifepoint(match.life_point.life_balance) +
+                         protocol.encode_bank_balance(match.bank.balance) +
+                         protocol.encode_create_tower(id(new_tower), tower.LINEAR_TOWER, speed, radius, pop_power, 150, 150) +
+                         protocol.encode_update_tower(id(new_tower), protocol.TOWER_POP_COUNT, 3))
+
+    def test_spawn_balloon_is_queued(self):
+        match = simulation.Simulation([OneBalloonLevel()], use_own_sprite_groups=True)
+        transport = FakeTransport([(network.MESSAGE, 7, (protocol.SPAWN_BALLOON, 2))])
+
+        server.handle_client_messages(transport, match)
+        match.step()
+
+        self.assertEqual(len(match.balloon_sprites), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
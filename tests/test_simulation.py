@@ -0,0 +1,215 @@
+import unittest
+from unittest import TestCase
+
+import simulation
+import message_buffer
+import level
+import path
+import tower
+import bank
+import life_point
+import sprite_groups
+
+
+class OneBalloonLevel(level.Level):
+    def __init__(self, number_representing_balloon=1):
+        super().__init__([number_representing_balloon], path.Path())
+
+
+class TestSimulation(TestCase):
+    def test_init_resets_state(self):
+        sprite_groups.balloon_sprites.add(OneBalloonLevel().get_next_balloon())
+
+        s = simulation.Simulation([OneBalloonLevel()])
+
+        self.assertEqual(s.bank.balance, bank.STARTING_BALANCE)
+        self.assertEqual(s.life_point.life_balance, life_point.STARTING_LIFE_BALANCE)
+        self.assertEqual(len(sprite_groups.balloon_sprites), 0)
+        self.assertEqual(s.frame_count, 0)
+
+    def test_matches_have_their_own_state(self):
+        s = simulation.Simulation([OneBalloonLevel()], use_own_sprite_groups=True,
+                                  messages=message_buffer.MessageBuffer())
+        other = simulation.Simulation([OneBalloonLevel()], use_own_sprite_groups=True,
+                                      messages=message_buffer.MessageBuffer())
+        s.place_tower(tower.LINEAR_TOWER, (150, 150))
+        s.life_point.decrease(3)
+
+        self.assertLess(s.bank.balance, bank.STARTING_BALANCE)
+        self.assertEqual(other.bank.balance, bank.STARTING_BALANCE)
+        self.assertEqual(other.life_point.life_balance, life_point.STARTING_LIFE_BALANCE)
+        self.assertIsNot(s.match_state.messages, other.match_state.messages)
+
+    def test_headless_match_pushes_no_messages(self):
+        s = simulation.Simulation([OneBalloonLevel()], use_own_sprite_groups=True)
+        linear_tower = s.place_tower(tower.LINEAR_TOWER, (150, 150))
+        linear_tower.upgrade(simulation.UPGRADES[0])
+
+        s.run_until_finished(10000)
+        linear_tower.sell_tower()
+
+        self.assertIsNone(s.match_state.messages)
+        self.assertTrue(s.is_won())
+
+    def test_use_own_sprite_groups(self):
+        sprite_groups.balloon_sprites.empty()
+        s = simulation.Simulation([OneBalloonLevel()], use_own_sprite_groups=True)
+
+        s.step(simulation.FRAMES_BETWEEN_BALLOONS + 1)
+
+        self.assertIsNot(s.balloon_sprites, sprite_groups.balloon_sprites)
+        self.assertEqual(len(s.balloon_sprites), 1)
+        self.assertEqual(len(sprite_groups.balloon_sprites), 0)
+
+    def test_step_adds_balloon_after_countdown(self):
+        s = simulation.Simulation([OneBalloonLevel()])
+
+        s.step(simulation.FRAMES_BETWEEN_BALLOONS)
+        self.assertEqual(len(sprite_groups.balloon_sprites), 0)
+
+        s.step()
+        self.assertEqual(len(sprite_groups.balloon_sprites), 1)
+        self.assertEqual(s.frame_count, simulation.FRAMES_BETWEEN_BALLOONS + 1)
+
+    def test_run_until_finished_when_balloon_passes_through(self):
+        s = simulation.Simulation([OneBalloonLevel()])
+        s.life_point.life_balance = 1
+
+        s.run_until_finished()
+
+        self.assertTrue(s.is_lost())
+        self.assertFalse(s.is_won())
+
+    def test_run_until_finished_when_tower_pops_balloon(self):
+        s = simulation.Simulation([OneBalloonLevel()])
+        s.place_tower(tower.LINEAR_TOWER, (130, 100))
+
+        s.run_until_finished()
+
+        self.assertTrue(s.is_won())
+        self.assertEqual(s.life_point.life_balance, life_point.STARTING_LIFE_BALANCE)
+
+    def test_place_tower_with_enough_money(self):
+        s = simulation.Simulation([OneBalloonLevel()])
+
+        new_tower = s.place_tower(tower.LINEAR_TOWER, (150, 150))
+
+        self.assertIn(new_tower, sprite_groups.tower_sprites)
+        self.assertEqual(s.bank.balance, bank.STARTING_BALANCE - new_tower.buy_price)
+
+    def test_place_tower_without_enough_money(self):
+        s = simulation.Simulation([OneBalloonLevel()])
+        s.bank.balance = 0
+
+        new_tower = s.place_tower(tower.LINEAR_TOWER, (150, 150))
+
+        self.assertIsNone(new_tower)
+        self.assertEqual(len(sprite_groups.tower_sprites), 0)
+
+    def test_queue_input_is_applied_at_its_tick(self):
+        s = simulation.Simulation([OneBalloonLevel()], use_own_sprite_groups=True)
+        s.queue_input(simulation.PLACE_TOWER, tower.LINEAR_TOWER, (150, 150), tick=3)
+        s.queue_input(simulation.SPAWN_BALLOON, 2)
+
+        s.step()
+        self.assertEqual(len(s.balloon_sprites), 1)
+        self.assertEqual(len(s.tower_sprites), 0)
+
+        s.step(2)
+        self.assertEqual(len(s.tower_sprites), 0)
+        s.step()
+        self.assertEqual(len(s.tower_sprites), 1)
+        self.assertEqual(s.tick, 4)
+
+    def test_queue_input_for_a_simulated_tick(self):
+        s = simulation.Simulation([OneBalloonLevel()], use_own_sprite_groups=True)
+        s.step(2)
+
+        with self.assertRaises(AssertionError):
+            s.queue_input(simulation.SPAWN_BALLOON, 1, tick=1)
+
+    def test_queue_input_accepts_every_input_type(self):
+        s = simulation.Simulation([OneBalloonLevel()], use_own_sprite_groups=True)
+        s.queue_input(simulation.UPGRADE_TOWER, (150, 150), simulation.UPGRADE_SPEED)
+        s.queue_input(simulation.SELL_TOWER, (150, 150))
+
+        with self.assertRaises(AssertionError):
+            s.queue_input('NOT_AN_INPUT')
+
+    def test_apply_input_with_invalid_input_type(self):
+        s = simulation.Simulation([OneBalloonLevel()], use_own_sprite_groups=True)
+
+        with self.assertRaises(ValueError):
+            s.apply_input('NOT_AN_INPUT')
+
+    def test_spawn_balloon_with_invalid_number_of_layers(self):
+        s = simulation.Simulation([OneBalloonLevel()], use_own_sprite_groups=True)
+
+        self.assertFalse(s.spawn_balloon(9))
+        self.assertEqual(len(s.balloon_sprites), 0)
+
+    def test_upgrade_tower_input(self):
+        s = simulation.Simulation([OneBalloonLevel()], use_own_sprite_groups=True)
+        new_tower = s.place_tower(tower.LINEAR_TOWER, (150, 150))
+        radius = new_tower._attack_values.radius
+        s.queue_input(simulation.UPGRADE_TOWER, (150, 150), simulation.UPGRADE_RADIUS)
+
+        s.step()
+
+        self.assertGreater(new_tower._attack_values.radius, radius)
+        self.assertFalse(s.upgrade_tower((10, 10), simulation.UPGRADE_RADIUS))
+
+    def test_sell_tower_input(self):
+        s = simulation.Simulation([OneBalloonLevel()], use_own_sprite_groups=True)
+        new_tower = s.place_tower(tower.LINEAR_TOWER, (150, 150))
+        s.queue_input(simulation.SELL_TOWER, (150, 150))
+
+        s.step()
+
+        self.assertEqual(len(s.tower_sprites), 0)
+        self.assertEqual(s.bank.balance, bank.STARTING_BALANCE - new_tower.buy_price + new_tower.sell_price)
+        self.assertFalse(s.sell_tower((150, 150)))
+
+    def test_seed_is_picked_when_not_given(self):
+        s = simulation.Simulation([OneBalloonLevel()], use_own_sprite_groups=True)
+
+        self.assertIsInstance(s.seed, int)
+        self.assertEqual(simulation.Simulation([OneBalloonLevel()], seed=s.seed).random.random(), s.random.random())
+
+    def test_same_seed_and_inputs_play_the_same_match(self):
+        def play():
+            s = simulation.Simulation([level.Level([3, 2, 1] * 5, path.Path())], use_own_sprite_groups=True, seed=7)
+            s.queue_input(simulation.PLACE_TOWER, tower.LINEAR_TOWER, (130, 100), tick=0)
+            s.queue_input(simulation.SPAWN_BALLOON, 5, tick=20)
+            s.queue_input(simulation.PLACE_TOWER, tower.EXPLOSION_TOWER, (70, 200), tick=40)
+            s.run_until_finished()
+            return (s.frame_count, s.bank.balance, s.life_point.life_balance, s.random.random(),
+                    [tow._pop_count for tow in s.tower_sprites])
+
+        self.assertEqual(play(), play())
+
+
+class TestTickClock(TestCase):
+    def test_get_ticks_due(self):
+        now = [0.0]
+        tick_clock = simulation.TickClock(ticks_per_second=10, clock=lambda: now[0])
+
+        self.assertEqual(tick_clock.get_ticks_due(), 0)
+        now[0] = 0.15
+        self.assertEqual(tick_clock.get_ticks_due(), 1)
+        self.assertEqual(tick_clock.get_ticks_due(), 0)
+        now[0] = 0.35
+        self.assertEqual(tick_clock.get_ticks_due(), 2)
+
+    def test_get_ticks_due_drops_ticks_when_far_behind(self):
+        now = [0.0]
+        tick_clock = simulation.TickClock(ticks_per_second=10, max_ticks_per_call=5, clock=lambda: now[0])
+
+        now[0] = 10.0
+        self.assertEqual(tick_clock.get_ticks_due(), 5)
+        now[0] = 10.1
+        self.assertEqual(tick_clock.get_ticks_due(), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
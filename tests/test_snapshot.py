@@ -0,0 +1,103 @@
+import pickle
+import unittest
+from unittest import TestCase
+
+import snapshot
+import simulation
+import level
+import path
+import tower
+
+
+def create_match(use_balloon_batch=False, use_bullet_pool=False):
+    s = simulation.Simulation([level.Level([5, 4, 3, 2, 1] * 10, path.get_path(path.DEFAULT_PATH)),
+                               level.Level([3] * 5, path.get_path(path.DEFAULT_PATH))],
+                              use_balloon_batch=use_balloon_batch, use_bullet_pool=use_bullet_pool,
+                              use_own_sprite_groups=True, seed=5)
+    s.bank.balance = 1000
+    s.queue_input(simulation.PLACE_TOWER, tower.LINEAR_TOWER, (130, 100), tick=0)
+    s.queue_input(simulation.PLACE_TOWER, tower.EXPLOSION_TOWER, (70, 200), tick=10)
+    s.queue_input(simulation.PLACE_TOWER, tower.TELEPORTATION_TOWER, (130, 250), tick=20)
+    s.queue_input(simulation.PLACE_TOWER, tower.THREE_SIXTY_TOWER, (70, 80), tick=30)
+    s.queue_input(simulation.UPGRADE_TOWER, (130, 100), simulation.UPGRADE_RADIUS, tick=50)
+    s.queue_input(simulation.SELL_TOWER, (70, 80), tick=300)
+    return s
+
+
+def get_state(s):
+    return (s.tick, s.bank.balance, s.life_point.life_balance, s.random.random(), s.is_won(), s.is_lost(),
+            [(tow.tower_type, tow.rect.center, tow._pop_count, tow.sell_price, tow._attack_values.radius)
+             for tow in s.tower_sprites],
+            [(balloon.rect.center, balloon.path_position, balloon.current_layer.number_of_layers)
+             for balloon in s.balloon_sprites],
+            [bullet.rect.center for bullet in s.bullet_sprites])
+
+
+class TestSnapshot(TestCase):
+    def assert_branch_plays_the_same(self, snapshot_tick, use_balloon_batch=False, use_bullet_pool=False):
+        s = create_match(use_balloon_batch, use_bullet_pool)
+        s.step(snapshot_tick)
+        match_snapshot = snapshot.take_snapshot(s)
+        s.step(200)
+        state = get_state(s)
+
+        branched_match = snapshot.branch(match_snapshot, use_balloon_batch=use_balloon_batch,
+                                         use_bullet_pool=use_bullet_pool)
+        self.assertEqual(branched_match.tick, snapshot_tick)
+        branched_match.step(200)
+
+        self.assertEqual(get_state(branched_match), state)
+
+    def test_branch_plays_the_same(self):
+        self.assert_branch_plays_the_same(120)
+
+    def test_branch_plays_the_same_with_balloon_batch_and_bullet_pool(self):
+        self.assert_branch_plays_the_same(120, use_balloon_batch=True, use_bullet_pool=True)
+
+    def test_branch_plays_the_same_with_bullets_of_a_sold_tower(self):
+        s = create_match()
+        s.step(301)
+        self.assertIn(False, snapshot.take_snapshot(s).towers['is_alive'].tolist())
+
+        self.assert_branch_plays_the_same(301)
+
+    def test_restore_snapshot_into_same_match(self):
+        s = create_match()
+        s.step(100)
+        match_snapshot = snapshot.take_snapshot(s)
+        s.step(150)
+        state = get_state(s)
+
+        snapshot.restore_snapshot(match_snapshot, s)
+        s.step(150)
+
+        self.assertEqual(get_state(s), state)
+
+    def test_snapshot_is_not_changed_by_stepping(self):
+        s = create_match()
+        s.step(100)
+        match_snapshot = snapshot.take_snapshot(s)
+        balloons = match_snapshot.balloons.copy()
+
+        s.step(50)
+        snapshot.branch(match_snapshot).step(50)
+
+        self.assertEqual(match_snapshot.balloons.tolist(), balloons.tolist())
+        with self.assertRaises(ValueError):
+            match_snapshot.balloons['x'][0] = 0
+
+    def test_pickled_snapshot(self):
+        s = create_match()
+        s.step(100)
+        match_snapshot = pickle.loads(pickle.dumps(snapshot.take_snapshot(s)))
+        s.step(100)
+        state = get_state(s)
+
+        branched_match = snapshot.branch(match_snapshot)
+        branched_match.step(100)
+
+        self.assertEqual(get_state(branched_match), state)
+
+
+if __name__ == '__main__':
+    unittest.main()
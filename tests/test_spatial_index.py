@@ -0,0 +1,61 @@
+import unittest
+from unittest import TestCase
+from unittest.mock import Mock
+
+import spatial_index
+
+
+def make_mock_balloon(x, y):
+    mock_balloon = Mock()
+    mock_balloon.get_centerX.return_value = x
+    mock_balloon.get_centerY.return_value = y
+    return mock_balloon
+
+
+class TestUniformGrid(TestCase):
+    def test_build(self):
+        grid = spatial_index.UniformGrid(cell_size=10)
+        grid.build([make_mock_balloon(5, 5), make_mock_balloon(15, 5), make_mock_balloon(6, 6)])
+
+        self.assertEqual(len(grid), 3)
+
+    def test_find_first_within_returns_earliest_balloon(self):
+        far_balloon = make_mock_balloon(300, 300)
+        first_near_balloon = make_mock_balloon(120, 100)
+        second_near_balloon = make_mock_balloon(100, 110)
+        grid = spatial_index.UniformGrid(cell_size=50)
+        grid.build([far_balloon, first_near_balloon, second_near_balloon])
+
+        self.assertIs(grid.find_first_within((100, 100), 50), first_near_balloon)
+
+    def test_find_first_within_across_cells(self):
+        near_balloon = make_mock_balloon(149, 100)
+        grid = spatial_index.UniformGrid(cell_size=10)
+        grid.build([near_balloon])
+
+        self.assertIs(grid.find_first_within((100, 100), 50), near_balloon)
+
+    def test_find_first_within_on_radius(self):
+        edge_balloon = make_mock_balloon(130, 140)
+        grid = spatial_index.UniformGrid()
+        grid.build([edge_balloon])
+
+        self.assertIs(grid.find_first_within((100, 100), 50), edge_balloon)
+        self.assertIsNone(grid.find_first_within((100, 100), 49))
+
+    def test_find_first_within_with_no_balloons(self):
+        grid = spatial_index.UniformGrid()
+        grid.build([])
+
+        self.assertIsNone(grid.find_first_within((100, 100), 50))
+
+    def test_find_first_within_with_negative_positions(self):
+        balloon = make_mock_balloon(-20, -30)
+        grid = spatial_index.UniformGrid(cell_size=25)
+        grid.build([balloon])
+
+        self.assertIs(grid.find_first_within((0, 0), 40), balloon)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+from unittest import TestCase
+
+import surface_cache
+import colours
+import icon
+import balloon
+import path
+
+
+class TestSurfaceCacheModule(TestCase):
+    def setUp(self):
+        surface_cache.clear()
+
+    def test_get_filled_surface(self):
+        surface = surface_cache.get_filled_surface(colours.RED, (30, 40))
+
+        self.assertEqual(surface.get_size(), (30, 40))
+        self.assertEqual(surface.get_at((5, 5)), colours.RED)
+
+    def test_get_filled_surface_is_shared(self):
+        self.assertIs(surface_cache.get_filled_surface(colours.RED, (30, 30)),
+                      surface_cache.get_filled_surface(colours.RED, (30, 30)))
+        self.assertIsNot(surface_cache.get_filled_surface(colours.RED, (30, 30)),
+                         surface_cache.get_filled_surface(colours.BLUE, (30, 30)))
+        self.assertIsNot(surface_cache.get_filled_surface(colours.RED, (30, 30)),
+                         surface_cache.get_filled_surface(colours.RED, (30, 31)))
+
+    def test_balloons_of_same_type_share_image(self):
+        p = path.Path()
+        first = balloon.create_balloon(balloon.BALLOON_L1, p)
+        second = balloon.create_balloon(balloon.BALLOON_L1, p)
+
+        self.assertIs(first.image, second.image)
+
+    def test_clicked_tower_icon_does_not_change_other_icons(self):
+        clicked_icon = icon.create_tower_icon(icon.LINEAR_TOWER_ICON, (300, 100))
+        other_icon = icon.create_tower_icon(icon.LINEAR_TOWER_ICON, (300, 100))
+
+        clicked_icon.on_click()
+
+        self.assertEqual(clicked_icon.image.get_at((5, 5)), colours.ORANGE)
+        self.assertEqual(other_icon.image.get_at((5, 5)), colours.YELLOW)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+from unittest import TestCase
+from unittest.mock import patch
+
+import pygame
+
+import text_cache
+import colours
+
+
+class TestTextCacheModule(TestCase):
+    def setUp(self):
+        text_cache.clear()
+
+    def test_get_font_is_shared(self):
+        self.assertIs(text_cache.get_font(15), text_cache.get_font(15))
+        self.assertIsNot(text_cache.get_font(15), text_cache.get_font(50))
+
+    def test_get_font_looks_up_system_font_once(self):
+        with patch('pygame.font.SysFont', wraps=pygame.font.SysFont) as mock_sys_font:
+            text_cache.get_font(15)
+            text_cache.get_font(15)
+
+        mock_sys_font.assert_called_once_with(text_cache.DEFAULT_FONT_NAME, 15)
+
+    def test_render(self):
+        font = text_cache.get_font(15)
+        rendered_text = text_cache.render(font, 'Life points: 5', colours.WHITE)
+
+        self.assertEqual(rendered_text.get_size(), font.size('Life points: 5'))
+
+    def test_render_is_shared(self):
+        font = text_cache.get_font(15)
+
+        self.assertIs(text_cache.render(font, 'Life points: 5', colours.WHITE),
+                      text_cache.render(font, 'Life points: 5', colours.WHITE))
+        self.assertIsNot(text_cache.render(font, 'Life points: 5', colours.WHITE),
+                         text_cache.render(font, 'Life points: 4', colours.WHITE))
+        self.assertIsNot(text_cache.render(font, 'Life points: 5', colours.WHITE),
+                         text_cache.render(font, 'Life points: 5', colours.RED))
+
+    @patch('text_cache.MAX_RENDERED_TEXTS', 2)
+    def test_render_evicts_least_recently_used(self):
+        font = text_cache.get_font(15)
+        first = text_cache.render(font, 'first', colours.WHITE)
+        second = text_cache.render(font, 'second', colours.WHITE)
+        text_cache.render(font, 'first', colours.WHITE)  # now second is the least recently used
+        text_cache.render(font, 'third', colours.WHITE)
+
+        self.assertIs(text_cache.render(font, 'first', colours.WHITE), first)
+        self.assertIsNot(text_cache.render(font, 'second', colours.WHITE), second)
+
+
+if __name__ == '__main__':
+    unittest.main()
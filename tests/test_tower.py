@@ -490,33 +490,43 @@ class TestTeleportationTower(unittest.TestCase):
 class TestTowerModule(unittest.TestCase):
     def setUp(self):
         self.position = (100, 100)
-        self.DISPLAYSURF = pygame.Surface([50, 50])
 
     def test_create_tower_with_LINEAR_TOWER_type(self):
         tower_type = tower.LINEAR_TOWER
-        return_value = tower.create_tower(tower_type, self.position, self.DISPLAYSURF)
+        return_value = tower.create_tower(tower_type, self.position)
 
         self.assertIsInstance(return_value, tower.LinearTower)
 
     def test_create_tower_with_THREE_SIXTY_TOWER_type(self):
         tower_type = tower.THREE_SIXTY_TOWER
-        return_value = tower.create_tower(tower_type, self.position, self.DISPLAYSURF)
+        return_value = tower.create_tower(tower_type, self.position)
 
         self.assertIsInstance(return_value, tower.ThreeSixtyTower)
 
     def test_create_tower_with_EXPLOSION_TOWER_type(self):
         tower_type = tower.EXPLOSION_TOWER
-        return_value = tower.create_tower(tower_type, self.position, self.DISPLAYSURF)
+        return_value = tower.create_tower(tower_type, self.position)
 
         self.assertIsInstance(return_value, tower.ExplosionTower)
 
     def test_create_tower_with_TELEPORTATION_TOWER_type(self):
         tower_type = tower.TELEPORTATION_TOWER
-        return_value = tower.create_tower(tower_type, self.position, self.DISPLAYSURF)
+        return_value = tower.create_tower(tower_type, self.position)
 
         self.assertIsInstance(return_value, tower.TeleportationTower)
 
     def test_create_tower_with_invalid_type(self):
         tower_type = 'invalid tower type'
 
-        self.assertRaises(NotImplementedError, tower.create_tower, tower_type, self.position, self.DISPLAYSURF)
+        self.assertRaises(NotImplementedError, tower.create_tower, tower_type, self.position)
+
+    def test_upgrade_with_invalid_upgrade(self):
+        linear_tower = tower.create_tower(tower.LINEAR_TOWER, self.position)
+
+        self.assertRaises(ValueError, linear_tower.upgrade, 'invalid upgrade')
+
+    def test_get_attack_stats(self):
+        linear_tower = tower.create_tower(tower.LINEAR_TOWER, self.position)
+        linear_tower.increment_pop_count(2)
+
+        self.assertEqual(linear_tower.get_attack_stats(), (10, 50, 1, 2))
@@ -0,0 +1,57 @@
+"""Contains a registry of fonts and a cache of rendered text. pygame.font.SysFont(...) searches the system's fonts every time it's
+called, and most labels (the bank balance, the life points, the client's tower stats) show the same text frame after frame,
+so each font is made once and each (font, text, colour) is rendered once, until it falls out of the cache"""
+
+import collections
+import pygame
+import logging
+
+logger = logging.getLogger('simpleLogger')
+
+DEFAULT_FONT_NAME = 'freesansbold'
+MAX_RENDERED_TEXTS = 256  # the least recently used rendered text is forgotten past this
+
+_fonts = {}  # (name, size) : pygame.font.Font
+_rendered_texts = collections.OrderedDict()  # (font, text, colour) : pygame.Surface, least recently used first
+
+
+def get_font(size, name=DEFAULT_FONT_NAME):
+    """
+    :param size: int, the height of the font, in pixels
+    :param name: str, the name of a system font, eg, 'freesansbold'
+    :return: pygame.font.Font, shared by every caller asking for the same name and size
+    """
+    key = (name, size)
+    font = _fonts.get(key)
+    if font is None:
+        if not pygame.font.get_init():
+            pygame.font.init()
+        font = pygame.font.SysFont(name, size)
+        _fonts[key] = font
+    return font
+
+
+def render(font, text, colour):
+    """
+    :param font: pygame.font.Font, preferably from get_font(...)
+    :param text: str
+    :param colour: 3 or 4-element tuple, the colour of the text
+    :return: pygame.Surface, the antialiased text. Shared by every caller asking for the same font, text and colour, so it
+    must never be drawn on
+    """
+    key = (font, text, tuple(colour))
+    rendered_text = _rendered_texts.get(key)
+    if rendered_text is None:
+        rendered_text = font.render(text, True, colour)
+        _rendered_texts[key] = rendered_text
+        if len(_rendered_texts) > MAX_RENDERED_TEXTS:
+            _rendered_texts.popitem(last=False)
+    else:
+        _rendered_texts.move_to_end(key)
+    return rendered_text
+
+
+def clear():
+    """Forgets every font and rendered text. Labels already using them keep them"""
+    _fonts.clear()
+    _rendered_texts.clear()
@@ -1,18 +1,15 @@
 import abc
 import pygame
-import pygame.surface
 import pygame.sprite
 import math
 import bullet
 import colours
 import icon
-import logging.config
+import logging
 import sprite_groups
-import bank
-import message_buffer
+import surface_cache
 
 
-logging.config.fileConfig('logging.conf')
 logger = logging.getLogger('simpleLogger')
 
 LINEAR_TOWER = 'LINEAR_TOWER'
@@ -20,19 +17,25 @@ THREE_SIXTY_TOWER = 'THREE_SIXTY_TOWER'
 EXPLOSION_TOWER = 'EXPLOSION_TOWER'
 TELEPORTATION_TOWER = 'TELEPORTATION_TOWER'
 
+# the upgrades a tower can buy, see Tower.upgrade(...)
+UPGRADE_SPEED = 'upgrade_speed'
+UPGRADE_RADIUS = 'upgrade_radius'
+UPGRADE_POP_POWER = 'upgrade_pop_power'
+
 
 class Tower(pygame.sprite.Sprite, metaclass=abc.ABCMeta):
     """Base class for all Towers"""
 
     def __init__(self, colour, position, dimension, buy_price, sell_price, initial_attack_values,
                  speed_upgrade_values_and_prices_and_icons, radius_upgrade_values_and_prices_and_icons,
-                 pop_power_upgrade_values_and_prices_and_icons, tower_type, DISPLAYSURF):
+                 pop_power_upgrade_values_and_prices_and_icons, tower_type, match_state=None):
         """
         :param colour: colour.COLOUR_CONSTANT, the colour of the icon
         :param position: 2-element tuple, where this icon is to be placed
         :param dimension: 2-element tuple, the size of this icon
         :param buy_price: int, the amount of money to withdraw from balance to create this tower
-        :param DISPLAYSURF: main Surface object, for displaying this tower's circle
+        :param match_state: match_state.MatchState or None, the bank upgrades are paid from and sales paid into, and where
+        the changes of this tower are pushed for the client. None for a tower that isn't in a match
         """
 
         assert isinstance(colour, tuple) and len(colour) == 4, 'colour must be a 4-element tuple'
@@ -40,13 +43,10 @@ class Tower(pygame.sprite.Sprite, metaclass=abc.ABCMeta):
         assert isinstance(dimension, tuple) and len(dimension) == 2, 'start must be a 2-element tuple'
         assert isinstance(buy_price, int), 'buy_price must be an integer'
         assert isinstance(sell_price, int), 'buy_price must be an integer'
-        assert isinstance(DISPLAYSURF, pygame.Surface), 'DISPLAYSURF must be a pygame Surface object'
 
         super().__init__()
 
-        self.DISPLAYSURF = DISPLAYSURF
-        self.image = pygame.Surface([dimension[0], dimension[1]])
-        self.image.fill(colour)
+        self.image = surface_cache.get_filled_surface(colour, dimension)
         self.rect = self.image.get_rect()
         self.rect.centerx = position[0]
         self.rect.centery = position[1]
@@ -62,11 +62,22 @@ class Tower(pygame.sprite.Sprite, metaclass=abc.ABCMeta):
 
         self.tower_type = tower_type  # this is an enumerated string. We use this instead of type(...) to maintain consistency in specifying tower types
         self._pop_count = 0  # the number of balloons this tower popped
+        self.match_state = match_state
 
     def increment_pop_count(self, amount=1):
         self._pop_count += amount
-        message_buffer.push_update_tower_pop_count_message(id(self), self._pop_count)
+        messages = self._get_messages()
+        if messages is not None:
+            messages.push_update_tower_pop_count_message(id(self), self._pop_count)
+
+    def _get_messages(self):
+        """returns message_buffer.MessageBuffer or None, where the changes of this tower are pushed. None if the tower isn't
+        in a match or its match has no client to tell"""
+        return self.match_state.messages if self.match_state is not None else None
 
+    def get_attack_stats(self):
+        """returns 4-element tuple, the speed, radius and pop power of this tower and the number of balloons it popped"""
+        return self._attack_values.speed, self._attack_values.radius, self._attack_values.pop_power, self._pop_count
 
     def general_upgrade(self, upgrade_object):
         """
@@ -77,9 +88,9 @@ class Tower(pygame.sprite.Sprite, metaclass=abc.ABCMeta):
         if upgrade_object.is_next_upgrade_exists():
             # logger.debug('inside if for is_next_upgrade_exists')
             upgrade_value, upgrade_price = upgrade_object.get_next_upgrade_value_and_price()
-            if bank.balance >= upgrade_price:  # if enough money in bank, change the appropriate attack value, withdraw the price from bank, increase sell price, remove existing icon and add new one
+            if self.match_state.bank.balance >= upgrade_price:  # if enough money in bank, change the appropriate attack value, withdraw the price from bank, increase sell price, remove existing icon and add new one
                 # attack_value_to_upgrade = upgrade_value #Python function parameters are references, passed by value, thus, changing this here doesn't change self._....
-                bank.withdraw(upgrade_price)
+                self.match_state.bank.withdraw(upgrade_price)
                 self.sell_price += int(upgrade_price / 2)
                 upgrade_object.update_upgrade_icon()
                 return upgrade_value
@@ -96,7 +107,9 @@ class Tower(pygame.sprite.Sprite, metaclass=abc.ABCMeta):
         upgraded_speed_value = self.general_upgrade(self._speed_upgrade_values_and_prices_and_icons)
         if upgraded_speed_value:
             self._attack_values.speed = upgraded_speed_value
-            message_buffer.push_update_tower_speed_message(id(self), self._attack_values.speed)
+            messages = self._get_messages()
+            if messages is not None:
+                messages.push_update_tower_speed_message(id(self), self._attack_values.speed)
 
     def upgrade_radius(self):
         """
@@ -106,7 +119,9 @@ class Tower(pygame.sprite.Sprite, metaclass=abc.ABCMeta):
         upgraded_radius_value = self.general_upgrade(self._radius_upgrade_values_and_prices_and_icons)
         if upgraded_radius_value:
             self._attack_values.radius = upgraded_radius_value
-            message_buffer.push_update_tower_radius_message(id(self), self._attack_values.radius)
+            messages = self._get_messages()
+            if messages is not None:
+                messages.push_update_tower_radius_message(id(self), self._attack_values.radius)
 
     def upgrade_pop_power(self):
         """
@@ -116,7 +131,23 @@ class Tower(pygame.sprite.Sprite, metaclass=abc.ABCMeta):
         upgraded_pop_power_value = self.general_upgrade(self._pop_power_upgrade_values_and_prices_and_icons)
         if upgraded_pop_power_value:
             self._attack_values.pop_power = upgraded_pop_power_value
-            message_buffer.push_update_tower_pop_power_message(id(self), self._attack_values.pop_power)
+            messages = self._get_messages()
+            if messages is not None:
+                messages.push_update_tower_pop_power_message(id(self), self._attack_values.pop_power)
+
+    def upgrade(self, upgrade):
+        """
+        :param upgrade: str constant, UPGRADE_SPEED, UPGRADE_RADIUS or UPGRADE_POP_POWER
+        Buys the upgrade, if the player can pay for it
+        """
+        if upgrade == UPGRADE_SPEED:
+            self.upgrade_speed()
+        elif upgrade == UPGRADE_RADIUS:
+            self.upgrade_radius()
+        elif upgrade == UPGRADE_POP_POWER:
+            self.upgrade_pop_power()
+        else:
+            raise ValueError('the upgrade {} is not valid'.format(upgrade))
 
     def sell_tower(self):
         """
@@ -125,9 +156,11 @@ class Tower(pygame.sprite.Sprite, metaclass=abc.ABCMeta):
         """
         self.kill()
         # logger.info(str(id(self)))
-        message_buffer.push_sell_tower_message(id(self))
+        messages = self._get_messages()
+        if messages is not None:
+            messages.push_sell_tower_message(id(self))
         # logger.debug('selling tower: the sell price is' + str(self.sell_price))
-        bank.deposit(self.sell_price)
+        self.match_state.bank.deposit(self.sell_price)
 
     def on_click(self, upgrade_icon_sprites, sell_tower_icon_sprite):
         """
@@ -154,40 +187,55 @@ class Tower(pygame.sprite.Sprite, metaclass=abc.ABCMeta):
                     50, 50)))  # using (i+1) is coupling, consider changing later
 
         # create sell tower icon
-        sell_tower_icon_sprite.add(icon.create_sell_tower_icon(self.sell_tower))
+        sell_tower_icon_sprite.add(icon.create_sell_tower_icon(self.sell_tower, self))
 
         return None
 
     @abc.abstractmethod
-    def create_bullets(balloon):
-        """Implemented by concrete towers to create and return the bullets needed"""
+    def create_bullets(balloon, recycled_bullets=None):
+        """Implemented by concrete towers to create and return the bullets needed. recycled_bullets is passed on to
+        bullet.create_bullet(...)"""
         pass
 
-    def update(self, balloon_sprites, bullet_sprites):
+    def find_balloon_in_range(self, balloon_sprites, balloon_index=None):
+        """
+        :param balloon_sprites: iterable of Balloon, all the balloons in the game
+        :param balloon_index: spatial_index.UniformGrid or None, built from balloon_sprites this frame
+        :return: Balloon or None, the first balloon within this tower's radius
+        """
+        if balloon_index is not None:
+            return balloon_index.find_first_within((self.rect.centerx, self.rect.centery), self._attack_values.radius)
+
+        for balloon in balloon_sprites:
+            if math.hypot(balloon.get_centerX() - self.rect.centerx,
+                          balloon.get_centerY() - self.rect.centery) <= self._attack_values.radius:
+                return balloon
+        return None
+
+    def update(self, balloon_sprites, bullet_sprites, balloon_index=None):
         """
         :param balloon_sprites:
         :param bullet_sprites:
+        :param balloon_index: spatial_index.UniformGrid or None. If given, it is used to find balloons instead of checking every balloon
         :return:
         called every frame to whether whether to make bullets or not
         """
         assert isinstance(balloon_sprites, sprite_groups.BalloonGroup), "balloon_sprites must be a pygame.sprite.Group object"
         assert isinstance(bullet_sprites, pygame.sprite.Group), "bullet_sprites must be a pygame.sprite.Group object"
 
-        pygame.draw.circle(self.DISPLAYSURF, colours.WHITE, (self.rect.centerx, self.rect.centery), self._attack_values.radius, 1)
-
         # checks if it's possible to attack again
         if self.frames_until_attack_again == self._attack_values.speed:
-            for balloon in balloon_sprites:
-                # if within range, create a bullet
-                if math.hypot(balloon.get_centerX() - self.rect.centerx,
-                              balloon.get_centerY() - self.rect.centery) <= self._attack_values.radius:
-                    bullets = self.create_bullets(
-                        balloon)  # create specific bullets, depending on tower, using Strategy pattern. Might only one bullet be created and returned
+            # if within range, create a bullet
+            balloon = self.find_balloon_in_range(balloon_sprites, balloon_index)
+            if balloon is not None:
+                # only a bullet_pool.BulletPool keeps killed bullets to reuse
+                recycled_bullets = getattr(bullet_sprites, 'recycled_bullets', None)
+                bullets = self.create_bullets(
+                    balloon, recycled_bullets)  # create specific bullets, depending on tower, using Strategy pattern. Might only one bullet be created and returned
 
-                    bullet_sprites.add(bullets)
+                bullet_sprites.add(bullets)
 
-                    self.frames_until_attack_again = 0
-                    break
+                self.frames_until_attack_again = 0
         else:
             self.frames_until_attack_again += 1
 
@@ -195,21 +243,20 @@ class Tower(pygame.sprite.Sprite, metaclass=abc.ABCMeta):
 class LinearTower(Tower):
     """Attacks in a straight line"""
 
-    def __init__(self, position, DISPLAYSURF):
+    def __init__(self, position, match_state=None):
         """
         :param position: 2-element tuple, where this icon is to be placed
-        :param DISPLAYSURF: main Surface object, for displaying this tower's circle
+        :param match_state: match_state.MatchState or None, see Tower
         Creates a LinearTower (shoots LinearBullets)
         """
 
         assert isinstance(position, tuple) and len(position) == 2, 'destination must be a 2-element tuple'
-        assert isinstance(DISPLAYSURF, pygame.Surface), 'DISPLAYSURF must be a pygame Surface object'
 
         initial_attack_values = AttackValues(initial_speed=10, initial_radius=50, initial_pop_power=1)
 
-        speed_upgrade_icons = icon.create_upgrade_type_icons_batch(icon.UPGRADE_SPEED_ICONS, self.upgrade_speed)
-        radius_upgrade_icons = icon.create_upgrade_type_icons_batch(icon.UPGRADE_RADIUS_ICONS, self.upgrade_radius)
-        pop_power_upgrade_icons = icon.create_upgrade_type_icons_batch(icon.UPGRADE_POP_POWER_ICONS, self.upgrade_pop_power)
+        speed_upgrade_icons = icon.create_upgrade_type_icons_batch(icon.UPGRADE_SPEED_ICONS, self.upgrade_speed, self)
+        radius_upgrade_icons = icon.create_upgrade_type_icons_batch(icon.UPGRADE_RADIUS_ICONS, self.upgrade_radius, self)
+        pop_power_upgrade_icons = icon.create_upgrade_type_icons_batch(icon.UPGRADE_POP_POWER_ICONS, self.upgrade_pop_power, self)
 
         speed_upgrade_values_and_prices_and_icons = SpeedUpgrade(speed_upgrade_values=(20, 30),
                                                                  speed_upgrade_prices=(20, 30),
@@ -231,9 +278,9 @@ class LinearTower(Tower):
                          radius_upgrade_values_and_prices_and_icons=radius_upgrade_values_and_prices_and_icons,
                          pop_power_upgrade_values_and_prices_and_icons=pop_power_upgrade_values_and_prices_and_icons,
                          tower_type=LINEAR_TOWER,
-                         DISPLAYSURF=DISPLAYSURF)
+                         match_state=match_state)
 
-    def create_bullets(self, balloon):
+    def create_bullets(self, balloon, recycled_bullets=None):
         """
         :param balloon:
         :return: bullet
@@ -243,25 +290,25 @@ class LinearTower(Tower):
                                     start=(self.rect.centerx, self.rect.centery),
                                     destination=(balloon.get_centerX(), balloon.get_centerY()),
                                     pop_power=self._attack_values.pop_power,
-                                    tower_increment_pop_method=self.increment_pop_count)
+                                    tower_increment_pop_method=self.increment_pop_count,
+                                    recycled_bullets=recycled_bullets)
 
 
 class ThreeSixtyTower(Tower):
-    def __init__(self, position, DISPLAYSURF):
+    def __init__(self, position, match_state=None):
         """
         :param position: 2-element tuple, where this icon is to be placed
-        :param DISPLAYSURF: main Surface object, for displaying this tower's circle
+        :param match_state: match_state.MatchState or None, see Tower
         Creates a ThreeSixtyTower (shoots 8 StandardBullets)
         """
 
         assert isinstance(position, tuple) and len(position) == 2, 'destination must be a 2-element tuple'
-        assert isinstance(DISPLAYSURF, pygame.Surface), 'DISPLAYSURF must be a pygame Surface object'
 
         initial_attack_values = AttackValues(initial_speed=10, initial_radius=50, initial_pop_power=1)
 
-        speed_upgrade_icons = icon.create_upgrade_type_icons_batch(icon.UPGRADE_SPEED_ICONS, self.upgrade_speed)
-        radius_upgrade_icons = icon.create_upgrade_type_icons_batch(icon.UPGRADE_RADIUS_ICONS, self.upgrade_radius)
-        pop_power_upgrade_icons = icon.create_upgrade_type_icons_batch(icon.UPGRADE_POP_POWER_ICONS, self.upgrade_pop_power)
+        speed_upgrade_icons = icon.create_upgrade_type_icons_batch(icon.UPGRADE_SPEED_ICONS, self.upgrade_speed, self)
+        radius_upgrade_icons = icon.create_upgrade_type_icons_batch(icon.UPGRADE_RADIUS_ICONS, self.upgrade_radius, self)
+        pop_power_upgrade_icons = icon.create_upgrade_type_icons_batch(icon.UPGRADE_POP_POWER_ICONS, self.upgrade_pop_power, self)
 
         speed_upgrade_values_and_prices_and_icons = SpeedUpgrade(speed_upgrade_values=(20, 30),
                                                                  speed_upgrade_prices=(20, 30),
@@ -283,77 +330,84 @@ class ThreeSixtyTower(Tower):
                          radius_upgrade_values_and_prices_and_icons=radius_upgrade_values_and_prices_and_icons,
                          pop_power_upgrade_values_and_prices_and_icons=pop_power_upgrade_values_and_prices_and_icons,
                          tower_type=THREE_SIXTY_TOWER,
-                         DISPLAYSURF=DISPLAYSURF)
+                         match_state=match_state)
 
-    def create_bullets(self, balloons):
+    def create_bullets(self, balloons, recycled_bullets=None):
         return [bullet.create_bullet(bullet_type=bullet.STANDARD_BULLET,
                                      start=(self.rect.centerx, self.rect.centery),
                                      destination=(self.rect.centerx, self.rect.centery - 100),
                                      pop_power=self._attack_values.pop_power,
-                                     tower_increment_pop_method=self.increment_pop_count),
+                                     tower_increment_pop_method=self.increment_pop_count,
+                                     recycled_bullets=recycled_bullets),
 
                 bullet.create_bullet(bullet_type=bullet.STANDARD_BULLET,
                                      start=(self.rect.centerx, self.rect.centery),
                                      destination=(self.rect.centerx + 100, self.rect.centery - 100),
                                      pop_power=self._attack_values.pop_power,
-                                     tower_increment_pop_method=self.increment_pop_count),
+                                     tower_increment_pop_method=self.increment_pop_count,
+                                     recycled_bullets=recycled_bullets),
 
                 bullet.create_bullet(bullet_type=bullet.STANDARD_BULLET,
                                      start=(self.rect.centerx, self.rect.centery),
                                      destination=(self.rect.centerx + 100, self.rect.centery),
                                      pop_power=self._attack_values.pop_power,
-                                     tower_increment_pop_method=self.increment_pop_count),
+                                     tower_increment_pop_method=self.increment_pop_count,
+                                     recycled_bullets=recycled_bullets),
 
                 bullet.create_bullet(bullet_type=bullet.STANDARD_BULLET,
                                      start=(self.rect.centerx, self.rect.centery),
                                      destination=(self.rect.centerx + 100, self.rect.centery + 100),
                                      pop_power=self._attack_values.pop_power,
-                                     tower_increment_pop_method=self.increment_pop_count),
+                                     tower_increment_pop_method=self.increment_pop_count,
+                                     recycled_bullets=recycled_bullets),
 
                 bullet.create_bullet(bullet_type=bullet.STANDARD_BULLET,
                                      start=(self.rect.centerx, self.rect.centery),
                                      destination=(self.rect.centerx, self.rect.centery + 100),
                                      pop_power=self._attack_values.pop_power,
-                                     tower_increment_pop_method=self.increment_pop_count),
+                                     tower_increment_pop_method=self.increment_pop_count,
+                                     recycled_bullets=recycled_bullets),
 
                 bullet.create_bullet(bullet_type=bullet.STANDARD_BULLET,
                                      start=(self.rect.centerx, self.rect.centery),
                                      destination=(self.rect.centerx - 100, self.rect.centery + 100),
                                      pop_power=self._attack_values.pop_power,
-                                     tower_increment_pop_method=self.increment_pop_count),
+                                     tower_increment_pop_method=self.increment_pop_count,
+                                     recycled_bullets=recycled_bullets),
 
                 bullet.create_bullet(bullet_type=bullet.STANDARD_BULLET,
                                      start=(self.rect.centerx, self.rect.centery),
                                      destination=(self.rect.centerx - 100, self.rect.centery),
                                      pop_power=self._attack_values.pop_power,
-                                     tower_increment_pop_method=self.increment_pop_count),
+                                     tower_increment_pop_method=self.increment_pop_count,
+                                     recycled_bullets=recycled_bullets),
 
                 bullet.create_bullet(bullet_type=bullet.STANDARD_BULLET,
                                      start=(self.rect.centerx, self.rect.centery),
                                      destination=(self.rect.centerx - 100, self.rect.centery - 100),
                                      pop_power=self._attack_values.pop_power,
-                                     tower_increment_pop_method=self.increment_pop_count)
+                                     tower_increment_pop_method=self.increment_pop_count,
+                                     recycled_bullets=recycled_bullets)
                 ]
 
 
 class ExplosionTower(Tower):
     """Shoots ExplosionBullets"""
 
-    def __init__(self, position, DISPLAYSURF):
+    def __init__(self, position, match_state=None):
         """
         :param position: 2-element tuple, where this icon is to be placed
-        :param DISPLAYSURF: main Surface object, for displaying this tower's circle
+        :param match_state: match_state.MatchState or None, see Tower
         Creates an ExplosionTower (shoots ExplosionBullets)
         """
 
         assert isinstance(position, tuple) and len(position) == 2, 'destination must be a 2-element tuple'
-        assert isinstance(DISPLAYSURF, pygame.Surface), 'DISPLAYSURF must be a pygame Surface object'
 
         initial_attack_values = AttackValues(initial_speed=10, initial_radius=50, initial_pop_power=1)
 
-        speed_upgrade_icons = icon.create_upgrade_type_icons_batch(icon.UPGRADE_SPEED_ICONS, self.upgrade_speed)
-        radius_upgrade_icons = icon.create_upgrade_type_icons_batch(icon.UPGRADE_RADIUS_ICONS, self.upgrade_radius)
-        pop_power_upgrade_icons = icon.create_upgrade_type_icons_batch(icon.UPGRADE_POP_POWER_ICONS, self.upgrade_pop_power)
+        speed_upgrade_icons = icon.create_upgrade_type_icons_batch(icon.UPGRADE_SPEED_ICONS, self.upgrade_speed, self)
+        radius_upgrade_icons = icon.create_upgrade_type_icons_batch(icon.UPGRADE_RADIUS_ICONS, self.upgrade_radius, self)
+        pop_power_upgrade_icons = icon.create_upgrade_type_icons_batch(icon.UPGRADE_POP_POWER_ICONS, self.upgrade_pop_power, self)
 
         speed_upgrade_values_and_prices_and_icons = SpeedUpgrade(speed_upgrade_values=(20, 30),
                                                                  speed_upgrade_prices=(20, 30),
@@ -375,30 +429,31 @@ class ExplosionTower(Tower):
                          radius_upgrade_values_and_prices_and_icons=radius_upgrade_values_and_prices_and_icons,
                          pop_power_upgrade_values_and_prices_and_icons=pop_power_upgrade_values_and_prices_and_icons,
                          tower_type=EXPLOSION_TOWER,
-                         DISPLAYSURF=DISPLAYSURF)
+                         match_state=match_state)
 
-    def create_bullets(self, balloon):
+    def create_bullets(self, balloon, recycled_bullets=None):
         return bullet.create_bullet(bullet_type=bullet.EXPLOSION_BULLET,
                                     start=(self.rect.centerx, self.rect.centery),
                                     destination=(balloon.get_centerX(), balloon.get_centerY()),
                                     pop_power=self._attack_values.pop_power,
-                                    tower_increment_pop_method=self.increment_pop_count)
+                                    tower_increment_pop_method=self.increment_pop_count,
+                                    recycled_bullets=recycled_bullets)
 
 
 class TeleportationTower(Tower):
     """Shoots TeleportationBullets"""
 
-    def __init__(self, position, DISPLAYSURF):
+    def __init__(self, position, match_state=None):
         """
         :param position: 2-element tuple, where this icon is to be placed
-        :param DISPLAYSURF: main Surface object, for displaying this tower's circle
+        :param match_state: match_state.MatchState or None, see Tower
         Creates a TeleportationTower (shoots TeleportationBullets)
         """
         initial_attack_values = AttackValues(initial_speed=10, initial_radius=50, initial_pop_power=1)
 
-        speed_upgrade_icons = icon.create_upgrade_type_icons_batch(icon.UPGRADE_SPEED_ICONS, self.upgrade_speed)
-        radius_upgrade_icons = icon.create_upgrade_type_icons_batch(icon.UPGRADE_RADIUS_ICONS, self.upgrade_radius)
-        pop_power_upgrade_icons = icon.create_upgrade_type_icons_batch(icon.UPGRADE_POP_POWER_ICONS, self.upgrade_pop_power)
+        speed_upgrade_icons = icon.create_upgrade_type_icons_batch(icon.UPGRADE_SPEED_ICONS, self.upgrade_speed, self)
+        radius_upgrade_icons = icon.create_upgrade_type_icons_batch(icon.UPGRADE_RADIUS_ICONS, self.upgrade_radius, self)
+        pop_power_upgrade_icons = icon.create_upgrade_type_icons_batch(icon.UPGRADE_POP_POWER_ICONS, self.upgrade_pop_power, self)
 
         speed_upgrade_values_and_prices_and_icons = SpeedUpgrade(speed_upgrade_values=(20, 30),
                                                                  speed_upgrade_prices=(20, 30),
@@ -419,37 +474,37 @@ class TeleportationTower(Tower):
                          radius_upgrade_values_and_prices_and_icons=radius_upgrade_values_and_prices_and_icons,
                          pop_power_upgrade_values_and_prices_and_icons=pop_power_upgrade_values_and_prices_and_icons,
                          tower_type=TELEPORTATION_TOWER,
-                         DISPLAYSURF=DISPLAYSURF)
+                         match_state=match_state)
 
-    def create_bullets(self, balloon):
+    def create_bullets(self, balloon, recycled_bullets=None):
         return bullet.create_bullet(bullet_type=bullet.TELEPORTATION_BULLET,
                                     start=(self.rect.centerx, self.rect.centery),
                                     destination=(balloon.get_centerX(), balloon.get_centerY()),
                                     pop_power=self._attack_values.pop_power,
-                                    tower_increment_pop_method=self.increment_pop_count)
+                                    tower_increment_pop_method=self.increment_pop_count,
+                                    recycled_bullets=recycled_bullets)
 
 
-def create_tower(tower_type, position, DISPLAYSURF):
+def create_tower(tower_type, position, match_state=None):
     """
     :param tower_type: str constant, which tower to create
     :param position: 2-element tuple, where the tower is to be created
-    :param DISPLAYSURF: pygame.Surface, the main Surface object
+    :param match_state: match_state.MatchState or None, the state of the match the tower is placed in, see Tower
     :return: XTower, eg, LinearTower
     A simple factory for creating towers
     """
 
     assert isinstance(tower_type, str), 'tower_icon_type must be a string type'
     assert isinstance(position, tuple) and len(position) == 2, 'destination must be a 2-element tuple'
-    assert isinstance(DISPLAYSURF, pygame.Surface), 'DISPLAYSURF must be a pygame.Surface object'
 
     if tower_type == LINEAR_TOWER:
-        return LinearTower(position, DISPLAYSURF)
+        return LinearTower(position, match_state)
     elif tower_type == THREE_SIXTY_TOWER:
-        return ThreeSixtyTower(position, DISPLAYSURF)
+        return ThreeSixtyTower(position, match_state)
     elif tower_type == EXPLOSION_TOWER:
-        return ExplosionTower(position, DISPLAYSURF)
+        return ExplosionTower(position, match_state)
     elif tower_type == TELEPORTATION_TOWER:
-        return TeleportationTower(position, DISPLAYSURF)
+        return TeleportationTower(position, match_state)
 
     raise NotImplementedError('The passed in tower_type is not implemented')
 